@@ -13,6 +13,8 @@ from app.models.media import Image
 from app.models.project import Project
 from app.models.user import User
 from app.core.auth import get_current_active_user
+from app.core.config import settings
+from app.utils.content_schema import ContentSchemaError, validate
 
 router = APIRouter()
 
@@ -122,6 +124,16 @@ async def _get_project_org(project_id: str, user: User) -> PydanticObjectId:
     return user.organizationId or project.organization_id
 
 
+def _check_schema(kind: str, content: str) -> None:
+    """422 unless `content` matches the asset schema (CONTENT_SCHEMA_VALIDATION)."""
+    if not settings.CONTENT_SCHEMA_VALIDATION:
+        return
+    try:
+        validate(kind, content)
+    except ContentSchemaError as e:
+        raise HTTPException(422, str(e))
+
+
 # ═════════════════════════════════════════════════════════════
 #  CHARACTERS
 # ═════════════════════════════════════════════════════════════
@@ -147,6 +159,7 @@ async def get_character(project_id: str, character_id: str, user: User = Depends
 @router.post("/characters", response_model=AssetOut, status_code=201)
 async def create_character(body: AssetCreate, user: User = Depends(get_current_active_user)):
     org_id = await _get_project_org(body.projectId, user)
+    _check_schema("character", body.content)
     char = Character(
         organizationId=org_id,
         projectId=PydanticObjectId(body.projectId),
@@ -172,6 +185,7 @@ async def update_character(character_id: str, body: AssetUpdate, user: User = De
     if body.name is not None:
         char.name = body.name
     if body.content is not None:
+        _check_schema("character", body.content)
         char.content = body.content
     if body.imageIds is not None:
         char.imageIds = [PydanticObjectId(i) for i in body.imageIds]
@@ -219,6 +233,7 @@ async def get_location(project_id: str, location_id: str, user: User = Depends(g
 @router.post("/locations", response_model=AssetOut, status_code=201)
 async def create_location(body: AssetCreate, user: User = Depends(get_current_active_user)):
     org_id = await _get_project_org(body.projectId, user)
+    _check_schema("location", body.content)
     loc = Location(
         organizationId=org_id,
         projectId=PydanticObjectId(body.projectId),
@@ -244,6 +259,7 @@ async def update_location(location_id: str, body: AssetUpdate, user: User = Depe
     if body.name is not None:
         loc.name = body.name
     if body.content is not None:
+        _check_schema("location", body.content)
         loc.content = body.content
     if body.imageIds is not None:
         loc.imageIds = [PydanticObjectId(i) for i in body.imageIds]
@@ -291,6 +307,7 @@ async def get_prop(project_id: str, prop_id: str, user: User = Depends(get_curre
 @router.post("/props", response_model=AssetOut, status_code=201)
 async def create_prop(body: AssetCreate, user: User = Depends(get_current_active_user)):
     org_id = await _get_project_org(body.projectId, user)
+    _check_schema("prop", body.content)
     prop = Prop(
         organizationId=org_id,
         projectId=PydanticObjectId(body.projectId),
@@ -317,6 +334,7 @@ async def update_prop(prop_id: str, body: AssetUpdate, user: User = Depends(get_
     if body.name is not None:
         prop.name = body.name
     if body.content is not None:
+        _check_schema("prop", body.content)
         prop.content = body.content
     if body.imageIds is not None:
         prop.imageIds = [PydanticObjectId(i) for i in body.imageIds]
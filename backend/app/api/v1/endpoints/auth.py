@@ -5,9 +5,9 @@ from typing import Optional
 from datetime import timedelta
 
 from app.models.user import User
-from app.models.organization import Organization
 from app.core.auth import verify_google_token, create_access_token, get_current_active_user
 from app.core.config import settings
+from app.utils import org_members
 
 router = APIRouter()
 
@@ -34,13 +34,9 @@ class UserMeResponse(BaseModel):
     organization: Optional[dict] = None
 
 
-async def _build_org_payload(org: Organization) -> dict:
-    members = []
-    for mid in org.memberIds:
-        m = await User.get(mid)
-        if m:
-            members.append({"id": str(m.id), "email": m.email, "name": m.name, "avatarUrl": m.avatarUrl})
-    return {"id": str(org.id), "name": org.name, "created_at": org.createdAt.isoformat(), "members": members}
+async def _build_org_payload(org_id) -> Optional[dict]:
+    """Org + member list for the login / me responses (cached per org)."""
+    return await org_members.org_payload(org_id)
 
 
 @router.post("/google", response_model=TokenResponse)
@@ -51,12 +47,8 @@ async def google_auth(req: TokenRequest):
         user = User(email=info["email"], googleId=info["google_id"], name=info["display_name"], avatarUrl=info.get("picture"))
         await user.insert()
 
-    org_data, has_org = None, False
-    if user.organizationId:
-        org = await Organization.get(user.organizationId)
-        if org:
-            has_org = True
-            org_data = await _build_org_payload(org)
+    org_data = await _build_org_payload(user.organizationId) if user.organizationId else None
+    has_org = org_data is not None
 
     token = create_access_token(data={"sub": str(user.id), "email": user.email},
                                 expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -69,12 +61,8 @@ async def google_auth(req: TokenRequest):
 
 @router.get("/me", response_model=UserMeResponse)
 async def get_me(current_user: User = Depends(get_current_active_user)):
-    org_data, has_org = None, False
-    if current_user.organizationId:
-        org = await Organization.get(current_user.organizationId)
-        if org:
-            has_org = True
-            org_data = await _build_org_payload(org)
+    org_data = await _build_org_payload(current_user.organizationId) if current_user.organizationId else None
+    has_org = org_data is not None
     return UserMeResponse(
         id=str(current_user.id), email=current_user.email, name=current_user.name,
         avatarUrl=current_user.avatarUrl, bio=current_user.bio,
@@ -5,7 +5,6 @@ from pydantic import BaseModel
 from datetime import datetime
 from beanie import PydanticObjectId
 
-from app.models.project import Project
 from app.models.episode import Episode
 from app.models.part import Part
 from app.models.beat import Beat
@@ -14,6 +13,7 @@ from app.models.storyboard import Storyboard
 from app.models.media import Image, Clip
 from app.models.user import User
 from app.core.auth import get_current_active_user
+from app.utils.overview import project_tree, episode_parts
 
 router = APIRouter()
 
@@ -106,41 +106,17 @@ async def get_part_studio_data(part_id: str, user: User = Depends(get_current_ac
 
 # ── GET /combined/projects/{project_id}/overview ─────────────
 
-async def _part_summary(part: Part) -> dict:
-    pid = part.id
-    return {
-        "id": _str(pid), "title": part.title, "partNumber": part.partNumber,
-        "episodeId": _str(part.episodeId), "projectId": _str(part.projectId),
-        "scriptText": part.scriptText,
-        "beatCount": await Beat.find(Beat.partId == pid).count(),
-        "shotCount": await Shot.find(Shot.partId == pid).count(),
-        "storyboardCount": await Storyboard.find(Storyboard.partId == pid).count(),
-        "imageCount": await Image.find(Image.partId == pid).count(),
-        "clipCount": await Clip.find(Clip.partId == pid).count(),
-    }
-
-
 @router.get("/projects/{project_id}/overview")
 async def get_project_overview(project_id: str, user: User = Depends(get_current_active_user)):
     """Project + all episodes + parts with content counts."""
-    proj = await Project.get(PydanticObjectId(project_id))
+    proj, ep_data = await project_tree(PydanticObjectId(project_id))
     if not proj:
         raise HTTPException(404, "Project not found")
 
-    episodes = await Episode.find(Episode.projectId == proj.id).sort("+episodeNumber").to_list()
-    ep_data = []
-    for ep in episodes:
-        parts = await Part.find(Part.episodeId == ep.id).sort("+partNumber").to_list()
-        ep_data.append({
-            "id": _str(ep.id), "projectId": _str(ep.projectId),
-            "episodeNumber": ep.episodeNumber, "bibleText": ep.bibleText,
-            "parts": [await _part_summary(p) for p in parts],
-            "createdAt": ep.createdAt.isoformat(), "updatedAt": ep.updatedAt.isoformat(),
-        })
-
     return {
         "id": _str(proj.id), "name": proj.name, "description": proj.description,
         "organizationId": _str(proj.organizationId),
+        "stats": proj.stats.model_dump(),
         "episodes": ep_data,
         "createdAt": proj.createdAt.isoformat(), "updatedAt": proj.updatedAt.isoformat(),
     }
@@ -155,11 +131,10 @@ async def get_episode_full(project_id: str, episode_id: str, user: User = Depend
     if not ep or _str(ep.projectId) != project_id:
         raise HTTPException(404, "Episode not found")
 
-    parts = await Part.find(Part.episodeId == ep.id).sort("+partNumber").to_list()
-
     return {
         "id": _str(ep.id), "projectId": _str(ep.projectId),
         "episodeNumber": ep.episodeNumber, "bibleText": ep.bibleText,
-        "parts": [await _part_summary(p) for p in parts],
+        "stats": ep.stats.model_dump(),
+        "parts": await episode_parts(ep.id),
         "createdAt": ep.createdAt.isoformat(), "updatedAt": ep.updatedAt.isoformat(),
     }
@@ -3,12 +3,14 @@
 Each document = one version of ALL items for a part.
 The `content` field is a JSON string; parsing it gives individual items.
 """
+import json
 from enum import Enum
-from typing import Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional, Dict, Any, List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
 from datetime import datetime
 from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
 
 from app.models.beat import Beat, BeatMetadata
 from app.models.shot import Shot, ShotMetadata
@@ -16,6 +18,15 @@ from app.models.storyboard import Storyboard, StoryboardMetadata
 from app.models.part import Part
 from app.models.user import User
 from app.core.auth import get_current_active_user
+from app.core.config import settings
+from app.utils.aio import gather_bounded
+from app.utils.counters import apply_doc_delta, apply_delta, content_bytes
+from app.utils.json_patch import JsonPatchError, apply_patch, merge_patch
+from app.utils.content_items import item_diff, item_index, item_list
+from app.utils.content_schema import ContentSchemaError, loads, validate
+from app.utils.content_writes import write_body
+from app.utils.autosave import AutosaveConflict, AutosaveFull, StaleRevision, autosave
+from app.utils import blobs, id_registry, selections
 
 router = APIRouter()
 
@@ -53,6 +64,17 @@ class ContentUpdate(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class ContentPatch(BaseModel):
+    baseHash: str                                         # contentHash the edit was made against
+    patch: Optional[List[Dict[str, Any]]] = None          # RFC 6902 operations
+    items: Optional[Dict[str, Dict[str, Any]]] = None     # item index -> RFC 7396 merge patch
+
+
+class ContentAutosave(BaseModel):
+    content: str
+    baseRev: Optional[int] = None  # rev the edit was made on top of; 409 if another edit came in since
+
+
 class ContentOut(BaseModel):
     id: str
     type: str
@@ -61,30 +83,101 @@ class ContentOut(BaseModel):
     episodeId: str
     partId: str
     content: str
+    contentHash: str
     metadata: Dict[str, Any]
     createdAt: datetime
     updatedAt: datetime
 
 
+class ItemPick(BaseModel):
+    contentId: str  # version of the same part whose copy of the item to use
+
+
+class ContentPatchOut(BaseModel):
+    id: str
+    type: str
+    contentHash: str
+    contentBytes: int
+    updatedAt: datetime
+
+
+class AutosaveAck(BaseModel):
+    id: str
+    rev: int       # revision assigned to this edit
+    savedRev: int  # latest revision written to the database
+    pending: bool
+
+
+class AutosaveCommitOut(AutosaveAck):
+    contentHash: str
+    contentBytes: Optional[int] = None
+    updatedAt: datetime
+
+
 def _out(item: Any, content_type: str) -> ContentOut:
     return ContentOut(
         id=str(item.id), type=content_type,
         organizationId=str(item.organizationId),
         projectId=str(item.projectId), episodeId=str(item.episodeId),
         partId=str(item.partId), content=item.content,
+        contentHash=item.contentHash,
         metadata=item.metadata.model_dump(),
         createdAt=item.createdAt, updatedAt=item.updatedAt,
     )
 
 
-async def _find_content(content_id: str):
-    """Detect type from ID by trying each model."""
-    oid = PydanticObjectId(content_id)
-    for ct, model in MODEL_MAP.items():
-        item = await model.get(oid)
-        if item:
-            return item, ct
-    return None, None
+async def _find_content(content_id: str, hint: Optional[ContentType] = None, hydrate: bool = True):
+    """Resolve the owning collection via the ID registry (or the optional
+    `?type=` hint) and fetch the document with a single read. With
+    `hydrate=False` a blob-stored body is left unloaded."""
+    item, kind = await id_registry.lookup(
+        PydanticObjectId(content_id), [ct.value for ct in ContentType],
+        hint=hint.value if hint else None,
+    )
+    if not item:
+        return None, None
+    if hydrate:
+        await blobs.hydrate(item)
+    return item, ContentType(kind)
+
+
+def _check_schema(kind: str, content: Any) -> None:
+    """422 unless `content` matches the type's schema (CONTENT_SCHEMA_VALIDATION)."""
+    if not settings.CONTENT_SCHEMA_VALIDATION:
+        return
+    try:
+        validate(kind, content)
+    except ContentSchemaError as e:
+        raise HTTPException(422, str(e))
+
+
+SELECT_RETRIES = 3
+
+
+async def _select_exclusive(Model, item) -> None:
+    """Make `item` the only selected version of its part & type.
+
+    One update_many clears the flag on siblings, one targeted update sets
+    it – constant cost regardless of version count. The partial unique index
+    on (partId | metadata.selected) rejects a concurrent double-select, in
+    which case we clear and retry so the last writer wins.
+    """
+    coll = Model.get_motor_collection()
+    for attempt in range(SELECT_RETRIES):
+        now = datetime.utcnow()
+        await coll.update_many(
+            {"partId": item.partId, "metadata.selected": True, "_id": {"$ne": item.id}},
+            {"$set": {"metadata.selected": False, "updatedAt": now}},
+        )
+        try:
+            await coll.update_one({"_id": item.id}, {"$set": {"metadata.selected": True, "updatedAt": now}})
+        except DuplicateKeyError:
+            if attempt == SELECT_RETRIES - 1:
+                raise HTTPException(409, "Another version was selected concurrently, please retry")
+            continue
+        item.metadata.selected = True
+        item.updatedAt = now
+        return
 
 
 # ── POST /content ────────────────────────────────────────────
@@ -94,10 +187,14 @@ async def create_content(body: ContentCreate, user: User = Depends(get_current_a
     part = await Part.get(PydanticObjectId(body.partId))
     if not part:
         raise HTTPException(404, "Part not found")
+    _check_schema(body.type.value, body.content)
 
     Model = MODEL_MAP[body.type]
     MetaModel = META_MAP[body.type]
     meta = MetaModel(**(body.metadata or {}))
+    # Inserted unselected; selection goes through _select_exclusive
+    select = meta.selected
+    meta.selected = False
 
     item = Model(
         organizationId=user.organizationId or part.projectId,
@@ -105,56 +202,360 @@ async def create_content(body: ContentCreate, user: User = Depends(get_current_a
         content=body.content, metadata=meta,
     )
     await item.insert()
+    await gather_bounded(apply_doc_delta(item), id_registry.register(item))
+    if select:
+        await _select_exclusive(Model, item)
     return _out(item, body.type.value)
 
 
+# ── GET /content/{id} ───────────────────────────────────────
+
+@router.get("/{content_id}", response_model=ContentOut)
+async def get_content(
+    content_id: str, request: Request, response: Response,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    """One version with its full body – what the lazy studio fetches for
+    unselected versions. The ETag is derived from contentHash + updatedAt,
+    so a revalidation with If-None-Match gets 304 without loading the body."""
+    item, ct = await _find_content(content_id, type, hydrate=False)
+    if not item:
+        raise HTTPException(404, "Content not found")
+    etag = f'"{item.contentHash}-{int(item.updatedAt.timestamp() * 1000)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    await blobs.hydrate(item)
+    response.headers.update(headers)
+    return _out(item, ct.value)
+
+
 # ── PUT /content/{id} ───────────────────────────────────────
 
 @router.put("/{content_id}", response_model=ContentOut)
-async def update_content(content_id: str, body: ContentUpdate, user: User = Depends(get_current_active_user)):
-    item, ct = await _find_content(content_id)
+async def update_content(
+    content_id: str, body: ContentUpdate,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    oid = PydanticObjectId(content_id)
+    if body.content is not None:
+        autosave.discard(oid)  # replaced wholesale; a later flush would overwrite it
+    else:
+        try:
+            await autosave.flush(oid)  # the save below writes the body it reads back
+        except AutosaveConflict:
+            raise HTTPException(409, "Content is being modified concurrently; retry")
+    item, ct = await _find_content(content_id, type)
     if not item:
         raise HTTPException(404, "Content not found")
 
+    bytes_delta = 0
     if body.content is not None:
+        _check_schema(ct.value, body.content)
+        bytes_delta = content_bytes(body.content) - content_bytes(item.content)
         item.content = body.content
+    select = False
     if body.metadata is not None:
         MetaModel = META_MAP[ct]
+        was_selected = item.metadata.selected
         item.metadata = MetaModel(**body.metadata)
+        if item.metadata.selected and not was_selected:
+            item.metadata.selected = False
+            select = True
     item.updatedAt = datetime.utcnow()
     await item.save()
+    if select:
+        await _select_exclusive(MODEL_MAP[ct], item)
+    await apply_delta(
+        {"contentBytes": bytes_delta},
+        org_id=item.organizationId, project_id=item.projectId,
+        episode_id=item.episodeId, part_id=item.partId,
+    )
     return _out(item, ct.value)
 
 
+# ── PATCH /content/{id} ─────────────────────────────────────
+
+PATCH_RETRIES = 3
+
+
+def _merge_items(doc: Any, items: Dict[str, Dict[str, Any]]) -> Any:
+    """Merge-patch individual entries of the document's top-level item
+    array, addressed by index. Mutates the freshly parsed `doc`."""
+    try:
+        arr = item_list(doc)
+    except ValueError:
+        raise JsonPatchError("Content has no single top-level item array; use 'patch'")
+    for key, patch in items.items():
+        if not key.isdigit() or int(key) >= len(arr):
+            raise JsonPatchError(f"Item index '{key}' out of range")
+        arr[int(key)] = merge_patch(arr[int(key)], patch)
+    return doc
+
+
+def _apply_content_patch(kind: str, content: str, body: ContentPatch) -> str:
+    try:
+        doc = loads(content)
+    except ValueError:
+        raise HTTPException(422, "Stored content is not valid JSON and cannot be patched")
+    try:
+        if body.patch:
+            doc = apply_patch(doc, body.patch)
+        if body.items:
+            doc = _merge_items(doc, body.items)
+    except JsonPatchError as e:
+        raise HTTPException(422, f"Patch could not be applied: {e}")
+    _check_schema(kind, doc)
+    return json.dumps(doc)
+
+
+@router.patch("/{content_id}", response_model=ContentPatchOut)
+async def patch_content(
+    content_id: str, body: ContentPatch,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    """Apply a JSON Patch and/or item merge patches server-side.
+
+    `baseHash` must equal the current `contentHash`, otherwise 409. The write
+    is conditional on the `updatedAt` that was read, so a concurrent writer
+    can't be silently overwritten between the check and the save.
+    """
+    if not body.patch and not body.items:
+        raise HTTPException(400, "Nothing to patch: provide 'patch' and/or 'items'")
+    item, ct = await _find_content(content_id, type)
+    if not item:
+        raise HTTPException(404, "Content not found")
+
+    for _ in range(PATCH_RETRIES):
+        if item.contentHash != body.baseHash:
+            raise HTTPException(409, "Content was modified since baseHash; reload and retry")
+        new_content = _apply_content_patch(ct.value, item.content, body)
+        written = await write_body(item, ct.value, new_content)
+        if written:
+            break
+        # Touched concurrently (possibly only metadata) – re-read and re-check the hash
+        item, _ = await _find_content(content_id, ct)
+        if not item:
+            raise HTTPException(404, "Content not found")
+    else:
+        raise HTTPException(409, "Content is being modified concurrently; retry")
+
+    new_hash, new_size, now = written
+    return ContentPatchOut(
+        id=str(item.id), type=ct.value, contentHash=new_hash,
+        contentBytes=new_size, updatedAt=now,
+    )
+
+
+# ── PUT /content/{id}/autosave ──────────────────────────────
+
+@router.put("/{content_id}/autosave", response_model=AutosaveAck)
+async def autosave_content(
+    content_id: str, body: ContentAutosave,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    """Buffer an editor's latest body in memory. Edits are coalesced and
+    written at most once per CONTENT_AUTOSAVE_INTERVAL_SECONDS; only the
+    first edit after a write reads the document."""
+    oid = PydanticObjectId(content_id)
+    entry = autosave.get(oid)
+    item, kind = None, entry.kind if entry else None
+    if entry is None:
+        item, ct = await _find_content(content_id, type, hydrate=False)
+        if not item:
+            raise HTTPException(404, "Content not found")
+        kind = ct.value
+    _check_schema(kind, body.content)
+    try:
+        return AutosaveAck(**autosave.stage(oid, body.content, body.baseRev, item=item, kind=kind))
+    except StaleRevision:
+        raise HTTPException(409, "Another edit was saved since baseRev; reload and retry")
+    except AutosaveFull:
+        raise HTTPException(503, "Too many documents with unsaved edits; retry shortly")
+
+
+@router.post("/{content_id}/autosave/commit", response_model=AutosaveCommitOut)
+async def commit_autosave(
+    content_id: str,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    """Write buffered edits now (e.g. when the editor closes)."""
+    oid = PydanticObjectId(content_id)
+    try:
+        await autosave.flush(oid)
+    except AutosaveConflict:
+        raise HTTPException(409, "Content is being modified concurrently; retry")
+    item, _ = await _find_content(content_id, type, hydrate=False)
+    if not item:
+        raise HTTPException(404, "Content not found")
+    entry = autosave.get(oid)  # only still there if edited again while writing
+    ack = entry.view(oid) if entry else {
+        "id": str(oid), "rev": item.autosaveRev, "savedRev": item.autosaveRev, "pending": False,
+    }
+    return AutosaveCommitOut(
+        **ack, contentHash=item.contentHash, contentBytes=item.contentSize, updatedAt=item.updatedAt,
+    )
+
+
+# ── GET /content/{id}/items ─────────────────────────────────
+
+async def _item_index(content_id: str, hint: Optional[ContentType]):
+    item, ct = await _find_content(content_id, hint, hydrate=False)
+    if not item:
+        raise HTTPException(404, "Content not found")
+    try:
+        return item, ct, await item_index(ct.value, item)
+    except ValueError:
+        raise HTTPException(422, "Content is not a JSON item array")
+
+
+@router.get("/{content_id}/items")
+async def list_content_items(
+    content_id: str,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    """Item keys and titles of one version, without the item bodies."""
+    item, ct, index = await _item_index(content_id, type)
+    return {
+        "id": str(item.id), "type": ct.value, "updatedAt": item.updatedAt,
+        "count": len(index), "items": index.summaries,
+    }
+
+
+@router.get("/{content_id}/items/{key}")
+async def get_content_item(
+    content_id: str, key: str,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    """One item (beat / shot / storyboard panel) of a version by key."""
+    item, ct, index = await _item_index(content_id, type)
+    body = index.get(key)
+    if body is None:
+        raise HTTPException(404, "Item not found")
+    return {"id": str(item.id), "type": ct.value, "key": key, "updatedAt": item.updatedAt, "item": body}
+
+
+# ── GET /content/{a}/diff/{b} ───────────────────────────────
+
+def _version_ref(item: Any) -> Dict[str, Any]:
+    return {"id": str(item.id), "versionNo": item.metadata.versionNo, "contentHash": item.contentHash}
+
+
+@router.get("/{content_id}/diff/{other_id}")
+async def diff_content(
+    content_id: str, other_id: str,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    """Structural diff from version `content_id` to `other_id`: items added,
+    removed and changed (field-level RFC 6902 ops), matched by item key.
+    Memoized per pair of content hashes."""
+    (old, ct), (new, other_ct) = await gather_bounded(
+        _find_content(content_id, type, hydrate=False),
+        _find_content(other_id, type, hydrate=False),
+    )
+    if not old or not new:
+        raise HTTPException(404, "Content not found")
+    if ct != other_ct:
+        raise HTTPException(400, "Both versions must be of the same type")
+    try:
+        result = await item_diff(ct.value, old, new)
+    except ValueError:
+        raise HTTPException(422, "Content is not a JSON item array")
+    return {"type": ct.value, "from": _version_ref(old), "to": _version_ref(new), **result}
+
+
+# ── Per-item selection: /content/parts/{part_id}/{type}/… ───
+
+@router.get("/parts/{part_id}/{type}/selection")
+async def get_item_selection(
+    part_id: str, type: ContentType,
+    user: User = Depends(get_current_active_user),
+):
+    """Item key → version id picks layered over the selected version."""
+    return await selections.get_selection(PydanticObjectId(part_id), type.value)
+
+
+@router.put("/parts/{part_id}/{type}/selection/{key}")
+async def pick_item_version(
+    part_id: str, type: ContentType, key: str, body: ItemPick,
+    user: User = Depends(get_current_active_user),
+):
+    """Use another version's copy of one item (a single small write)."""
+    item, ct, index = await _item_index(body.contentId, type)
+    if str(item.partId) != part_id:
+        raise HTTPException(400, "Content belongs to a different part")
+    if index.get(key) is None:
+        raise HTTPException(404, "Item not found in that version")
+    return await selections.set_pick(item, ct.value, key)
+
+
+@router.delete("/parts/{part_id}/{type}/selection/{key}")
+async def clear_item_pick(
+    part_id: str, type: ContentType, key: str,
+    user: User = Depends(get_current_active_user),
+):
+    """Go back to the selected version's copy of the item."""
+    result = await selections.clear_pick(PydanticObjectId(part_id), type.value, key)
+    if result is None:
+        raise HTTPException(404, "No pick for this item")
+    return result
+
+
+@router.get("/parts/{part_id}/{type}/effective")
+async def get_effective_content(
+    part_id: str, type: ContentType,
+    user: User = Depends(get_current_active_user),
+):
+    """The selected version with per-item picks applied, as one content
+    string (cached until the selection or any version involved changes)."""
+    try:
+        result = await selections.effective_content(MODEL_MAP[type], type.value, PydanticObjectId(part_id))
+    except ValueError:
+        raise HTTPException(422, "Content is not a JSON item array")
+    if result is None:
+        raise HTTPException(404, "No selected version for this part")
+    return result
+
+
 # ── DELETE /content/{id} ────────────────────────────────────
 
 @router.delete("/{content_id}", status_code=204)
-async def delete_content(content_id: str, user: User = Depends(get_current_active_user)):
-    item, ct = await _find_content(content_id)
+async def delete_content(
+    content_id: str,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    item, ct = await _find_content(content_id, type)
     if not item:
         raise HTTPException(404, "Content not found")
+    autosave.discard(item.id)
     await item.delete()
+    await gather_bounded(
+        apply_doc_delta(item, -1), id_registry.unregister(item.id),
+        selections.drop_version(item.partId, ct.value, item.id),
+    )
 
 
 # ── POST /content/{id}/select ───────────────────────────────
 
 @router.post("/{content_id}/select", response_model=ContentOut)
-async def select_content(content_id: str, user: User = Depends(get_current_active_user)):
+async def select_content(
+    content_id: str,
+    type: Optional[ContentType] = None,
+    user: User = Depends(get_current_active_user),
+):
     """Mark this version as selected (un-selects all other versions for same part & type)."""
-    item, ct = await _find_content(content_id)
+    item, ct = await _find_content(content_id, type)
     if not item:
         raise HTTPException(404, "Content not found")
 
-    Model = MODEL_MAP[ct]
-    # Unselect all sibling versions of the same type for the same part
-    siblings = await Model.find(Model.partId == item.partId).to_list()
-    for s in siblings:
-        if s.metadata.selected and s.id != item.id:
-            s.metadata.selected = False
-            s.updatedAt = datetime.utcnow()
-            await s.save()
-
-    item.metadata.selected = True
-    item.updatedAt = datetime.utcnow()
-    await item.save()
+    await _select_exclusive(MODEL_MAP[ct], item)
     return _out(item, ct.value)
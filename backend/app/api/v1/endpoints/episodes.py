@@ -1,19 +1,18 @@
 """Episode CRUD (nested under projects)."""
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from datetime import datetime
 from beanie import PydanticObjectId
 
 from app.models.project import Project
 from app.models.episode import Episode
-from app.models.part import Part
-from app.models.beat import Beat
-from app.models.shot import Shot
-from app.models.storyboard import Storyboard
-from app.models.media import Image, Clip
 from app.models.user import User
 from app.core.auth import get_current_active_user
+from app.utils.counters import apply_delta, stats_delta
+from app.utils.cascade import delete_episode_tree, should_run_in_background
+from app.utils.jobs import JOB_ACCEPTED_RESPONSES, JobAccepted, jobs
 
 router = APIRouter()
 
@@ -78,18 +77,19 @@ async def update_episode(project_id: str, episode_id: str, body: EpisodeUpdate,
     return _out(ep)
 
 
-@router.delete("/{project_id}/episodes/{episode_id}", status_code=204)
+@router.delete("/{project_id}/episodes/{episode_id}", status_code=204, responses=JOB_ACCEPTED_RESPONSES)
 async def delete_episode(project_id: str, episode_id: str, user: User = Depends(get_current_active_user)):
     ep = await Episode.get(PydanticObjectId(episode_id))
     if not ep or str(ep.projectId) != project_id:
         raise HTTPException(404, "Episode not found")
-    # Cascade delete
-    parts = await Part.find(Part.episodeId == ep.id).to_list()
-    for part in parts:
-        await Beat.find(Beat.partId == part.id).delete()
-        await Shot.find(Shot.partId == part.id).delete()
-        await Storyboard.find(Storyboard.partId == part.id).delete()
-        await Image.find(Image.partId == part.id).delete()
-        await Clip.find(Clip.partId == part.id).delete()
-        await part.delete()
+    # Remove the root first so the episode disappears immediately, then cascade
     await ep.delete()
+    proj = await Project.get(ep.projectId)
+    await apply_delta(
+        stats_delta(ep.stats),
+        org_id=proj.organizationId if proj else None, project_id=ep.projectId,
+    )
+    if should_run_in_background(ep.stats):
+        job = jobs.submit("delete_episode", lambda job: delete_episode_tree(ep.id, job), episodeId=str(ep.id))
+        return JSONResponse(status_code=202, content=JobAccepted(jobId=job.id, status=job.status).model_dump())
+    await delete_episode_tree(ep.id)
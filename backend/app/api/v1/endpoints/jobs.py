@@ -0,0 +1,16 @@
+"""Background job status (cascade deletes, part seeding)."""
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.models.user import User
+from app.core.auth import get_current_active_user
+from app.utils.jobs import Job, jobs
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str, user: User = Depends(get_current_active_user)):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job
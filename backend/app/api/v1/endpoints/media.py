@@ -10,6 +10,9 @@ from app.models.media import Image, Clip, MediaMetadata
 from app.models.part import Part
 from app.models.user import User
 from app.core.auth import get_current_active_user
+from app.utils.counters import apply_doc_delta
+from app.utils.aio import gather_bounded
+from app.utils import id_registry
 
 router = APIRouter()
 
@@ -65,6 +68,7 @@ async def create_media(body: MediaCreate, user: User = Depends(get_current_activ
             metadata=meta,
         )
         await item.insert()
+        await gather_bounded(apply_doc_delta(item), id_registry.register(item))
         return MediaOut(
             id=str(item.id), type="image",
             organizationId=str(item.organizationId),
@@ -83,6 +87,7 @@ async def create_media(body: MediaCreate, user: User = Depends(get_current_activ
             metadata=meta,
         )
         await item.insert()
+        await gather_bounded(apply_doc_delta(item), id_registry.register(item))
         return MediaOut(
             id=str(item.id), type="clip",
             organizationId=str(item.organizationId),
@@ -97,15 +102,17 @@ async def create_media(body: MediaCreate, user: User = Depends(get_current_activ
 # ── DELETE /media/{id} ──────────────────────────────────────
 
 @router.delete("/{media_id}", status_code=204)
-async def delete_media(media_id: str, user: User = Depends(get_current_active_user)):
-    oid = PydanticObjectId(media_id)
-    # Try image first, then clip (IDs are globally unique)
-    img = await Image.get(oid)
-    if img:
-        await img.delete()
-        return
-    clip = await Clip.get(oid)
-    if clip:
-        await clip.delete()
-        return
-    raise HTTPException(404, "Media not found")
+async def delete_media(
+    media_id: str,
+    type: Optional[MediaType] = None,
+    user: User = Depends(get_current_active_user),
+):
+    # Owning collection comes from the ID registry (or the `?type=` hint)
+    item, _ = await id_registry.lookup(
+        PydanticObjectId(media_id), [mt.value for mt in MediaType],
+        hint=type.value if type else None,
+    )
+    if not item:
+        raise HTTPException(404, "Media not found")
+    await item.delete()
+    await gather_bounded(apply_doc_delta(item, -1), id_registry.unregister(item.id))
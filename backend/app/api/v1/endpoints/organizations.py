@@ -1,11 +1,15 @@
-"""Organization endpoints: create, get, add member, list members."""
-from fastapi import APIRouter, Depends, HTTPException
+"""Organization endpoints: create, get, add member(s), list members."""
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from beanie import PydanticObjectId
 
 from app.models.organization import Organization
 from app.models.user import User
-from app.core.auth import get_current_active_user
+from app.core.auth import get_current_active_user, invalidate_user
+from app.core.config import settings
+from app.utils import org_members
 
 router = APIRouter()
 
@@ -18,6 +22,10 @@ class AddMember(BaseModel):
     email: str
 
 
+class AddMembers(BaseModel):
+    emails: List[str]
+
+
 class MemberOut(BaseModel):
     id: str
     email: str
@@ -29,16 +37,34 @@ class OrgOut(BaseModel):
     id: str
     name: str
     members: List[MemberOut]
+    stats: Dict[str, int] = {}
     created_at: str
 
 
+class AddMembersOut(BaseModel):
+    added: List[MemberOut]
+    notFound: List[str]
+    alreadyInOrganization: List[str]
+
+
+class _Candidate(org_members.MemberView):
+    organizationId: Optional[PydanticObjectId] = None
+
+
 async def _org_response(org: Organization) -> OrgOut:
-    members = []
-    for mid in org.memberIds:
-        m = await User.get(mid)
-        if m:
-            members.append(MemberOut(id=str(m.id), email=m.email, name=m.name, avatarUrl=m.avatarUrl))
-    return OrgOut(id=str(org.id), name=org.name, members=members, created_at=org.createdAt.isoformat())
+    payload = await org_members.org_payload(org.id)
+    members = payload["members"] if payload else []
+    return OrgOut(id=str(org.id), name=org.name, members=members, stats=org.stats.model_dump(),
+                  created_at=org.createdAt.isoformat())
+
+
+async def _my_org(user: User) -> Organization:
+    if not user.organizationId:
+        raise HTTPException(400, "No organization")
+    org = await Organization.get(user.organizationId)
+    if not org:
+        raise HTTPException(404, "Organization not found")
+    return org
 
 
 @router.post("/", response_model=OrgOut)
@@ -47,10 +73,12 @@ async def create_organization(body: OrgCreate, user: User = Depends(get_current_
         raise HTTPException(400, "User already belongs to an organization")
     if await Organization.find_one(Organization.name == body.name):
         raise HTTPException(400, "Organization name already taken")
-    org = Organization(name=body.name, memberIds=[user.id])
+    org = Organization(name=body.name)
     await org.insert()
-    user.organizationId = org.id
-    await user.save()
+    if not await org_members.add_members(org.id, [user.id]):
+        await org.delete()
+        raise HTTPException(400, "User already belongs to an organization")
+    invalidate_user(user.id)
     return await _org_response(org)
 
 
@@ -66,33 +94,42 @@ async def get_my_organization(user: User = Depends(get_current_active_user)):
 
 @router.post("/add-member", response_model=MemberOut)
 async def add_member(body: AddMember, user: User = Depends(get_current_active_user)):
-    if not user.organizationId:
-        raise HTTPException(400, "No organization")
-    org = await Organization.get(user.organizationId)
-    if not org:
-        raise HTTPException(404, "Organization not found")
+    org = await _my_org(user)
     member = await User.find_one(User.email == body.email)
     if not member:
         raise HTTPException(404, f"User with email {body.email} not found")
-    if member.organizationId:
+    if member.organizationId or not await org_members.add_members(org.id, [member.id]):
         raise HTTPException(400, "User already belongs to an organization")
-    org.memberIds.append(member.id)
-    await org.save()
-    member.organizationId = org.id
-    await member.save()
+    invalidate_user(member.id)
     return MemberOut(id=str(member.id), email=member.email, name=member.name, avatarUrl=member.avatarUrl)
 
 
+@router.post("/add-members", response_model=AddMembersOut)
+async def add_members(body: AddMembers, user: User = Depends(get_current_active_user)):
+    """Add many members by email with one lookup and one update."""
+    if len(body.emails) > settings.ORG_BULK_ADD_LIMIT:
+        raise HTTPException(400, f"At most {settings.ORG_BULK_ADD_LIMIT} emails per request")
+    org = await _my_org(user)
+    emails = list(dict.fromkeys(body.emails))
+    found = await User.find({"email": {"$in": emails}}).project(_Candidate).to_list()
+    by_email = {m.email: m for m in found}
+    free = [m.id for m in found if m.organizationId is None]
+    added_ids = set(await org_members.add_members(org.id, free))
+    for uid in added_ids:
+        invalidate_user(uid)
+    return AddMembersOut(
+        added=[m.to_dict() for m in found if m.id in added_ids],
+        notFound=[e for e in emails if e not in by_email],
+        alreadyInOrganization=[m.email for m in found if m.id not in added_ids],
+    )
+
+
 @router.get("/members", response_model=List[MemberOut])
-async def list_members(user: User = Depends(get_current_active_user)):
-    if not user.organizationId:
-        raise HTTPException(400, "No organization")
-    org = await Organization.get(user.organizationId)
-    if not org:
-        raise HTTPException(404, "Organization not found")
-    out = []
-    for mid in org.memberIds:
-        m = await User.get(mid)
-        if m:
-            out.append(MemberOut(id=str(m.id), email=m.email, name=m.name, avatarUrl=m.avatarUrl))
-    return out
+async def list_members(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.ORG_MEMBERS_MAX_PAGE),
+    user: User = Depends(get_current_active_user),
+):
+    org = await _my_org(user)
+    members = await org_members.list_members(org.id, skip=skip, limit=limit)
+    return [m.to_dict() for m in members]
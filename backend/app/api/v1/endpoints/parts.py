@@ -1,7 +1,7 @@
 """Part CRUD (nested under projects/episodes) + /studio data endpoint."""
-from typing import List, Optional
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
 from datetime import datetime
 from beanie import PydanticObjectId
 
@@ -15,9 +15,18 @@ from app.models.media import Image, Clip
 from app.models.character import Character
 from app.models.location import Location
 from app.models.prop import Prop
+from app.models.content_blob import ContentSummary
+from app.models.content_codec import ContentNotLoaded
 from app.models.user import User
 from app.core.auth import get_current_active_user
-from app.utils.seed_part import seed_part_data
+from app.core.config import settings
+from app.utils.seed_part import fail_stale_seeds, run_seed_job
+from app.utils.jobs import jobs, JobQueueFull
+from app.utils.aio import gather_bounded
+from app.utils.counters import apply_delta, stats_delta
+from app.utils.cascade import delete_parts
+from app.utils.content_writes import backfill_summaries
+from app.utils import blobs, retention
 
 
 # ── Two routers: one for nested CRUD, one for /parts/{id}/studio ──
@@ -45,15 +54,25 @@ class PartOut(BaseModel):
     title: str
     scriptText: Optional[str] = None
     createdBy: Optional[str] = None
+    seedStatus: str = "done"
     createdAt: datetime
     updatedAt: datetime
 
 
+class SeedStatusOut(BaseModel):
+    partId: str
+    seedStatus: str
+    seedError: Optional[str] = None
+    seededAt: Optional[datetime] = None
+    jobId: Optional[str] = None
+
+
 def _out(p: Part) -> PartOut:
     return PartOut(
         id=str(p.id), projectId=str(p.projectId), episodeId=str(p.episodeId),
         partNumber=p.partNumber, title=p.title, scriptText=p.scriptText,
         createdBy=str(p.createdBy) if p.createdBy else None,
+        seedStatus=p.seedStatus,
         createdAt=p.createdAt, updatedAt=p.updatedAt,
     )
 
@@ -76,23 +95,28 @@ async def create_part(project_id: str, episode_id: str, body: PartCreate, user:
     proj = await Project.get(PydanticObjectId(project_id))
     if not proj:
         raise HTTPException(404, "Project not found")
+    if jobs.pending_of("seed_part") >= settings.SEED_QUEUE_LIMIT:
+        raise HTTPException(503, "Too many parts are being set up right now, please retry shortly")
     part = Part(
         projectId=PydanticObjectId(project_id), episodeId=ep.id,
         partNumber=body.partNumber, title=body.title,
         scriptText=body.scriptText, createdBy=user.id,
+        seedStatus="pending",
     )
     await part.insert()
 
-    # Auto-seed demo content (beats, shots, storyboards, images, clips)
+    # Auto-seed demo content (beats, shots, storyboards, images, clips) in the background
     try:
-        await seed_part_data(
-            org_id=proj.organizationId,
-            project_id=proj.id,
-            episode_id=ep.id,
-            part_id=part.id,
+        jobs.submit(
+            "seed_part",
+            lambda job: run_seed_job(job, proj.organizationId, proj.id, ep.id, part.id),
+            max_pending=settings.SEED_QUEUE_LIMIT,
+            partId=str(part.id), projectId=str(proj.id),
         )
-    except Exception as e:
-        print(f"Warning: auto-seed failed for part {part.id}: {e}")
+    except JobQueueFull:
+        part.seedStatus = "failed"
+        part.seedError = "Seed queue full"
+        await part.save()
 
     return _out(part)
 
@@ -118,13 +142,14 @@ async def delete_part(project_id: str, episode_id: str, part_id: str, user: User
     part = await Part.get(PydanticObjectId(part_id))
     if not part or str(part.episodeId) != episode_id:
         raise HTTPException(404, "Part not found")
-    # Cascade delete content
-    await Beat.find(Beat.partId == part.id).delete()
-    await Shot.find(Shot.partId == part.id).delete()
-    await Storyboard.find(Storyboard.partId == part.id).delete()
-    await Image.find(Image.partId == part.id).delete()
-    await Clip.find(Clip.partId == part.id).delete()
-    await part.delete()
+    # Cascade delete content (one deleteMany per collection, concurrently)
+    await delete_parts([part.id])
+    proj = await Project.get(part.projectId)
+    await apply_delta(
+        stats_delta(part.stats),
+        org_id=proj.organizationId if proj else None,
+        project_id=part.projectId, episode_id=part.episodeId,
+    )
 
 
 # ── Studio data: GET /parts/{part_id}/studio ─────────────────
@@ -133,36 +158,152 @@ def _str(oid) -> Optional[str]:
     return str(oid) if oid else None
 
 
-@studio_router.get("/{part_id}/studio")
-async def get_part_studio(part_id: str, user: User = Depends(get_current_active_user)):
-    """Returns part + episode + all beats/shots/storyboards/images/clips in ONE call."""
-    pid = PydanticObjectId(part_id)
-    part = await Part.get(pid)
+@studio_router.get("/{part_id}/seed-status", response_model=SeedStatusOut)
+async def get_seed_status(part_id: str, user: User = Depends(get_current_active_user)):
+    """Status of the demo-content seeding job started by create_part."""
+    part = await Part.get(PydanticObjectId(part_id))
     if not part:
         raise HTTPException(404, "Part not found")
+    job = jobs.find(kind="seed_part", partId=part_id)
+    if part.seedStatus in ("pending", "running") and not job and await fail_stale_seeds(part.id):
+        part = await Part.get(part.id)
+    return SeedStatusOut(
+        partId=str(part.id), seedStatus=part.seedStatus, seedError=part.seedError,
+        seededAt=part.seededAt, jobId=job.id if job else None,
+    )
+
+
+VERSIONED_MODELS = (Beat, Shot, Storyboard)
 
-    episode = await Episode.get(part.episodeId)
 
-    beats = await Beat.find(Beat.partId == pid).to_list()
-    shots = await Shot.find(Shot.partId == pid).to_list()
-    storyboards = await Storyboard.find(Storyboard.partId == pid).to_list()
-    images = await Image.find(Image.partId == pid).to_list()
-    clips = await Clip.find(Clip.partId == pid).to_list()
+class _VersionView(BaseModel):
+    """Projection for the lazy studio: one version without its body."""
+    id: PydanticObjectId = Field(alias="_id")
+    partId: PydanticObjectId
+    metadata: Dict[str, Any]
+    contentSize: Optional[int] = None
+    summary: Optional[ContentSummary] = None
+    createdAt: datetime
+    updatedAt: datetime
+
+
+async def _fill_summaries(model, views: List[_VersionView]) -> None:
+    """Versions written before summaries existed get one computed (and stored) now."""
+    missing = [v.id for v in views if v.summary is None]
+    if not missing:
+        return
+    summaries = await backfill_summaries(model, missing)
+    for v in views:
+        if v.summary is None:
+            v.summary = summaries.get(v.id)
+
+
+async def _load_studio(pid: PydanticObjectId, lazy: bool = False) -> dict:
+    """Concurrent query plan for the studio page.
+
+    Wave 1: the part plus everything keyed by partId. In lazy mode the
+            beats/shots/storyboards are read without bodies, plus the
+            selected version of each in full.
+    Wave 2: the episode plus project-level assets (need part.episodeId / projectId),
+            and the content blobs of the versions whose body is returned.
+    Wave 3: one $in lookup for all asset reference images.
+    """
+    if lazy:
+        versions = [m.find(m.partId == pid).project(_VersionView).to_list() for m in VERSIONED_MODELS]
+        selected = [m.find({"partId": pid, "metadata.selected": True}).to_list() for m in VERSIONED_MODELS]
+    else:
+        versions = [m.find(m.partId == pid).to_list() for m in VERSIONED_MODELS]
+        selected = []
+    part, beats, shots, storyboards, images, clips, *selected = await gather_bounded(
+        Part.get(pid), *versions,
+        Image.find(Image.partId == pid).to_list(),
+        Clip.find(Clip.partId == pid).to_list(),
+        *selected,
+    )
+    if not part:
+        raise HTTPException(404, "Part not found")
+    bodies = [d for docs in selected for d in docs] if lazy else [*beats, *shots, *storyboards]
 
     # Project-level assets
     proj_id = part.projectId
-    characters = await Character.find(Character.projectId == proj_id).sort("+name").to_list()
-    locations = await Location.find(Location.projectId == proj_id).sort("+name").to_list()
-    props = await Prop.find(Prop.projectId == proj_id).sort("+name").to_list()
+    episode, characters, locations, props, *_ = await gather_bounded(
+        Episode.get(part.episodeId),
+        Character.find(Character.projectId == proj_id).sort("+name").to_list(),
+        Location.find(Location.projectId == proj_id).sort("+name").to_list(),
+        Prop.find(Prop.projectId == proj_id).sort("+name").to_list(),
+        blobs.hydrate(*bodies),
+        *(
+            _fill_summaries(m, views)
+            for m, views in zip(VERSIONED_MODELS, (beats, shots, storyboards)) if lazy
+        ),
+    )
 
     # Resolve asset image IDs
     all_asset_img_ids = []
     for asset in [*characters, *locations, *props]:
         all_asset_img_ids.extend(asset.imageIds)
-    asset_images_map = {}
+    asset_imgs = []
     if all_asset_img_ids:
         asset_imgs = await Image.find({"_id": {"$in": all_asset_img_ids}}).to_list()
-        asset_images_map = {str(img.id): img for img in asset_imgs}
+
+    return {
+        "part": part, "episode": episode,
+        "beats": beats, "shots": shots, "storyboards": storyboards,
+        "bodies": {d.id: d for d in bodies},
+        "images": images, "clips": clips,
+        "characters": characters, "locations": locations, "props": props,
+        "asset_images": asset_imgs,
+    }
+
+
+# ── Version archive: /parts/{part_id}/archive ────────────────
+
+@studio_router.get("/{part_id}/archive")
+async def list_archived_versions(part_id: str, user: User = Depends(get_current_active_user)):
+    """Versions of this part moved out by the retention sweeper (no bodies)."""
+    return {"partId": part_id, "versions": await retention.list_archived(PydanticObjectId(part_id))}
+
+
+@studio_router.post("/{part_id}/archive/{version_id}/restore")
+async def restore_archived_version(part_id: str, version_id: str, user: User = Depends(get_current_active_user)):
+    """Move an archived version back (unselected, same ID)."""
+    kind = await retention.restore(PydanticObjectId(version_id), PydanticObjectId(part_id))
+    if kind is None:
+        raise HTTPException(404, "Archived version not found")
+    return {"id": version_id, "type": kind, "restored": True}
+
+
+def _version_out(v: _VersionView, bodies: Dict[PydanticObjectId, Any]) -> dict:
+    """Lazy-studio entry: summary fields, plus the body for the selected version."""
+    summary = v.summary or ContentSummary()
+    body = bodies.get(v.id)
+    try:
+        content = body.content if body else None
+    except ContentNotLoaded:  # blob missing (logged by hydrate) – the summary still shows
+        content = None
+    return {
+        "id": _str(v.id), "partId": _str(v.partId), "metadata": v.metadata,
+        "contentBytes": v.contentSize, "contentHash": summary.hash,
+        "itemCount": summary.itemCount, "items": summary.items,
+        "content": content,
+        "createdAt": v.createdAt.isoformat(), "updatedAt": v.updatedAt.isoformat(),
+    }
+
+
+@studio_router.get("/{part_id}/studio")
+async def get_part_studio(part_id: str, lazy: bool = False, user: User = Depends(get_current_active_user)):
+    """Returns part + episode + all beats/shots/storyboards/images/clips in ONE call.
+
+    With `?lazy=true` beat/shot/storyboard versions come as summaries (item
+    count and titles precomputed at write time); only the selected version
+    of each type carries `content`. Other bodies: `GET /content/{id}`.
+    """
+    data = await _load_studio(PydanticObjectId(part_id), lazy)
+    part, episode = data["part"], data["episode"]
+    beats, shots, storyboards = data["beats"], data["shots"], data["storyboards"]
+    images, clips = data["images"], data["clips"]
+    characters, locations, props = data["characters"], data["locations"], data["props"]
+    asset_images_map = {str(img.id): img for img in data["asset_images"]}
 
     def _asset_images(image_ids):
         return [
@@ -180,7 +321,7 @@ async def get_part_studio(part_id: str, user: User = Depends(get_current_active_
             "id": _str(part.id), "title": part.title,
             "episodeId": _str(part.episodeId), "projectId": _str(part.projectId),
             "partNumber": part.partNumber, "scriptText": part.scriptText,
-            "createdBy": _str(part.createdBy),
+            "createdBy": _str(part.createdBy), "seedStatus": part.seedStatus,
             "createdAt": part.createdAt.isoformat(), "updatedAt": part.updatedAt.isoformat(),
         },
         "episode": {
@@ -188,7 +329,7 @@ async def get_part_studio(part_id: str, user: User = Depends(get_current_active_
             "episodeNumber": episode.episodeNumber, "bibleText": episode.bibleText,
             "createdAt": episode.createdAt.isoformat(), "updatedAt": episode.updatedAt.isoformat(),
         } if episode else None,
-        "beats": [
+        "beats": [_version_out(v, data["bodies"]) for v in beats] if lazy else [
             {
                 "id": _str(b.id), "partId": _str(b.partId),
                 "content": b.content, "metadata": b.metadata.model_dump(),
@@ -196,7 +337,7 @@ async def get_part_studio(part_id: str, user: User = Depends(get_current_active_
             }
             for b in beats
         ],
-        "shots": [
+        "shots": [_version_out(v, data["bodies"]) for v in shots] if lazy else [
             {
                 "id": _str(s.id), "partId": _str(s.partId),
                 "content": s.content, "metadata": s.metadata.model_dump(),
@@ -204,7 +345,7 @@ async def get_part_studio(part_id: str, user: User = Depends(get_current_active_
             }
             for s in shots
         ],
-        "storyboards": [
+        "storyboards": [_version_out(v, data["bodies"]) for v in storyboards] if lazy else [
             {
                 "id": _str(sb.id), "partId": _str(sb.partId),
                 "content": sb.content, "metadata": sb.metadata.model_dump(),
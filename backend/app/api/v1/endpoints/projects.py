@@ -1,19 +1,18 @@
 """Project CRUD + /full overview endpoint."""
-from typing import List, Optional
+from typing import Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from datetime import datetime
 from beanie import PydanticObjectId
 
 from app.models.project import Project
-from app.models.episode import Episode
-from app.models.part import Part
-from app.models.beat import Beat
-from app.models.shot import Shot
-from app.models.storyboard import Storyboard
-from app.models.media import Image, Clip
 from app.models.user import User
 from app.core.auth import get_current_active_user
+from app.utils.overview import project_tree
+from app.utils.counters import apply_delta, stats_delta
+from app.utils.cascade import delete_project_tree, should_run_in_background
+from app.utils.jobs import JOB_ACCEPTED_RESPONSES, JobAccepted, jobs
 
 router = APIRouter()
 
@@ -36,6 +35,7 @@ class ProjectOut(BaseModel):
     description: Optional[str] = None
     organization_id: str
     created_by: str
+    stats: Dict[str, int] = {}
     created_at: datetime
     updated_at: datetime
 
@@ -44,7 +44,7 @@ def _out(p: Project) -> ProjectOut:
     return ProjectOut(
         id=str(p.id), name=p.name, description=p.description,
         organization_id=str(p.organizationId), created_by=str(p.createdBy),
-        created_at=p.createdAt, updated_at=p.updatedAt,
+        stats=p.stats.model_dump(), created_at=p.createdAt, updated_at=p.updatedAt,
     )
 
 
@@ -89,64 +89,34 @@ async def update_project(project_id: str, body: ProjectUpdate, user: User = Depe
     return _out(p)
 
 
-@router.delete("/{project_id}", status_code=204)
+@router.delete("/{project_id}", status_code=204, responses=JOB_ACCEPTED_RESPONSES)
 async def delete_project(project_id: str, user: User = Depends(get_current_active_user)):
     p = await Project.get(PydanticObjectId(project_id))
     if not p:
         raise HTTPException(404, "Project not found")
-    # Cascade delete all children
-    episodes = await Episode.find(Episode.projectId == p.id).to_list()
-    for ep in episodes:
-        parts = await Part.find(Part.episodeId == ep.id).to_list()
-        for part in parts:
-            await Beat.find(Beat.partId == part.id).delete()
-            await Shot.find(Shot.partId == part.id).delete()
-            await Storyboard.find(Storyboard.partId == part.id).delete()
-            await Image.find(Image.partId == part.id).delete()
-            await Clip.find(Clip.partId == part.id).delete()
-            await part.delete()
-        await ep.delete()
+    # Remove the root first so the project disappears immediately, then cascade
     await p.delete()
+    await apply_delta(stats_delta(p.stats), org_id=p.organizationId)
+    if should_run_in_background(p.stats):
+        job = jobs.submit("delete_project", lambda job: delete_project_tree(p.id, job), projectId=str(p.id))
+        return JSONResponse(status_code=202, content=JobAccepted(jobId=job.id, status=job.status).model_dump())
+    await delete_project_tree(p.id)
 
 
 # ── /full – returns project + all episodes + parts + counts ──
 
-async def _part_summary(p: Part) -> dict:
-    pid = p.id
-    return {
-        "id": str(pid), "title": p.title, "partNumber": p.partNumber,
-        "episodeId": str(p.episodeId), "projectId": str(p.projectId),
-        "scriptText": p.scriptText,
-        "beatCount": await Beat.find(Beat.partId == pid).count(),
-        "shotCount": await Shot.find(Shot.partId == pid).count(),
-        "storyboardCount": await Storyboard.find(Storyboard.partId == pid).count(),
-        "imageCount": await Image.find(Image.partId == pid).count(),
-        "clipCount": await Clip.find(Clip.partId == pid).count(),
-    }
-
-
 @router.get("/{project_id}/full")
 async def get_project_full(project_id: str, user: User = Depends(get_current_active_user)):
     """Project + all episodes + parts with content counts – one call for the whole project."""
-    proj = await Project.get(PydanticObjectId(project_id))
+    proj, ep_data = await project_tree(PydanticObjectId(project_id))
     if not proj:
         raise HTTPException(404, "Project not found")
 
-    episodes = await Episode.find(Episode.projectId == proj.id).sort("+episodeNumber").to_list()
-    ep_data = []
-    for ep in episodes:
-        parts = await Part.find(Part.episodeId == ep.id).sort("+partNumber").to_list()
-        ep_data.append({
-            "id": str(ep.id), "projectId": str(ep.projectId),
-            "episodeNumber": ep.episodeNumber, "bibleText": ep.bibleText,
-            "parts": [await _part_summary(p) for p in parts],
-            "createdAt": ep.createdAt.isoformat(), "updatedAt": ep.updatedAt.isoformat(),
-        })
-
     return {
         "id": str(proj.id), "name": proj.name, "description": proj.description,
         "organizationId": str(proj.organizationId),
         "createdBy": str(proj.createdBy),
+        "stats": proj.stats.model_dump(),
         "episodes": ep_data,
         "createdAt": proj.createdAt.isoformat(), "updatedAt": proj.updatedAt.isoformat(),
     }
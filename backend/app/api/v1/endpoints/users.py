@@ -4,7 +4,8 @@ from pydantic import BaseModel
 from typing import Optional
 
 from app.models.user import User
-from app.core.auth import get_current_active_user
+from app.core.auth import get_current_active_user, invalidate_user
+from app.utils.org_members import invalidate_org
 
 router = APIRouter()
 
@@ -44,5 +45,7 @@ async def update_profile(body: ProfileUpdate, user: User = Depends(get_current_a
     if body.bio is not None:
         user.bio = body.bio
     await user.save()
+    invalidate_user(user.id)
+    invalidate_org(user.organizationId)
     return _profile(user)
 
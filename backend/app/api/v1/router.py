@@ -9,6 +9,7 @@ from app.api.v1.endpoints import (
     content,
     media,
     assets,
+    jobs,
 )
 
 tags_metadata = [
@@ -21,6 +22,7 @@ tags_metadata = [
     {"name": "content", "description": "Unified CRUD for beats/shots/storyboards + select version."},
     {"name": "media", "description": "Unified image & clip CRUD."},
     {"name": "assets", "description": "Characters, Locations, Props CRUD with reference images."},
+    {"name": "jobs", "description": "Status / progress of background jobs (large deletes, seeding)."},
 ]
 
 api_router = APIRouter()
@@ -51,4 +53,5 @@ api_router.include_router(media.router, prefix="/media", tags=["media"])
 # Assets (characters, locations, props – unified)
 api_router.include_router(assets.router, prefix="/assets", tags=["assets"])
 
-
+# Background jobs
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
@@ -1,16 +1,55 @@
+import asyncio
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt, ExpiredSignatureError
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from google.auth import jwt as google_jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
 from app.models.user import User
+from app.utils.cache import TTLCache
+from app.core.google_certs import get_cert_source, token_kid
 
 security = HTTPBearer()
 
+# Decoded access-token payloads keyed by sha256(token), kept until the token expires
+_token_cache: TTLCache[str, dict] = TTLCache("auth.tokens", settings.AUTH_TOKEN_CACHE_SIZE)
+# User documents keyed by id; invalidated by invalidate_user() on profile/org changes
+_user_cache: TTLCache[str, User] = TTLCache(
+    "auth.users", settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user(user_id) -> None:
+    """Drop a cached User after it was modified (this process only; other
+    workers pick the change up within AUTH_USER_CACHE_TTL_SECONDS)."""
+    _user_cache.pop(str(user_id))
+
+
+def _decode_access_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = _token_cache.get(key)
+    if payload is None:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        exp = payload.get("exp")
+        if exp:
+            _token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
+
+async def _load_user(user_id: str) -> Optional[User]:
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = await User.get(user_id)
+        if user is None:
+            return None
+        _user_cache.set(user_id, user)
+    # Hand out a copy so a request mutating its user can't leak into others
+    return user.model_copy()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -26,20 +65,23 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def _verify_google_token_sync(token: str) -> dict:
+    """Blocking part of verification: (cached) cert lookup + signature check."""
+    certs = get_cert_source().get_certs(kid=token_kid(token))
+    return google_jwt.decode(token, certs=certs, audience=settings.GOOGLE_CLIENT_ID)
+
+
 async def verify_google_token(token: str) -> dict:
     """Verify Google OAuth token and return user info"""
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token, 
-            requests.Request(), 
-            settings.GOOGLE_CLIENT_ID
-        )
+        # Cert fetch + RSA verify run in a worker thread, off the event loop
+        idinfo = await asyncio.to_thread(_verify_google_token_sync, token)
         
         if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
             raise ValueError('Wrong issuer.')
         
         # Verify token is not expired
-        if idinfo['exp'] < datetime.utcnow().timestamp():
+        if idinfo['exp'] < time.time():
             raise ValueError('Token expired.')
         
         return {
@@ -69,7 +111,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     )
     
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = _decode_access_token(token)
         user_id: str = payload.get("sub")
         token_type: str = payload.get("type")
         
@@ -78,7 +120,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             
         # Check if token is expired (double check)
         exp = payload.get("exp")
-        if exp and datetime.utcnow().timestamp() > exp:
+        if exp and time.time() > exp:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired",
@@ -94,7 +136,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
     
-    user = await User.get(user_id)
+    user = await _load_user(user_id)
     if user is None:
         raise credentials_exception
     
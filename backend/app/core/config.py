@@ -28,6 +28,27 @@ class Settings(BaseSettings):
     # Database
     MONGODB_URL: str
     MONGODB_DB_NAME: str = "loqo_db"
+    # Max concurrent queries a single request may fan out (studio loader etc.)
+    DB_QUERY_CONCURRENCY: int = 8
+    # Background jobs (cascade deletes, seeding) running at once per process
+    BACKGROUND_JOB_CONCURRENCY: int = 4
+    # Cascade deletes touching more content/media docs than this run as a job
+    CASCADE_BACKGROUND_THRESHOLD: int = 5000
+    # Max part-seeding jobs queued or running per process before create_part returns 503
+    SEED_QUEUE_LIMIT: int = 50
+    # Parts still pending/running this long after creation lost their seed job (restart) and are marked failed
+    SEED_STALE_SECONDS: int = 900
+    # Version retention: keep the selected version plus the newest N per part
+    # & type; older ones untouched for the min age move to archived_versions.
+    # The sweeper runs every INTERVAL seconds (0 = only via scripts.retention)
+    VERSION_RETENTION_KEEP: int = 10
+    VERSION_RETENTION_MIN_AGE_SECONDS: int = 86400
+    VERSION_RETENTION_BATCH: int = 200
+    VERSION_RETENTION_INTERVAL_SECONDS: int = 0
+
+    # Demodata manifest (seed data index) – persisted copy + mtime recheck interval
+    DEMODATA_MANIFEST_PATH: str = str(Path(__file__).parent.parent.parent / ".cache" / "demodata_manifest.json")
+    DEMODATA_RECHECK_SECONDS: int = 60
 
     # Authentication
     GOOGLE_CLIENT_ID: str
@@ -37,6 +58,53 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 360
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # get_current_user caches (per process)
+    AUTH_USER_CACHE_SIZE: int = 1024
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+    AUTH_TOKEN_CACHE_SIZE: int = 4096
+
+    # JSON `content` strings at least this large are stored zlib-compressed
+    CONTENT_COMPRESS_THRESHOLD: int = 2048
+    CONTENT_COMPRESS_LEVEL: int = 6
+    # Content-addressed blobs: decoded bodies cached per process; unreferenced
+    # blobs are garbage-collected after the grace period
+    CONTENT_BLOB_CACHE_SIZE: int = 512
+    CONTENT_BLOB_GC_GRACE_SECONDS: int = 3600
+    # Optional delta storage: new bodies stored as diffs against the previous
+    # one, with a full keyframe every N links (lower N = faster cold reads)
+    CONTENT_DELTA_ENABLED: bool = False
+    CONTENT_DELTA_KEYFRAME_INTERVAL: int = 8
+    CONTENT_DELTA_MAX_RATIO: float = 0.5  # keyframe if the diff is larger than this share
+    # Opt-in native storage: JSON content written as BSON arrays/objects
+    # (projectable, partially updatable); existing documents are converted by
+    # a background job at startup, unmigrated ones keep reading as before
+    CONTENT_NATIVE_ENABLED: bool = False
+    CONTENT_NATIVE_MIGRATE_ON_STARTUP: bool = True
+    CONTENT_NATIVE_MIGRATION_BATCH: int = 200
+    # Reject content writes that don't match their type's schema with 422
+    # (app/utils/content_schema.py – lenient: known fields are type-checked only)
+    CONTENT_SCHEMA_VALIDATION: bool = True
+    # Autosave (PUT /content/{id}/autosave): buffered edits are written at most
+    # once per interval per document; past MAX_PENDING unsaved documents new
+    # sessions get 503
+    CONTENT_AUTOSAVE_INTERVAL_SECONDS: float = 5.0
+    CONTENT_AUTOSAVE_MAX_PENDING: int = 5000
+
+    # Parsed item indexes per content revision (GET /content/{id}/items)
+    CONTENT_ITEM_INDEX_CACHE_SIZE: int = 256
+    # Item-level diffs between two bodies, keyed by their content hashes
+    CONTENT_DIFF_CACHE_SIZE: int = 512
+    # Resolved part content with per-item version picks (GET .../effective)
+    CONTENT_EFFECTIVE_CACHE_SIZE: int = 256
+
+    # In-memory front for the content_refs ID → type registry
+    ID_REGISTRY_CACHE_SIZE: int = 50000
+
+    # Organization payload (org + member list) cache for /auth/me and org endpoints
+    ORG_PAYLOAD_CACHE_SIZE: int = 1024
+    ORG_PAYLOAD_CACHE_TTL_SECONDS: int = 60
+    ORG_MEMBERS_MAX_PAGE: int = 500
+    ORG_BULK_ADD_LIMIT: int = 500
     
     model_config = SettingsConfigDict(
         env_file=str(_env_path) if _env_path.is_file() else None,
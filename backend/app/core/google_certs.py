@@ -0,0 +1,99 @@
+"""Google ID-token signing certificates with in-process caching.
+
+`verify_google_token` used to call `id_token.verify_oauth2_token`, which
+downloads Google's certs on every login. The cert source here keeps them in
+memory until the `Cache-Control: max-age` of the last response runs out
+(refetching early only when a token names an unknown key id). The source is
+pluggable via `set_cert_source`, so tests and local setups can swap in
+`StaticCertSource`.
+
+All methods are synchronous and thread-safe; callers run them in a worker
+thread.
+"""
+import base64
+import json
+import re
+import threading
+import time
+from typing import Dict, Optional, Protocol
+
+import requests
+
+GOOGLE_OAUTH2_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+DEFAULT_MAX_AGE = 300        # used when the response carries no max-age
+MIN_REFRESH_INTERVAL = 30    # floor between unknown-kid refetches
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class CertSource(Protocol):
+    def get_certs(self, kid: Optional[str] = None) -> Dict[str, str]:
+        """Return {key id: PEM certificate}; should include `kid` if known."""
+        ...
+
+
+class StaticCertSource:
+    """Fixed set of certificates – for tests or an offline stand-in."""
+
+    def __init__(self, certs: Dict[str, str]):
+        self.certs = dict(certs)
+
+    def get_certs(self, kid: Optional[str] = None) -> Dict[str, str]:
+        return self.certs
+
+
+class GoogleCertSource:
+    """Fetches Google's public certs and caches them per Cache-Control."""
+
+    def __init__(self, url: str = GOOGLE_OAUTH2_CERTS_URL, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_certs(self, kid: Optional[str] = None) -> Dict[str, str]:
+        now = time.monotonic()
+        stale = now >= self._expires_at
+        unknown_kid = kid is not None and kid not in self._certs
+        if not stale and not unknown_kid:
+            return self._certs
+        with self._lock:
+            now = time.monotonic()
+            stale = now >= self._expires_at
+            unknown_kid = kid is not None and kid not in self._certs
+            if stale or (unknown_kid and now - self._fetched_at >= MIN_REFRESH_INTERVAL):
+                self._fetch(now)
+            return self._certs
+
+    def _fetch(self, now: float) -> None:
+        resp = requests.get(self.url, timeout=self.timeout)
+        if resp.status_code != 200:
+            raise ValueError(f"Could not fetch Google certificates (HTTP {resp.status_code})")
+        m = _MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+        max_age = int(m.group(1)) if m else DEFAULT_MAX_AGE
+        self._certs = resp.json()
+        self._fetched_at = now
+        self._expires_at = now + max_age
+
+
+def token_kid(token: str) -> Optional[str]:
+    """Key id from the (unverified) JWT header, or None if unparsable."""
+    try:
+        header = token.split(".", 1)[0]
+        header += "=" * (-len(header) % 4)
+        return json.loads(base64.urlsafe_b64decode(header)).get("kid")
+    except (ValueError, IndexError):
+        return None
+
+
+_cert_source: CertSource = GoogleCertSource()
+
+
+def get_cert_source() -> CertSource:
+    return _cert_source
+
+
+def set_cert_source(source: CertSource) -> None:
+    global _cert_source
+    _cert_source = source
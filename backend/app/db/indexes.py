@@ -0,0 +1,134 @@
+"""Index verification + explain() report for the hot query paths.
+
+Index specs live on each model (`Settings.indexes`) and are created by
+`init_beanie`. This module only checks the live collections against those
+specs and explains the queries the studio / overview endpoints rely on.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from beanie import PydanticObjectId
+
+from app.models import ALL_MODELS
+from app.models.beat import Beat
+from app.models.shot import Shot
+from app.models.storyboard import Storyboard
+from app.models.media import Image, Clip
+from app.models.character import Character
+from app.models.location import Location
+from app.models.prop import Prop
+from app.models.part import Part
+from app.models.episode import Episode
+from app.models.project import Project
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def expected_indexes(model) -> Dict[str, dict]:
+    """name -> {key, unique} for every IndexModel declared on the model."""
+    out = {}
+    for idx in getattr(model.Settings, "indexes", []):
+        doc = idx.document
+        out[doc["name"]] = {"key": list(doc["key"].items()), "unique": bool(doc.get("unique", False))}
+    return out
+
+
+async def verify_indexes(models: Optional[list] = None) -> Dict[str, List[str]]:
+    """Compare declared indexes with the live collections.
+
+    Returns {collection: [problem, ...]} for collections that are missing an
+    index or have one with a different key/uniqueness. Empty dict == all good.
+    """
+    problems: Dict[str, List[str]] = {}
+    for model in models or ALL_MODELS:
+        expected = expected_indexes(model)
+        if not expected:
+            continue
+        coll = model.get_motor_collection()
+        live = await coll.index_information()
+        issues = []
+        for name, spec in expected.items():
+            info = live.get(name)
+            if info is None:
+                issues.append(f"missing index '{name}' {spec['key']}")
+                continue
+            live_key = [(k, v) for k, v in info["key"]]
+            if live_key != spec["key"] or bool(info.get("unique", False)) != spec["unique"]:
+                issues.append(f"index '{name}' differs: live={live_key} expected={spec['key']}")
+        if issues:
+            problems[coll.name] = issues
+    return problems
+
+
+async def check_indexes_on_startup() -> None:
+    problems = await verify_indexes()
+    for coll, issues in problems.items():
+        for issue in issues:
+            logger.warning("Index check [%s]: %s", coll, issue)
+    if not problems:
+        logger.info("Index check: all declared indexes present")
+
+
+# ── explain() report ─────────────────────────────────────────
+
+def _hot_queries() -> List[Dict[str, Any]]:
+    """Representative filters for every hot path. Values are placeholders –
+    the planner picks the same plan regardless of the concrete ObjectId."""
+    oid = PydanticObjectId()
+    queries = []
+    for model in (Beat, Shot, Storyboard, Image, Clip):
+        queries.append({"model": model, "filter": {"partId": oid}, "sort": None})
+    for model in (Character, Location, Prop):
+        queries.append({"model": model, "filter": {"projectId": oid}, "sort": [("name", 1)]})
+    queries += [
+        {"model": Image, "filter": {"projectId": oid, "partId": None, "category": "character"}, "sort": [("createdAt", -1)]},
+        {"model": Image, "filter": {"projectId": oid, "partId": None}, "sort": [("createdAt", -1)]},
+        {"model": Part, "filter": {"episodeId": oid}, "sort": [("partNumber", 1)]},
+        {"model": Part, "filter": {"projectId": oid}, "sort": [("partNumber", 1)]},
+        {"model": Episode, "filter": {"projectId": oid}, "sort": [("episodeNumber", 1)]},
+        {"model": Project, "filter": {"organizationId": oid}, "sort": None},
+        {"model": User, "filter": {"googleId": "x"}, "sort": None},
+        {"model": User, "filter": {"email": "x@example.com"}, "sort": None},
+        {"model": User, "filter": {"organizationId": oid}, "sort": [("_id", 1)]},
+    ]
+    return queries
+
+
+def _plan_stages(plan: dict) -> List[str]:
+    stages = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "inputStage" in node:
+            stack.append(node["inputStage"])
+        stack.extend(node.get("inputStages", []))
+        if "queryPlan" in node:
+            stack.append(node["queryPlan"])
+    return stages
+
+
+async def explain_hot_queries() -> List[Dict[str, Any]]:
+    """Run explain() on each hot query; flag COLLSCAN and in-memory SORT."""
+    report = []
+    for q in _hot_queries():
+        coll = q["model"].get_motor_collection()
+        cursor = coll.find(q["filter"])
+        if q["sort"]:
+            cursor = cursor.sort(q["sort"])
+        explained = await cursor.explain()
+        winning = explained.get("queryPlanner", {}).get("winningPlan", {})
+        stages = _plan_stages(winning)
+        report.append({
+            "collection": coll.name,
+            "filter": {k: (None if v is None else type(v).__name__) for k, v in q["filter"].items()},
+            "sort": q["sort"],
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+            "inMemorySort": "SORT" in stages,
+        })
+    return report
@@ -0,0 +1,244 @@
+"""Data migrations.
+
+`dedupe_selected_versions` and `migrate_org_member_ids` run from init_db
+before init_beanie creates indexes, `backfill_stats` right after it. The
+batch migrations further down are
+run on demand from scripts/ (the native-content one also as a background
+job at startup).
+"""
+import logging
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from pymongo import UpdateMany, UpdateOne
+
+from app.core.config import settings
+from app.models import Beat, Shot, Storyboard, Character, Location, Prop, Organization, Project, Episode, Part
+from app.utils.blobs import acquire_blobs, load_texts, release_blobs
+from app.models.content_codec import content_hash, decode_text, stored_content_fields, to_native
+from app.utils.aio import gather_bounded
+from app.utils.counters import reconcile_stats
+
+logger = logging.getLogger(__name__)
+
+VERSIONED_CONTENT_COLLECTIONS = ("beats", "shots", "storyboards")
+CONTENT_MODELS = (Beat, Shot, Storyboard, Character, Location, Prop)
+
+
+async def dedupe_selected_versions(db) -> int:
+    """Leave at most one `metadata.selected` version per part (the highest
+    versionNo, newest on ties) so the partial unique index can be built.
+    Returns the number of versions that were unselected."""
+    fixed = 0
+    for name in VERSIONED_CONTENT_COLLECTIONS:
+        coll = db[name]
+        dupes = coll.aggregate([
+            {"$match": {"metadata.selected": True}},
+            {"$sort": {"metadata.versionNo": -1, "updatedAt": -1}},
+            {"$group": {"_id": "$partId", "ids": {"$push": "$_id"}, "n": {"$sum": 1}}},
+            {"$match": {"n": {"$gt": 1}}},
+        ])
+        ops = [UpdateMany({"_id": {"$in": row["ids"][1:]}}, {"$set": {"metadata.selected": False}})
+               async for row in dupes]
+        if ops:
+            res = await coll.bulk_write(ops, ordered=False)
+            fixed += res.modified_count
+            logger.warning("Unselected %d duplicate selected versions in %s", res.modified_count, name)
+    return fixed
+
+
+async def migrate_org_member_ids(db) -> int:
+    """Move legacy `organizations.memberIds` arrays onto `users.organizationId`
+    (only for users not already in an org) and drop the arrays.
+
+    A listed user who already belongs to another organization is not moved;
+    those conflicts are logged and the org keeps its `memberIds` so they can
+    be resolved by hand (the next startup retries). Returns the number of
+    users that were linked."""
+    linked = 0
+    conflicted = []
+    orgs = db["organizations"]
+    users = db["users"]
+    async for org in orgs.find({"memberIds.0": {"$exists": True}}, {"memberIds": 1}):
+        res = await users.update_many(
+            {"_id": {"$in": org["memberIds"]}, "organizationId": None},
+            {"$set": {"organizationId": org["_id"]}},
+        )
+        linked += res.modified_count
+        others = await users.find(
+            {"_id": {"$in": org["memberIds"]}, "organizationId": {"$nin": [None, org["_id"]]}}, {"_id": 1},
+        ).to_list(None)
+        if others:
+            conflicted.append(org["_id"])
+            logger.warning(
+                "Organization %s lists members of other organizations, keeping its memberIds: %s",
+                org["_id"], ", ".join(str(u["_id"]) for u in others),
+            )
+    res = await orgs.update_many(
+        {"memberIds": {"$exists": True}, "_id": {"$nin": conflicted}}, {"$unset": {"memberIds": ""}},
+    )
+    if res.modified_count:
+        logger.warning("Migrated memberIds of %d organizations (%d users linked)", res.modified_count, linked)
+    return linked
+
+
+async def backfill_stats() -> bool:
+    """Compute the rollup counters once for data that predates them.
+
+    Organizations, projects, episodes and parts written before the counters
+    existed have no `stats` field, so the overview would show zeros until
+    someone ran `scripts.reconcile_stats`. If any such document is left, run
+    the full reconcile. Returns whether it ran.
+    """
+    missing = {"stats": {"$exists": False}}
+    legacy = await gather_bounded(*(
+        model.get_motor_collection().find_one(missing, {"_id": 1})
+        for model in (Organization, Project, Episode, Part)
+    ))
+    if not any(legacy):
+        return False
+    result = await reconcile_stats()
+    logger.warning("Backfilled rollup counters for %d part(s)", result["parts"])
+    return True
+
+
+# ── Batch migrations (scripts/) ──────────────────────────────
+
+async def compress_content(
+    coll, batch_size: int = 200,
+    on_batch: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> int:
+    """Rewrite plain-string `content` at or above CONTENT_COMPRESS_THRESHOLD
+    in compressed form, `batch_size` documents per bulk write.
+
+    Each write is conditional on the document's `updatedAt`, so a concurrent
+    edit is never overwritten; such documents are picked up by the next run.
+    Resumable: compressed documents no longer match the filter.
+    """
+    query = {
+        "content": {"$type": "string"},
+        "$expr": {"$gte": [{"$strLenBytes": "$content"}, settings.CONTENT_COMPRESS_THRESHOLD]},
+    }
+    done = 0
+    last_id = None
+    while True:
+        page = {**query, "_id": {"$gt": last_id}} if last_id else query
+        batch = await coll.find(page, {"content": 1, "updatedAt": 1}).sort("_id", 1).to_list(batch_size)
+        if not batch:
+            return done
+        last_id = batch[-1]["_id"]
+        ops = []
+        for doc in batch:
+            fields = stored_content_fields(doc["content"])
+            if isinstance(fields["content"], str):
+                continue  # doesn't shrink – leave as text
+            ops.append(UpdateOne({"_id": doc["_id"], "updatedAt": doc.get("updatedAt")}, {"$set": fields}))
+        if ops:
+            res = await coll.bulk_write(ops, ordered=False)
+            done += res.modified_count
+        if on_batch:
+            await on_batch(done)
+
+
+async def move_content_to_blobs(
+    coll, batch_size: int = 200,
+    on_batch: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> int:
+    """Move inline `content` of versioned documents into `content_blobs`.
+
+    Per batch: one bulk upsert acquiring the blobs, then one bulk write that
+    sets `blobHash` and drops the inline text, conditional on `updatedAt`.
+    A document edited in between keeps its inline content (the extra blob
+    reference is corrected by `reconcile_blob_refs`). Resumable.
+    """
+    query = {"blobHash": None, "content": {"$type": ["string", "binData"]}}
+    done = 0
+    last_id = None
+    while True:
+        page = {**query, "_id": {"$gt": last_id}} if last_id else query
+        batch = await coll.find(page, {"content": 1, "updatedAt": 1}).sort("_id", 1).to_list(batch_size)
+        if not batch:
+            return done
+        last_id = batch[-1]["_id"]
+        texts: Dict[str, str] = {}
+        counts: Counter = Counter()
+        ops = []
+        for doc in batch:
+            text = decode_text(doc["content"])
+            h = content_hash(text)
+            texts[h] = text
+            counts[h] += 1
+            ops.append(UpdateOne(
+                {"_id": doc["_id"], "updatedAt": doc.get("updatedAt")},
+                {"$set": {"blobHash": h, "contentSize": len(text.encode("utf-8"))}, "$unset": {"content": ""}},
+            ))
+        await acquire_blobs(texts, dict(counts))
+        res = await coll.bulk_write(ops, ordered=False)
+        done += res.modified_count
+        if on_batch:
+            await on_batch(done)
+
+
+async def migrate_content_to_native(
+    coll, batch_size: int = 200,
+    on_batch: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> int:
+    """Rewrite string, compressed and blob-stored `content` as native BSON
+    (see app/models/content_codec.py), `batch_size` documents per batch.
+
+    Each write is conditional on `updatedAt` and leaves it unchanged (the
+    text the API returns is identical), so a concurrent edit always wins.
+    Blob references are released only for documents whose write matched.
+    Content that can't be stored natively is skipped. Resumable: migrated
+    documents no longer match the filter.
+    """
+    query = {
+        "contentFormat": None,
+        "$or": [{"content": {"$type": ["string", "binData"]}}, {"blobHash": {"$ne": None}}],
+    }
+    done = 0
+    last_id = None
+    while True:
+        page = {**query, "_id": {"$gt": last_id}} if last_id else query
+        batch = await coll.find(
+            page, {"content": 1, "blobHash": 1, "updatedAt": 1},
+        ).sort("_id", 1).to_list(batch_size)
+        if not batch:
+            return done
+        last_id = batch[-1]["_id"]
+        bodies = await load_texts({d["blobHash"] for d in batch if d.get("blobHash")})
+
+        async def convert(doc: dict) -> Tuple[bool, Optional[str]]:
+            """Migrate one document: (written, blob it referenced)."""
+            h = doc.get("blobHash")
+            text = bodies.get(h) if h else decode_text(doc["content"])
+            native = to_native(text) if text is not None else None
+            if native is None:
+                return False, None
+            res = await coll.update_one(
+                {"_id": doc["_id"], "updatedAt": doc.get("updatedAt"), "contentFormat": None},
+                {"$set": {
+                    "content": native[0], "contentFormat": native[1], "blobHash": None,
+                    "contentSize": len(text.encode("utf-8")),
+                }},
+            )
+            return (True, h) if res.matched_count else (False, None)
+
+        results = await gather_bounded(*(convert(d) for d in batch))
+        await release_blobs(Counter(h for written, h in results if written and h))
+        done += sum(1 for written, _ in results if written)
+        if on_batch:
+            await on_batch(done)
+
+
+async def native_content_migration(job) -> Dict[str, int]:
+    """Background job (started from main when CONTENT_NATIVE_ENABLED and
+    CONTENT_NATIVE_MIGRATE_ON_STARTUP): migrate every content collection."""
+    migrated: Dict[str, int] = {}
+    job.total = len(CONTENT_MODELS)
+    for model in CONTENT_MODELS:
+        coll = model.get_motor_collection()
+        migrated[coll.name] = await migrate_content_to_native(coll, settings.CONTENT_NATIVE_MIGRATION_BATCH)
+        job.step()
+    logger.info("Native content migration finished: %s", migrated)
+    return migrated
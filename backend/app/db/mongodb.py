@@ -6,5 +6,19 @@ from app.models import ALL_MODELS
 
 async def init_db():
     client = AsyncIOMotorClient(settings.MONGODB_URL)
-    await init_beanie(database=client[settings.MONGODB_DB_NAME], document_models=ALL_MODELS)
+    db = client[settings.MONGODB_DB_NAME]
 
+    # Data fixes that must land before init_beanie builds the indexes
+    from app.db.migrations import dedupe_selected_versions, migrate_org_member_ids
+    await dedupe_selected_versions(db)
+    await migrate_org_member_ids(db)
+
+    # init_beanie creates every index declared in the models' Settings.indexes
+    await init_beanie(database=db, document_models=ALL_MODELS)
+
+    # One-shot: rollup counters for data written before they existed
+    from app.db.migrations import backfill_stats
+    await backfill_stats()
+
+    from app.db.indexes import check_indexes_on_startup
+    await check_indexes_on_startup()
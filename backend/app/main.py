@@ -1,8 +1,9 @@
 
+import asyncio
 import os
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -11,8 +12,17 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
 from app.core.config import settings
+from app.core.auth import get_current_active_user
+from app.models.user import User
 from app.api.v1.router import api_router, tags_metadata
 from app.db.mongodb import init_db
+from app.db.migrations import native_content_migration
+from app.utils.jobs import jobs
+from app.utils.autosave import autosave
+from app.utils.demodata import load_manifest
+from app.utils.cache import cache_stats
+from app.utils.retention import run_sweeper
+from app.utils.seed_part import fail_stale_seeds
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -28,9 +38,17 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
+    await load_manifest()
+    await fail_stale_seeds()
+    if settings.CONTENT_NATIVE_ENABLED and settings.CONTENT_NATIVE_MIGRATE_ON_STARTUP:
+        jobs.submit("native_content_migration", native_content_migration)
+    sweeper = asyncio.create_task(run_sweeper()) if settings.VERSION_RETENTION_INTERVAL_SECONDS > 0 else None
     yield
     # Shutdown
-    # Close connections if needed
+    if sweeper:
+        sweeper.cancel()
+    await autosave.flush_all()
+    await jobs.shutdown()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -135,3 +153,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/caches")
+async def cache_health(user: User = Depends(get_current_active_user)):
+    """Per-process cache sizes and hit/miss counters."""
+    return cache_stats()
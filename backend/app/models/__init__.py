@@ -10,12 +10,18 @@ from app.models.media import Image, Clip
 from app.models.character import Character
 from app.models.location import Location
 from app.models.prop import Prop
+from app.models.stats import ContentStats
+from app.models.content_ref import ContentRef
+from app.models.content_blob import ContentBlob
+from app.models.content_selection import ContentSelection
+from app.models.archived_version import ArchivedVersion
 
-ALL_MODELS = [User, Organization, Project, Episode, Part, Beat, Shot, Storyboard, Image, Clip, Character, Location, Prop]
+ALL_MODELS = [User, Organization, Project, Episode, Part, Beat, Shot, Storyboard, Image, Clip, Character, Location, Prop, ContentRef, ContentBlob, ContentSelection, ArchivedVersion]
 
 __all__ = [
     "User", "Organization", "Project", "Episode", "Part",
     "Beat", "Shot", "Storyboard", "Image", "Clip",
     "Character", "Location", "Prop",
+    "ContentStats", "ContentRef", "ContentBlob", "ContentSelection", "ArchivedVersion",
     "ALL_MODELS",
 ]
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
+from pydantic import Field
+
+
+class ArchivedVersion(Document):
+    """An old, unselected Beat/Shot/Storyboard/Image/Clip version moved out
+    of the hot collections by the retention sweeper (app/utils/retention.py).
+
+    `id` is the original document's _id, so archiving is an idempotent
+    upsert and a restore puts the version back under the same ID. `payload`
+    is the original BSON document – with its body inlined – zlib-compressed
+    behind a one-byte codec marker (see app/models/content_codec.py).
+    """
+    kind: str  # "beat", "shot", "storyboard", "image", "clip"
+    projectId: PydanticObjectId
+    partId: PydanticObjectId
+    versionNo: int = 0
+    payload: bytes
+    size: int = 0  # uncompressed BSON size
+
+    archivedAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "archived_versions"
+        indexes = [
+            IndexModel([("partId", ASCENDING), ("kind", ASCENDING), ("versionNo", ASCENDING)], name="partId_kind_versionNo"),
+            IndexModel([("projectId", ASCENDING)], name="projectId"),
+        ]
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
@@ -1,8 +1,11 @@
 from typing import Optional, List
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field, BaseModel
 from datetime import datetime
 
+from app.models.content_codec import CompressedContent
+
 
 class AssetScope(BaseModel):
     """Controls where an asset is visible.
@@ -13,12 +16,12 @@ class AssetScope(BaseModel):
     partIds: List[PydanticObjectId] = Field(default_factory=list)
 
 
-class Character(Document):
+class Character(CompressedContent, Document):
     """A character in a project, with descriptive content and reference images."""
     organizationId: PydanticObjectId
     projectId: PydanticObjectId
     name: str
-    content: str  # JSON string with full character data (like beats/shots)
+    # content: str – JSON text, compressed at rest when large (CompressedContent)
     imageIds: List[PydanticObjectId] = Field(default_factory=list)
     scope: AssetScope = Field(default_factory=AssetScope)
 
@@ -27,6 +30,9 @@ class Character(Document):
 
     class Settings:
         name = "characters"
+        indexes = [
+            IndexModel([("projectId", ASCENDING), ("name", ASCENDING)], name="projectId_name"),
+        ]
 
     class Config:
         populate_by_name = True
@@ -0,0 +1,126 @@
+"""Content-addressed storage for Beat/Shot/Storyboard bodies.
+
+Every distinct `content` text is stored once in `content_blobs`, keyed by its
+sha256, with a reference count. Versioned content documents only carry the
+`blobHash`, so N parts seeded from the same templates (or versions forked
+without changes) share one copy of each body.
+
+This module holds the documents only. Reading and writing blobs (reference
+counting, delta chains, GC) lives in app/utils/blobs.py, and the write
+hooks of `BlobContent` hand over to app/utils/content_writes.py.
+"""
+from datetime import datetime
+from typing import Any, ClassVar, Dict, List, Optional
+
+from beanie import Delete, Document, Insert, Replace, Save, after_event, before_event
+from pydantic import BaseModel, Field, PrivateAttr
+from pymongo import ASCENDING, IndexModel
+
+from app.models.content_codec import CompressedContent, content_hash
+
+
+class ContentBlob(Document):
+    """One distinct content body. `id` is the sha256 of the decoded text.
+    Keyframes store `content` in the CompressedContent format; delta blobs
+    store `delta` (JSON-encoded patch) against the `base` blob instead."""
+    id: str
+    content: Any = None
+    base: Optional[str] = None
+    delta: Optional[str] = None
+    fmt: Optional[str] = None
+    depth: int = 0  # links to the nearest keyframe
+    contentSize: int = 0
+    refCount: int = 0
+
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "content_blobs"
+        indexes = [
+            IndexModel([("refCount", ASCENDING), ("updatedAt", ASCENDING)], name="refCount_updatedAt"),
+        ]
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+
+
+class ContentSummary(BaseModel):
+    """Precomputed at write time so version lists don't need the body."""
+    itemCount: int = 0
+    items: List[Dict[str, Any]] = Field(default_factory=list)  # {key, title, beatNumber?} per item
+    hash: Optional[str] = None  # content_hash of the body
+
+
+class BlobContent(CompressedContent):
+    """Mixin for versioned content (needs partId / metadata.versionNo):
+    `content` lives in `content_blobs`.
+
+    `summary` (item count / titles / hash) is refreshed whenever the body is
+    written. Loaded documents carry only `blobHash`; `app.utils.blobs.hydrate` fills in
+    the text. Assigning `content` keeps it inline until the next
+    insert/save, which moves it to the blob store – or, in native mode,
+    stores it as BSON on the document itself (no blob). Documents written
+    before blobs existed still have inline `content` and read exactly as before.
+    """
+    content_kind: ClassVar[str]  # "beat" / "shot" / "storyboard"
+
+    blobHash: Optional[str] = None
+    summary: Optional[ContentSummary] = None
+    autosaveRev: int = 0  # last autosave revision written (app/utils/autosave.py)
+
+    _release_after_write: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def content_dirty(self) -> bool:
+        return isinstance(self.storedContent, (str, bytes))
+
+    @property
+    def content_loaded(self) -> bool:
+        return self.content_dirty or self.content_native or self._text is not None
+
+    @property
+    def contentHash(self) -> str:
+        if not self.content_dirty:
+            if self.blobHash:
+                return self.blobHash
+            if self.summary and self.summary.hash:
+                return self.summary.hash
+        return content_hash(self.content)
+
+    def load_blob_text(self, text: str) -> None:
+        self._text = text
+
+    def take_inline_content(self) -> Optional[str]:
+        """Detach inline content for storing as a blob: sets blobHash and
+        contentSize, clears the inline field, and returns the replaced hash."""
+        text = self.content
+        old = self.blobHash
+        self.blobHash = content_hash(text)
+        self.contentSize = len(text.encode("utf-8"))
+        self.storedContent = None
+        self.contentFormat = None
+        self._text = text
+        return old if old != self.blobHash else None
+
+    # Storage lives in app/utils, which imports the content models – hence
+    # the imports at call time.
+
+    @before_event(Insert, Replace, Save)
+    async def _encode_before_write(self) -> None:
+        from app.utils.content_writes import store_before_write
+        await store_before_write(self)
+
+    @after_event(Insert, Replace, Save)
+    async def _release_replaced_blob(self) -> None:
+        old, self._release_after_write = self._release_after_write, None
+        if old:
+            from app.utils.blobs import release_blobs
+            await release_blobs({old: 1})
+
+    @after_event(Delete)
+    async def _release_deleted_blob(self) -> None:
+        if self.blobHash:
+            from app.utils.blobs import release_blobs
+            await release_blobs({self.blobHash: 1})
@@ -0,0 +1,213 @@
+"""Transparent at-rest compression of JSON `content` strings.
+
+Models that mix in `CompressedContent` keep exposing `content` as a plain
+string, but store it in Mongo as compressed binary once it reaches
+CONTENT_COMPRESS_THRESHOLD bytes. The stored value is decompressed lazily on
+first access and memoized on the instance. Small strings and documents
+written before compression existed stay plain strings and are read as-is, so
+old and new documents coexist (`python -m scripts.compress_content` migrates
+the old ones in batches).
+
+Stored binary = one codec byte + payload, so another codec (e.g. zstd) can be
+added later without rewriting existing documents.
+
+Native mode (CONTENT_NATIVE_ENABLED): JSON content whose top level is an
+array or object is stored as BSON instead – `content` holds the array itself
+plus `contentFormat`, the json.dumps settings that reproduce the original
+text byte-for-byte. Mongo can then project, index and `$set` individual
+items (`content.3.Title`). Text that can't be re-rendered exactly, or that
+BSON can't hold faithfully, stays a string. Reads go by the stored BSON
+type, so string, compressed and native documents coexist
+(`python -m scripts.native_content` migrates in the background-safe way).
+"""
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from beanie import Insert, Replace, Save, before_event
+from pydantic import BaseModel, Field, PrivateAttr
+
+from app.core.config import settings
+
+CODEC_ZLIB = b"\x01"
+
+# JSON renderings that can be reproduced from parsed data (Python json.dumps /
+# JS JSON.stringify); used by delta blobs and native storage
+JSON_FORMATS = {
+    "py": {},
+    "js": {"separators": (",", ":"), "ensure_ascii": False},
+}
+
+BSON_INT_MIN, BSON_INT_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+class ContentNotLoaded(RuntimeError):
+    """`content` lives in the blob store and the document wasn't hydrated."""
+
+
+def content_hash(text: str) -> str:
+    """sha256 of the UTF-8 text – the blob key and the PATCH `baseHash`."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def encode_text(text: str) -> Union[str, bytes]:
+    """Stored form of `text`: compressed bytes if large enough and smaller."""
+    raw = text.encode("utf-8")
+    if len(raw) < settings.CONTENT_COMPRESS_THRESHOLD:
+        return text
+    packed = CODEC_ZLIB + zlib.compress(raw, settings.CONTENT_COMPRESS_LEVEL)
+    return packed if len(packed) < len(raw) else text
+
+
+def decode_text(stored: Union[str, bytes]) -> str:
+    if isinstance(stored, str):
+        return stored
+    codec, payload = stored[:1], stored[1:]
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    raise ValueError(f"Unknown content codec {codec!r}")
+
+
+def render_json(doc: Any, fmt: str) -> str:
+    return json.dumps(doc, **JSON_FORMATS[fmt])
+
+
+def json_format(doc: Any, text: str) -> Optional[str]:
+    """The JSON_FORMATS key that renders `doc` back to exactly `text`."""
+    return next((f for f in JSON_FORMATS if render_json(doc, f) == text), None)
+
+
+def _bson_safe(value: Any) -> bool:
+    """Whether `value` survives a BSON roundtrip unchanged and its keys are
+    addressable with dotted update paths."""
+    if isinstance(value, dict):
+        return all(
+            isinstance(k, str) and k and "." not in k and not k.startswith("$") and "\x00" not in k
+            and _bson_safe(v)
+            for k, v in value.items()
+        )
+    if isinstance(value, list):
+        return all(_bson_safe(v) for v in value)
+    if isinstance(value, bool) or value is None or isinstance(value, (str, float)):
+        return True
+    if isinstance(value, int):
+        return BSON_INT_MIN <= value <= BSON_INT_MAX
+    return False
+
+
+def to_native(text: str) -> Optional[Tuple[Union[List[Any], Dict[str, Any]], str]]:
+    """(parsed content, format) for native storage, or None if `text` must
+    stay a string."""
+    try:
+        doc = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(doc, (list, dict)) or not _bson_safe(doc):
+        return None
+    fmt = json_format(doc, text)
+    return (doc, fmt) if fmt else None
+
+
+def stored_content_fields(text: str) -> Dict[str, Any]:
+    """Fields to `$set` when writing `content` with a raw update."""
+    return {"content": encode_text(text), "contentSize": len(text.encode("utf-8"))}
+
+
+def native_update(old: Any, new: Any) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Field-level `$set` / `$unset` turning native content `old` into `new`,
+    or None when the change reshapes an array (the caller then writes the
+    whole value). Keys are known to be dot-safe (see `_bson_safe`)."""
+    sets: Dict[str, Any] = {}
+    unsets: Dict[str, str] = {}
+
+    def walk(a: Any, b: Any, path: str) -> bool:
+        if type(a) is not type(b):
+            sets[path] = b
+        elif isinstance(a, dict):
+            for key in a:
+                if key not in b:
+                    unsets[f"{path}.{key}"] = ""
+            for key, value in b.items():
+                if key not in a:
+                    sets[f"{path}.{key}"] = value
+                elif not walk(a[key], value, f"{path}.{key}"):
+                    return False
+        elif isinstance(a, list):
+            if len(a) != len(b):
+                return False
+            for i, (x, y) in enumerate(zip(a, b)):
+                if not walk(x, y, f"{path}.{i}"):
+                    return False
+        elif a != b:
+            sets[path] = b
+        return True
+
+    if not walk(old, new, "content"):
+        return None
+    update: Dict[str, Dict[str, Any]] = {}
+    if sets:
+        update["$set"] = sets
+    if unsets:
+        update["$unset"] = unsets
+    return update
+
+
+class CompressedContent(BaseModel):
+    """Mixin: `content` property over the stored (compressed or native) field."""
+    storedContent: Optional[Union[str, bytes, List[Any], Dict[str, Any]]] = Field(default=None, alias="content")
+    contentFormat: Optional[str] = None  # JSON_FORMATS key when stored natively
+    contentSize: Optional[int] = None  # UTF-8 size of the decoded content
+
+    _text: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def content(self) -> str:
+        if isinstance(self.storedContent, str):
+            return self.storedContent
+        if self._text is None:
+            if self.storedContent is None:
+                raise ContentNotLoaded(f"{type(self).__name__} {getattr(self, 'id', None)} content not loaded")
+            if self.content_native:
+                self._text = render_json(self.storedContent, self.contentFormat)
+            else:
+                self._text = decode_text(self.storedContent)
+        return self._text
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self.storedContent = value
+        self.contentFormat = None
+        self._text = None
+
+    @property
+    def content_native(self) -> bool:
+        """`content` is stored as BSON (list / dict) rather than text."""
+        return isinstance(self.storedContent, (list, dict))
+
+    def store_native(self) -> bool:
+        """Switch plain-string `content` to native storage when native mode
+        is on and the text roundtrips exactly. Returns whether it did."""
+        if not settings.CONTENT_NATIVE_ENABLED or not isinstance(self.storedContent, str):
+            return False
+        text = self.storedContent
+        native = to_native(text)
+        if native is None:
+            return False
+        self.storedContent, self.contentFormat = native
+        self.contentSize = len(text.encode("utf-8"))
+        self._text = text
+        return True
+
+    def encode_content(self) -> None:
+        """Store a plain-string `content` natively or compressed (idempotent)."""
+        if isinstance(self.storedContent, str) and not self.store_native():
+            text = self.storedContent
+            self.contentSize = len(text.encode("utf-8"))
+            self.storedContent = encode_text(text)
+            if not isinstance(self.storedContent, str):
+                self._text = text
+
+    @before_event(Insert, Replace, Save)
+    def _encode_before_write(self) -> None:
+        self.encode_content()
@@ -0,0 +1,25 @@
+from typing import Optional
+from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
+
+
+class ContentRef(Document):
+    """ID → collection registry for versioned content and media.
+
+    `id` is the same ObjectId as the Beat/Shot/Storyboard/Image/Clip it
+    points to, so resolving an ID is a single _id lookup instead of probing
+    each collection in turn."""
+    kind: str  # "beat", "shot", "storyboard", "image", "clip"
+    projectId: Optional[PydanticObjectId] = None
+    partId: Optional[PydanticObjectId] = None
+
+    class Settings:
+        name = "content_refs"
+        indexes = [
+            IndexModel([("partId", ASCENDING)], name="partId"),
+            IndexModel([("projectId", ASCENDING)], name="projectId"),
+        ]
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
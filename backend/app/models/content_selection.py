@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Dict
+
+from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
+from pydantic import Field
+
+
+class ContentSelection(Document):
+    """Per-item version picks for one part & content type.
+
+    `items` maps an item key (see app/utils/content_items.py) to the version
+    whose copy of that item replaces the one in the part's selected version.
+    Keys are stored escaped (`escape_key`) so each pick is a single
+    `$set items.<key>`; `rev` is bumped on every change.
+    """
+    partId: PydanticObjectId
+    projectId: PydanticObjectId
+    type: str  # "beat", "shot", "storyboard"
+    items: Dict[str, PydanticObjectId] = Field(default_factory=dict)
+    rev: int = 0
+
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "content_selections"
+        indexes = [
+            IndexModel([("partId", ASCENDING), ("type", ASCENDING)], name="partId_type_unique", unique=True),
+            IndexModel([("projectId", ASCENDING)], name="projectId"),
+        ]
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+
+
+def escape_key(key: str) -> str:
+    """Item key → field name usable in a dotted update path."""
+    return key.replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def unescape_key(field: str) -> str:
+    return field.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
@@ -1,8 +1,11 @@
 from typing import Optional
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field
 from datetime import datetime
 
+from app.models.stats import ContentStats
+
 
 class Episode(Document):
     projectId: PydanticObjectId
@@ -10,11 +13,16 @@ class Episode(Document):
     bibleText: Optional[str] = None
     createdBy: Optional[PydanticObjectId] = None
 
+    stats: ContentStats = Field(default_factory=ContentStats)
+
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "episodes"
+        indexes = [
+            IndexModel([("projectId", ASCENDING), ("episodeNumber", ASCENDING)], name="projectId_episodeNumber"),
+        ]
 
     class Config:
         populate_by_name = True
@@ -1,17 +1,19 @@
 from typing import Optional, List
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field, BaseModel
 from datetime import datetime
 
 from app.models.character import AssetScope
+from app.models.content_codec import CompressedContent
 
 
-class Location(Document):
+class Location(CompressedContent, Document):
     """A location in a project, with descriptive content and reference images."""
     organizationId: PydanticObjectId
     projectId: PydanticObjectId
     name: str
-    content: str  # JSON string with full location data (like beats/shots)
+    # content: str – JSON text, compressed at rest when large (CompressedContent)
     imageIds: List[PydanticObjectId] = Field(default_factory=list)
     scope: AssetScope = Field(default_factory=AssetScope)
 
@@ -20,6 +22,9 @@ class Location(Document):
 
     class Settings:
         name = "locations"
+        indexes = [
+            IndexModel([("projectId", ASCENDING), ("name", ASCENDING)], name="projectId_name"),
+        ]
 
     class Config:
         populate_by_name = True
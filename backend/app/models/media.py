@@ -1,5 +1,6 @@
 from typing import Optional
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from pydantic import Field, BaseModel
 from datetime import datetime
 
@@ -26,6 +27,18 @@ class Image(Document):
 
     class Settings:
         name = "images"
+        indexes = [
+            IndexModel([("partId", ASCENDING)], name="partId"),
+            # Project-level asset images: {projectId, partId: None[, category]} sorted by -createdAt
+            IndexModel(
+                [("projectId", ASCENDING), ("partId", ASCENDING), ("category", ASCENDING), ("createdAt", DESCENDING)],
+                name="projectId_partId_category_createdAt",
+            ),
+            IndexModel(
+                [("projectId", ASCENDING), ("partId", ASCENDING), ("createdAt", DESCENDING)],
+                name="projectId_partId_createdAt",
+            ),
+        ]
 
     class Config:
         populate_by_name = True
@@ -47,6 +60,10 @@ class Clip(Document):
 
     class Settings:
         name = "clips"
+        indexes = [
+            IndexModel([("partId", ASCENDING)], name="partId"),
+            IndexModel([("projectId", ASCENDING)], name="projectId"),
+        ]
 
     class Config:
         populate_by_name = True
@@ -1,20 +1,28 @@
 
-from typing import List, Optional
-from beanie import Document, PydanticObjectId
+from typing import Optional
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field
 from datetime import datetime
 
+from app.models.stats import ContentStats
+
 class Organization(Document):
     """Organization model"""
     name: str
     description: Optional[str] = None
-    memberIds: List[PydanticObjectId] = []
-    
+    # Membership lives on User.organizationId (indexed); see app/utils/org_members.py
+
+    stats: ContentStats = Field(default_factory=ContentStats)
+
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "organizations"
+        indexes = [
+            IndexModel([("name", ASCENDING)], name="name"),
+        ]
     
     class Config:
         populate_by_name = True
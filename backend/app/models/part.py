@@ -1,8 +1,11 @@
 from typing import Optional
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field
 from datetime import datetime
 
+from app.models.stats import ContentStats
+
 
 class Part(Document):
     projectId: PydanticObjectId
@@ -12,11 +15,22 @@ class Part(Document):
     scriptText: Optional[str] = None
     createdBy: Optional[PydanticObjectId] = None
 
+    # Demo-content seeding runs as a background job after the part is created
+    seedStatus: str = "done"  # "pending", "running", "done", "failed"
+    seedError: Optional[str] = None
+    seededAt: Optional[datetime] = None
+
+    stats: ContentStats = Field(default_factory=ContentStats)
+
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "parts"
+        indexes = [
+            IndexModel([("episodeId", ASCENDING), ("partNumber", ASCENDING)], name="episodeId_partNumber"),
+            IndexModel([("projectId", ASCENDING), ("partNumber", ASCENDING)], name="projectId_partNumber"),
+        ]
 
     class Config:
         populate_by_name = True
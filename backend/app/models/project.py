@@ -1,20 +1,31 @@
 
 from typing import Optional
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field
 from datetime import datetime
 
+from app.models.stats import ContentStats
+
 class Project(Document):
     organizationId: PydanticObjectId
     name: str
     description: Optional[str] = None
     createdBy: PydanticObjectId
     
+    stats: ContentStats = Field(default_factory=ContentStats)
+    # Claimed by the first demo seed that writes the project's characters /
+    # locations / props (app/utils/seed_part.py)
+    assetsSeeded: bool = False
+
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "projects"
+        indexes = [
+            IndexModel([("organizationId", ASCENDING)], name="organizationId"),
+        ]
     
     class Config:
         populate_by_name = True
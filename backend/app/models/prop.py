@@ -1,18 +1,20 @@
 from typing import Optional, List
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field, BaseModel
 from datetime import datetime
 
 from app.models.character import AssetScope
+from app.models.content_codec import CompressedContent
 
 
-class Prop(Document):
+class Prop(CompressedContent, Document):
     """A prop / extra in a project, with descriptive content and reference images."""
     organizationId: PydanticObjectId
     projectId: PydanticObjectId
     name: str
     category: str = "general"  # e.g. "vehicle", "weapon", "furniture", etc.
-    content: str  # JSON string with full prop data (like beats/shots)
+    # content: str – JSON text, compressed at rest when large (CompressedContent)
     imageIds: List[PydanticObjectId] = Field(default_factory=list)
     scope: AssetScope = Field(default_factory=AssetScope)
 
@@ -21,6 +23,9 @@ class Prop(Document):
 
     class Settings:
         name = "props"
+        indexes = [
+            IndexModel([("projectId", ASCENDING), ("name", ASCENDING)], name="projectId_name"),
+        ]
 
     class Config:
         populate_by_name = True
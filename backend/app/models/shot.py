@@ -1,6 +1,10 @@
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field, BaseModel
 from datetime import datetime
+from typing import ClassVar
+
+from app.models.content_blob import BlobContent
 
 
 class ShotMetadata(BaseModel):
@@ -9,16 +13,20 @@ class ShotMetadata(BaseModel):
     selected: bool = True
 
 
-class Shot(Document):
+class Shot(BlobContent, Document):
     """One document = one version of ALL shots for a part.
     The `content` field is a JSON string containing the array of shots.
     Parsing the content gives individual shot numbers/names/etc.
     """
+    content_kind: ClassVar[str] = "shot"
+
     organizationId: PydanticObjectId
     projectId: PydanticObjectId
     episodeId: PydanticObjectId
     partId: PydanticObjectId
-    content: str
+    # content: str – JSON text, stored once per distinct body in content_blobs (BlobContent)
+    # blobHash: str – sha256 of content
+    # summary: item count / titles / hash, refreshed on every content write
     metadata: ShotMetadata = Field(default_factory=ShotMetadata)
 
     createdAt: datetime = Field(default_factory=datetime.utcnow)
@@ -26,6 +34,15 @@ class Shot(Document):
 
     class Settings:
         name = "shots"
+        indexes = [
+            IndexModel([("partId", ASCENDING), ("metadata.versionNo", ASCENDING)], name="partId_versionNo"),
+            IndexModel([("projectId", ASCENDING)], name="projectId"),
+            # At most one selected version per part
+            IndexModel(
+                [("partId", ASCENDING)], name="partId_selected_unique", unique=True,
+                partialFilterExpression={"metadata.selected": True},
+            ),
+        ]
 
     class Config:
         populate_by_name = True
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ContentStats(BaseModel):
+    """Materialized content/media rollup stored on Part, Episode, Project and
+    Organization. Kept current with atomic $inc on every create/delete path
+    (see app.utils.counters); `python -m scripts.reconcile_stats` rebuilds it."""
+    beatCount: int = 0
+    shotCount: int = 0
+    storyboardCount: int = 0
+    imageCount: int = 0
+    clipCount: int = 0
+    contentBytes: int = 0  # UTF-8 size of beat/shot/storyboard `content`
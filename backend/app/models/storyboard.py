@@ -1,6 +1,10 @@
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field, BaseModel
 from datetime import datetime
+from typing import ClassVar
+
+from app.models.content_blob import BlobContent
 
 
 class StoryboardMetadata(BaseModel):
@@ -9,16 +13,20 @@ class StoryboardMetadata(BaseModel):
     selected: bool = True
 
 
-class Storyboard(Document):
+class Storyboard(BlobContent, Document):
     """One document = one version of ALL storyboard panels for a part.
     The `content` field is a JSON string containing the array of panels.
     Parsing the content gives individual panel numbers/details/etc.
     """
+    content_kind: ClassVar[str] = "storyboard"
+
     organizationId: PydanticObjectId
     projectId: PydanticObjectId
     episodeId: PydanticObjectId
     partId: PydanticObjectId
-    content: str
+    # content: str – JSON text, stored once per distinct body in content_blobs (BlobContent)
+    # blobHash: str – sha256 of content
+    # summary: item count / titles / hash, refreshed on every content write
     metadata: StoryboardMetadata = Field(default_factory=StoryboardMetadata)
 
     createdAt: datetime = Field(default_factory=datetime.utcnow)
@@ -26,6 +34,15 @@ class Storyboard(Document):
 
     class Settings:
         name = "storyboards"
+        indexes = [
+            IndexModel([("partId", ASCENDING), ("metadata.versionNo", ASCENDING)], name="partId_versionNo"),
+            IndexModel([("projectId", ASCENDING)], name="projectId"),
+            # At most one selected version per part
+            IndexModel(
+                [("partId", ASCENDING)], name="partId_selected_unique", unique=True,
+                partialFilterExpression={"metadata.selected": True},
+            ),
+        ]
 
     class Config:
         populate_by_name = True
@@ -1,6 +1,7 @@
 
 from typing import Optional
 from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, ASCENDING
 from pydantic import Field, EmailStr
 from datetime import datetime
 
@@ -18,6 +19,12 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("googleId", ASCENDING)], name="googleId", unique=True),
+            IndexModel([("email", ASCENDING)], name="email", unique=True),
+            # Membership relation: members of an org, paged in join (_id) order
+            IndexModel([("organizationId", ASCENDING), ("_id", ASCENDING)], name="organizationId__id"),
+        ]
     
     class Config:
         populate_by_name = True
@@ -0,0 +1,27 @@
+"""Small asyncio helpers shared by endpoints that fan out independent queries."""
+import asyncio
+from typing import Any, Awaitable, List, Optional
+
+from app.core.config import settings
+
+
+async def gather_bounded(*aws: Awaitable[Any], limit: Optional[int] = None) -> List[Any]:
+    """Run awaitables concurrently (at most `limit` in flight) and return
+    their results in order.
+
+    Uses a TaskGroup, so the first failure cancels the remaining queries and
+    is re-raised as-is (not wrapped in an ExceptionGroup) – HTTPExceptions
+    raised inside a branch reach FastAPI unchanged.
+    """
+    sem = asyncio.Semaphore(limit or settings.DB_QUERY_CONCURRENCY)
+
+    async def _run(aw: Awaitable[Any]) -> Any:
+        async with sem:
+            return await aw
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_run(aw)) for aw in aws]
+    except BaseExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    return [t.result() for t in tasks]
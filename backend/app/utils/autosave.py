@@ -0,0 +1,162 @@
+"""Write-coalescing autosave for content editing.
+
+Editors send the whole body to `PUT /content/{id}/autosave` as they type.
+Edits are buffered in memory per content id, and only the latest body is
+kept. The buffer is written with a single conditional update (see
+app/utils/content_writes.py) at most once per CONTENT_AUTOSAVE_INTERVAL_SECONDS
+per document, on `POST /content/{id}/autosave/commit`, and on shutdown.
+
+Every accepted edit is acknowledged with the next revision number. The
+document's `autosaveRev` stores the last revision written, so numbering
+continues once a flushed entry is dropped from memory or the process
+restarts. A flush is last-writer-wins: it replaces whatever body the
+document has by then.
+
+Like the job runner, the buffer is per process. With several workers an
+editing session has to stay on one of them (sticky sessions).
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.utils.aio import gather_bounded
+from app.utils.content_writes import write_body
+
+logger = logging.getLogger(__name__)
+
+WRITE_RETRIES = 3
+
+
+class AutosaveFull(Exception):
+    """Raised by stage() when CONTENT_AUTOSAVE_MAX_PENDING documents already have unsaved edits."""
+
+
+class StaleRevision(Exception):
+    """Raised by stage() when the edit's base revision isn't the latest acknowledged one."""
+
+
+class AutosaveConflict(Exception):
+    """The document kept changing underneath the flush; the edit is still pending."""
+
+
+class _Entry:
+    __slots__ = ("model", "kind", "text", "rev", "savedRev", "timer", "lock")
+
+    def __init__(self, model: Any, kind: str, rev: int):
+        self.model = model
+        self.kind = kind
+        self.text: Optional[str] = None  # latest unsaved body
+        self.rev = rev                   # last acknowledged edit
+        self.savedRev = rev              # last edit written to the document
+        self.timer: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+    def view(self, content_id: PydanticObjectId) -> Dict[str, Any]:
+        return {"id": str(content_id), "rev": self.rev, "savedRev": self.savedRev, "pending": self.text is not None}
+
+
+class AutosaveBuffer:
+    def __init__(self, interval: float, max_pending: int):
+        self._interval = interval
+        self._max_pending = max_pending
+        self._entries: Dict[PydanticObjectId, _Entry] = {}
+
+    def get(self, content_id: PydanticObjectId) -> Optional[_Entry]:
+        return self._entries.get(content_id)
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for e in self._entries.values() if e.text is not None)
+
+    def stage(
+        self, content_id: PydanticObjectId, text: str, base_rev: Optional[int] = None,
+        item: Any = None, kind: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Buffer `text` as the newest body and schedule its flush. `item`
+        (the loaded document) and `kind` are needed when the id has no
+        entry yet. Returns the acknowledgement {id, rev, savedRev, pending}."""
+        entry = self._entries.get(content_id) or _Entry(type(item), kind, item.autosaveRev)
+        if base_rev is not None and base_rev != entry.rev:
+            raise StaleRevision(str(content_id))
+        if entry.text is None and self.pending >= self._max_pending:
+            raise AutosaveFull(str(content_id))
+        self._entries[content_id] = entry
+        entry.text = text
+        entry.rev += 1
+        self._schedule(content_id, entry)
+        return entry.view(content_id)
+
+    def _schedule(self, content_id: PydanticObjectId, entry: _Entry) -> None:
+        if entry.timer is None:
+            entry.timer = asyncio.create_task(self._flush_later(content_id), name=f"autosave:{content_id}")
+
+    def discard(self, content_id: PydanticObjectId) -> None:
+        """Forget unsaved edits (the document is being deleted)."""
+        entry = self._entries.pop(content_id, None)
+        if entry and entry.timer:
+            entry.timer.cancel()
+
+    async def _flush_later(self, content_id: PydanticObjectId) -> None:
+        await asyncio.sleep(self._interval)
+        try:
+            await self.flush(content_id)
+        except Exception:
+            logger.exception("Autosave flush of %s failed; retrying in %ss", content_id, self._interval)
+
+    async def flush(self, content_id: PydanticObjectId) -> Optional[Tuple[str, int, Any]]:
+        """Write the buffered body now. Returns (contentHash, contentBytes,
+        updatedAt), or None if nothing was pending or the document is gone.
+        Raises AutosaveConflict if it kept changing underneath."""
+        entry = self._entries.get(content_id)
+        if entry is None:
+            return None
+        async with entry.lock:
+            if entry.timer is not None and entry.timer is not asyncio.current_task():
+                entry.timer.cancel()
+            entry.timer = None
+            if entry.text is None:
+                return None
+            text, rev = entry.text, entry.rev
+            try:
+                written = await self._write(entry, content_id, text, rev)
+            except Exception:
+                self._schedule(content_id, entry)  # still pending – try again later
+                raise
+            if written is None:  # deleted meanwhile
+                logger.info("Dropping autosave of %s: content no longer exists", content_id)
+                self._entries.pop(content_id, None)
+                return None
+            entry.savedRev = rev
+            if entry.rev == rev:
+                entry.text = None
+                self._entries.pop(content_id, None)
+            else:  # edited during the write
+                self._schedule(content_id, entry)
+            return written
+
+    async def _write(self, entry: _Entry, content_id: PydanticObjectId, text: str, rev: int):
+        for _ in range(WRITE_RETRIES):
+            item = await entry.model.get(content_id)
+            if item is None:
+                return None
+            written = await write_body(item, entry.kind, text, {"autosaveRev": rev})
+            if written:
+                return written
+        raise AutosaveConflict(str(content_id))
+
+    async def flush_all(self) -> None:
+        """Write every pending edit (on shutdown)."""
+
+        async def safe_flush(content_id: PydanticObjectId) -> None:
+            try:
+                await self.flush(content_id)
+            except Exception:
+                logger.exception("Autosave flush of %s failed at shutdown; edit lost", content_id)
+
+        await gather_bounded(*(safe_flush(cid) for cid in list(self._entries)))
+
+
+autosave = AutosaveBuffer(settings.CONTENT_AUTOSAVE_INTERVAL_SECONDS, settings.CONTENT_AUTOSAVE_MAX_PENDING)
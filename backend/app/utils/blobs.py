@@ -0,0 +1,296 @@
+"""Blob store for versioned content (the `content_blobs` collection of
+app/models/content_blob.py).
+
+Reference counts err on the side of leaking: a blob is acquired before the
+referencing write and released only after the reference is gone, so a crash
+can leave a count too high (fixed by `reconcile_blob_refs`) but never too low.
+Blobs at zero are removed by `gc_blobs` after a grace period.
+
+Delta mode (CONTENT_DELTA_ENABLED): a new blob may instead be stored as an
+RFC 6902 diff against a base blob – the document's previous body when it is
+edited, or the previous version's body when a version is created. The delta
+blob holds a reference on its base; every CONTENT_DELTA_KEYFRAME_INTERVAL
+links (or whenever the diff isn't clearly smaller) a full keyframe is
+written. Blobs stay content-addressed and immutable, so editing a base
+version never breaks a chain, and reconstructed bodies are cached by hash.
+
+- `put_blob` / `acquire_blobs` / `release_blobs` manage references.
+- `load_texts` / `hydrate` read bodies (one `$in` read per delta-chain
+  level, fronted by an LRU of decoded bodies keyed by hash).
+- `blob_refs` lets bulk deletes return their references.
+- `gc_blobs` / `reconcile_blob_refs` are run from `scripts/content_blobs.py`.
+"""
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.core.config import settings
+from app.models.beat import Beat
+from app.models.shot import Shot
+from app.models.storyboard import Storyboard
+from app.models.content_blob import BlobContent, ContentBlob
+from app.models.content_codec import content_hash, decode_text, json_format, render_json, stored_content_fields
+from app.utils.cache import TTLCache
+from app.utils.json_patch import JsonPatchError, apply_patch, diff
+
+logger = logging.getLogger(__name__)
+
+BLOB_MODELS = (Beat, Shot, Storyboard)
+DUPLICATE_KEY = 11000
+
+__all__ = [
+    "BLOB_MODELS", "acquire_blobs", "load_texts", "put_blob", "release_blobs", "delta_base",
+    "hydrate", "blob_refs", "gc_blobs", "reconcile_blob_refs",
+]
+
+# Decoded / reconstructed bodies by hash; blobs are immutable so entries never go stale
+_bodies: TTLCache[str, str] = TTLCache("content_blobs", settings.CONTENT_BLOB_CACHE_SIZE)
+
+
+def _blobs():
+    return ContentBlob.get_motor_collection()
+
+
+async def acquire_blobs(texts: Dict[str, str], counts: Dict[str, int]) -> None:
+    """Add `counts[h]` references to each blob, creating it from `texts[h]`."""
+    if not counts:
+        return
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne(
+            {"_id": h},
+            {
+                "$inc": {"refCount": n},
+                "$set": {"updatedAt": now},
+                "$setOnInsert": {**stored_content_fields(texts[h]), "createdAt": now},
+            },
+            upsert=True,
+        )
+        for h, n in counts.items()
+    ]
+    try:
+        await _blobs().bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        # Two concurrent upserts of a new blob: the loser retries as a plain $inc
+        errors = e.details.get("writeErrors", [])
+        if any(err["code"] != DUPLICATE_KEY for err in errors):
+            raise
+        await _blobs().bulk_write([ops[err["index"]] for err in errors], ordered=False)
+
+
+async def load_texts(hashes: Iterable[str]) -> Dict[str, str]:
+    """Decoded bodies for `hashes`, resolving delta chains (one `$in` read per
+    chain level for whatever isn't cached). Unknown hashes are omitted."""
+    wanted = set(hashes)
+    out: Dict[str, str] = {}
+    raw: Dict[str, dict] = {}
+    pending = set(wanted)
+    while pending:
+        for h in list(pending):
+            text = _bodies.get(h)
+            if text is not None:
+                out[h] = text
+                pending.discard(h)
+        if not pending:
+            break
+        cursor = _blobs().find(
+            {"_id": {"$in": list(pending)}}, {"content": 1, "base": 1, "delta": 1, "fmt": 1},
+        )
+        pending = set()
+        async for b in cursor:
+            raw[b["_id"]] = b
+            if b.get("delta") is None:
+                out[b["_id"]] = decode_text(b["content"])
+                _bodies.set(b["_id"], out[b["_id"]])
+            elif b["base"] not in out and b["base"] not in raw:
+                pending.add(b["base"])
+        pending -= raw.keys()
+
+    def resolve(h: str) -> Optional[str]:
+        if h in out:
+            return out[h]
+        b = raw.get(h)
+        base = resolve(b["base"]) if b else None
+        if base is None:
+            return None
+        out[h] = render_json(apply_patch(json.loads(base), json.loads(b["delta"])), b["fmt"])
+        _bodies.set(h, out[h])
+        return out[h]
+
+    return {h: text for h in wanted if (text := resolve(h)) is not None}
+
+
+async def _delta_fields(text: str, base_hash: str) -> Optional[Dict[str, Any]]:
+    """Fields for storing `text` as a delta against `base_hash`, or None when
+    a keyframe is due or the delta wouldn't pay off."""
+    base_blob = await _blobs().find_one({"_id": base_hash}, {"depth": 1})
+    if not base_blob or base_blob.get("depth", 0) + 1 >= settings.CONTENT_DELTA_KEYFRAME_INTERVAL:
+        return None
+    base_text = (await load_texts([base_hash])).get(base_hash)
+    if base_text is None:
+        return None
+    try:
+        base_doc, new_doc = json.loads(base_text), json.loads(text)
+    except ValueError:
+        return None
+    fmt = json_format(new_doc, text)
+    if fmt is None:
+        return None
+    ops = diff(base_doc, new_doc)
+    delta = json.dumps(ops)
+    if len(delta) > settings.CONTENT_DELTA_MAX_RATIO * len(text):
+        return None
+    try:
+        if render_json(apply_patch(base_doc, ops), fmt) != text:
+            return None
+    except JsonPatchError:
+        return None
+    return {
+        "base": base_hash, "delta": delta, "fmt": fmt, "depth": base_blob.get("depth", 0) + 1,
+        "contentSize": len(text.encode("utf-8")),
+    }
+
+
+async def put_blob(text: str, base_hash: Optional[str] = None) -> str:
+    """Add one reference to the blob for `text` and return its hash.
+
+    Creates the blob if needed – as a delta against `base_hash` when delta
+    mode is on and it pays off, otherwise as a keyframe.
+    """
+    h = content_hash(text)
+    now = datetime.utcnow()
+    res = await _blobs().update_one({"_id": h}, {"$inc": {"refCount": 1}, "$set": {"updatedAt": now}})
+    if res.matched_count:
+        return h
+    fields = None
+    if settings.CONTENT_DELTA_ENABLED and base_hash and base_hash != h:
+        fields = await _delta_fields(text, base_hash)
+    if fields is None:
+        await acquire_blobs({h: text}, {h: 1})
+        return h
+    # The delta blob holds a reference on its base; take it before creating
+    await _inc_refs({base_hash: 1})
+    try:
+        res = await _blobs().update_one(
+            {"_id": h},
+            {"$inc": {"refCount": 1}, "$set": {"updatedAt": now}, "$setOnInsert": {**fields, "createdAt": now}},
+            upsert=True,
+        )
+        created = res.upserted_id is not None
+    except DuplicateKeyError:  # lost a creation race – the blob exists now
+        await _inc_refs({h: 1})
+        created = False
+    if not created:
+        await _inc_refs({base_hash: -1})
+    return h
+
+
+async def _inc_refs(counts: Dict[str, int]) -> None:
+    if not counts:
+        return
+    now = datetime.utcnow()
+    await _blobs().bulk_write(
+        [UpdateOne({"_id": h}, {"$inc": {"refCount": n}, "$set": {"updatedAt": now}}) for h, n in counts.items()],
+        ordered=False,
+    )
+
+
+async def release_blobs(counts: Dict[str, int]) -> None:
+    await _inc_refs({h: -n for h, n in counts.items()})
+
+
+async def delta_base(doc: BlobContent) -> Optional[str]:
+    """Blob to diff against: the document's previous body when edited,
+    else the body of the closest earlier version of the same part."""
+    if not settings.CONTENT_DELTA_ENABLED:
+        return None
+    if doc.blobHash:
+        return doc.blobHash
+    prev = await type(doc).get_motor_collection().find_one(
+        {
+            "partId": doc.partId, "blobHash": {"$ne": None},
+            "metadata.versionNo": {"$lt": doc.metadata.versionNo},
+        },
+        {"blobHash": 1}, sort=[("metadata.versionNo", -1)],
+    )
+    return prev["blobHash"] if prev else None
+
+
+async def hydrate(*docs: BlobContent) -> None:
+    """Load `content` for documents whose body lives in the blob store."""
+    docs = [d for d in docs if not d.content_loaded and d.blobHash]
+    if not docs:
+        return
+    bodies = await load_texts({d.blobHash for d in docs})
+    for d in docs:
+        if d.blobHash in bodies:
+            d.load_blob_text(bodies[d.blobHash])
+        else:
+            logger.error("Content blob %s missing for %s %s", d.blobHash, type(d).__name__, d.id)
+
+
+async def blob_refs(model, query: dict, field: str = "blobHash") -> Dict[str, int]:
+    """{blob hash: number of documents} among the documents matching `query`."""
+    rows = await model.get_motor_collection().aggregate([
+        {"$match": {**query, field: {"$ne": None}}},
+        {"$group": {"_id": f"${field}", "n": {"$sum": 1}}},
+    ]).to_list(None)
+    return {row["_id"]: row["n"] for row in rows}
+
+
+async def gc_blobs(grace_seconds: Optional[int] = None) -> int:
+    """Delete blobs that have had no references for the grace period.
+
+    Deleting a delta blob releases its base, which becomes collectable on a
+    later run once its own grace period has passed.
+    """
+    grace = settings.CONTENT_BLOB_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = datetime.utcnow() - timedelta(seconds=grace)
+    coll = ContentBlob.get_motor_collection()
+    dead = {"refCount": {"$lte": 0}, "updatedAt": {"$lt": cutoff}}
+    deleted = 0
+    bases: Counter = Counter()
+    async for blob in coll.find({**dead, "base": {"$ne": None}}, {"base": 1}):
+        # One by one so a blob revived meanwhile is skipped and keeps its base
+        res = await coll.delete_one({"_id": blob["_id"], **dead})
+        if res.deleted_count:
+            deleted += 1
+            bases[blob["base"]] += 1
+    deleted += (await coll.delete_many({**dead, "base": None})).deleted_count
+    await release_blobs(dict(bases))
+    return deleted
+
+
+async def reconcile_blob_refs() -> Dict[str, int]:
+    """Recount references from the content collections and fix drifted counts.
+
+    Counts are only ever too high after a crash. Blobs touched while the
+    recount runs (updatedAt >= start) are left alone, and any blob set to zero
+    still gets the GC grace period before removal.
+    """
+    started = datetime.utcnow()
+    actual: Counter = Counter()
+    for model in BLOB_MODELS:
+        actual.update(await blob_refs(model, {}))
+    coll = ContentBlob.get_motor_collection()
+    # Delta blobs reference their base
+    actual.update(await blob_refs(ContentBlob, {}, field="base"))
+    fixed: List[Tuple[str, int]] = []
+    async for blob in coll.find({}, {"refCount": 1}):
+        n = actual.get(blob["_id"], 0)
+        if blob.get("refCount") != n:
+            fixed.append((blob["_id"], n))
+    for i in range(0, len(fixed), 1000):
+        await coll.bulk_write(
+            [
+                UpdateOne({"_id": h, "updatedAt": {"$lt": started}}, {"$set": {"refCount": n, "updatedAt": started}})
+                for h, n in fixed[i:i + 1000]
+            ],
+            ordered=False,
+        )
+    return {"blobs": len(actual), "fixed": len(fixed)}
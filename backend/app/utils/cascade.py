@@ -0,0 +1,134 @@
+"""Cascade-delete engine for projects, episodes and parts.
+
+Descendant IDs are collected once, then each collection gets one
+deleteMany (batched `$in` for large trees) and the collections are cleared
+concurrently. Projects are deleted by `projectId` directly, which also covers
+project-level asset images and Characters/Locations/Props. Blob references
+held by the deleted beats/shots/storyboards are counted up front and released
+once the documents are gone.
+"""
+from collections import Counter
+from typing import Dict, List, Optional
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.models.episode import Episode
+from app.models.part import Part
+from app.models.beat import Beat
+from app.models.shot import Shot
+from app.models.storyboard import Storyboard
+from app.models.media import Image, Clip
+from app.models.character import Character
+from app.models.location import Location
+from app.models.prop import Prop
+from app.models.content_selection import ContentSelection
+from app.models.archived_version import ArchivedVersion
+from app.models.stats import ContentStats
+from app.utils.aio import gather_bounded
+from app.utils.jobs import Job, jobs
+from app.utils import blobs, id_registry
+
+PART_CHILD_MODELS = (Beat, Shot, Storyboard, Image, Clip)
+ASSET_MODELS = (Character, Location, Prop)
+IN_BATCH = 1000
+
+
+class _IdOnly(BaseModel):
+    """Projection so ID collection doesn't pull whole documents."""
+    id: PydanticObjectId = Field(alias="_id")
+
+
+def tree_size(stats: ContentStats) -> int:
+    """Number of content/media documents under a node."""
+    return stats.beatCount + stats.shotCount + stats.storyboardCount + stats.imageCount + stats.clipCount
+
+
+def should_run_in_background(stats: ContentStats) -> bool:
+    return tree_size(stats) > settings.CASCADE_BACKGROUND_THRESHOLD
+
+
+async def _delete_many(model, query: dict, job: Optional[Job]) -> int:
+    res = await model.get_motor_collection().delete_many(query)
+    if job:
+        job.step()
+    return res.deleted_count
+
+
+async def _delete_in(model, field: str, ids: List[PydanticObjectId], job: Optional[Job]) -> int:
+    deleted = 0
+    for i in range(0, len(ids), IN_BATCH):
+        res = await model.get_motor_collection().delete_many({field: {"$in": ids[i:i + IN_BATCH]}})
+        deleted += res.deleted_count
+    if job:
+        job.step()
+    return deleted
+
+
+async def _blob_refs(query: dict) -> Dict[str, int]:
+    """Blob references held by the versioned content matching `query`;
+    collected before deleting and released afterwards."""
+    total: Counter = Counter()
+    for refs in await gather_bounded(*(blobs.blob_refs(m, query) for m in blobs.BLOB_MODELS)):
+        total.update(refs)
+    return dict(total)
+
+
+async def _part_blob_refs(part_ids: List[PydanticObjectId]) -> Dict[str, int]:
+    total: Counter = Counter()
+    for i in range(0, len(part_ids), IN_BATCH):
+        total.update(await _blob_refs({"partId": {"$in": part_ids[i:i + IN_BATCH]}}))
+    return dict(total)
+
+
+def _summary(models, counts) -> Dict[str, int]:
+    return {m.Settings.name: n for m, n in zip(models, counts)}
+
+
+async def delete_parts(part_ids: List[PydanticObjectId], job: Optional[Job] = None) -> Dict[str, int]:
+    """Delete the given parts and everything keyed by their partId."""
+    if not part_ids:
+        return {}
+    # A queued seed would otherwise start after the cascade; running ones
+    # notice the part is gone and clean up after themselves
+    for pid in part_ids:
+        jobs.cancel_pending("seed_part", partId=str(pid))
+    models = (*PART_CHILD_MODELS, Part)
+    if job:
+        job.total = len(models)
+    refs = await _part_blob_refs(part_ids)
+    *counts, _, _, _ = await gather_bounded(
+        *(_delete_in(m, "partId", part_ids, job) for m in PART_CHILD_MODELS),
+        _delete_in(Part, "_id", part_ids, job),
+        id_registry.unregister_parts(part_ids),
+        _delete_in(ContentSelection, "partId", part_ids, None),
+        _delete_in(ArchivedVersion, "partId", part_ids, None),
+    )
+    await blobs.release_blobs(refs)
+    return _summary(models, counts)
+
+
+async def delete_episode_tree(episode_id: PydanticObjectId, job: Optional[Job] = None) -> Dict[str, int]:
+    """Delete all parts (and their content) of an episode. The episode document
+    itself is removed by the caller before this runs."""
+    part_ids = [p.id for p in await Part.find(Part.episodeId == episode_id).project(_IdOnly).to_list()]
+    return await delete_parts(part_ids, job)
+
+
+async def delete_project_tree(project_id: PydanticObjectId, job: Optional[Job] = None) -> Dict[str, int]:
+    """Delete every episode, part, content/media document and asset of a
+    project. The project document itself is removed by the caller first."""
+    jobs.cancel_pending("seed_part", projectId=str(project_id))
+    models = (*PART_CHILD_MODELS, *ASSET_MODELS, Part, Episode)
+    if job:
+        job.total = len(models)
+    refs = await _blob_refs({"projectId": project_id})
+    *counts, _, _, _ = await gather_bounded(
+        *(_delete_many(m, {"projectId": project_id}, job) for m in models),
+        id_registry.unregister_project(project_id),
+        _delete_many(ContentSelection, {"projectId": project_id}, None),
+        _delete_many(ArchivedVersion, {"projectId": project_id}, None),
+    )
+    await blobs.release_blobs(refs)
+    return _summary(models, counts)
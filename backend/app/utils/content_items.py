@@ -0,0 +1,196 @@
+"""Item-level view of beat / shot / storyboard content.
+
+A content document is one version of all items of a part, stored as a JSON
+array. Items are addressed by a stable key taken from the data itself:
+
+- beats:       `Beat_Number` / `beat_number` ("3")
+- shots:       the shot code inside each beat's `shots` list ("1B")
+- storyboards: `metadata.panel_number` ("12")
+
+falling back to the 1-based position when the field is missing. Parsed
+indexes are cached per (document id, updatedAt), so repeated item reads of
+the same version parse its JSON once (with the msgspec decoder of
+app/utils/content_schema.py; natively stored content needs no parsing at all).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.content_blob import ContentSummary
+from app.models.content_codec import content_hash
+from app.utils import blobs
+from app.utils.cache import TTLCache
+from app.utils.content_schema import loads
+from app.utils.json_patch import diff
+
+
+Slot = Tuple[List[Any], int]  # (containing list, position) of an item
+
+
+class ItemIndex:
+    """Parsed content with items addressable by key, in document order."""
+
+    def __init__(self, items: Dict[str, Any], summaries: List[Dict[str, Any]], slots: Dict[str, Slot]):
+        self.items = items
+        self.summaries = summaries
+        self.slots = slots
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.items.get(key)
+
+
+_indexes: TTLCache[Tuple[str, Any], ItemIndex] = TTLCache(
+    "content.item_index", settings.CONTENT_ITEM_INDEX_CACHE_SIZE,
+)
+# Bodies are immutable per hash, so a diff never goes stale
+_diffs: TTLCache[Tuple[str, str, str], Dict[str, Any]] = TTLCache(
+    "content.item_diff", settings.CONTENT_DIFF_CACHE_SIZE,
+)
+
+
+def item_list(doc: Any) -> List[Any]:
+    """The top-level item array: the document itself, or the single array
+    member of a wrapper object such as {"beats": [...]}."""
+    if isinstance(doc, list):
+        return doc
+    if isinstance(doc, dict):
+        lists = [v for v in doc.values() if isinstance(v, list)]
+        if len(lists) == 1:
+            return lists[0]
+    raise ValueError("Content has no top-level item array")
+
+
+def _field(d: Any, *names: str) -> Any:
+    if not isinstance(d, dict):
+        return None
+    for name in names:
+        if d.get(name) is not None:
+            return d[name]
+    return None
+
+
+def _keyed(entries: List[Tuple[Any, Any, Dict[str, Any], Slot]]) -> ItemIndex:
+    items: Dict[str, Any] = {}
+    summaries = []
+    slots: Dict[str, Slot] = {}
+    for pos, (key, item, summary, slot) in enumerate(entries, start=1):
+        key = str(key if key is not None else pos)
+        if key in items:  # duplicate key in the data – keep both addressable
+            key = f"{key}~{pos}"
+        items[key] = item
+        summaries.append({"key": key, **summary})
+        slots[key] = slot
+    return ItemIndex(items, summaries, slots)
+
+
+def _beat_items(doc: Any) -> ItemIndex:
+    beats = item_list(doc)
+    return _keyed([
+        (_field(b, "Beat_Number", "beat_number"), b, {"title": _field(b, "Title", "title")}, (beats, i))
+        for i, b in enumerate(beats)
+    ])
+
+
+def _shot_items(doc: Any) -> ItemIndex:
+    entries = []
+    for beat in item_list(doc):
+        beat_no = _field(beat, "beat_number", "Beat_Number")
+        shots = _field(beat, "shots") or []
+        for i, shot in enumerate(shots):
+            entries.append((
+                _field(shot, "shot"), shot,
+                {"title": _field(shot, "intent_title", "title"), "beatNumber": beat_no},
+                (shots, i),
+            ))
+    return _keyed(entries)
+
+
+def _storyboard_items(doc: Any) -> ItemIndex:
+    panels = item_list(doc)
+    entries = []
+    for i, panel in enumerate(panels):
+        meta = _field(panel, "metadata") or {}
+        entries.append((
+            _field(meta, "panel_number"), panel,
+            {"title": _field(meta, "shot_summary"), "beatNumber": _field(meta, "beat_number")},
+            (panels, i),
+        ))
+    return _keyed(entries)
+
+
+_BUILDERS = {"beat": _beat_items, "shot": _shot_items, "storyboard": _storyboard_items}
+
+
+def build_index(kind: str, doc: Any) -> ItemIndex:
+    """Item index for already-parsed content of the given type."""
+    return _BUILDERS[kind](doc)
+
+
+def content_summary(kind: str, text: str, parsed: Any = None) -> ContentSummary:
+    """Summary of `text` (`parsed` = its already-decoded JSON, if at hand)."""
+    try:
+        index = build_index(kind, loads(text) if parsed is None else parsed)
+    except ValueError:  # not a JSON item array – nothing to list
+        return ContentSummary(hash=content_hash(text))
+    return ContentSummary(itemCount=len(index), items=index.summaries, hash=content_hash(text))
+
+
+def splice_items(kind: str, doc: Any, picks: Dict[str, Any]) -> List[str]:
+    """Replace items of the parsed `doc` in place by key. Returns the keys
+    that were placed (keys `doc` has no item for are skipped)."""
+    index = build_index(kind, doc)
+    placed = []
+    for key, item in picks.items():
+        slot = index.slots.get(key)
+        if slot is not None:
+            container, pos = slot
+            container[pos] = item
+            placed.append(key)
+    return placed
+
+
+async def item_index(kind: str, item: Any) -> ItemIndex:
+    """Cached item index of a content document; its body is only loaded
+    from the blob store on a cache miss.
+
+    Raises ValueError if the content isn't JSON or has no item array.
+    """
+    key = (str(item.id), item.updatedAt)
+    index = _indexes.get(key)
+    if index is None:
+        if item.content_native:
+            index = build_index(kind, item.storedContent)
+        else:
+            await blobs.hydrate(item)
+            index = build_index(kind, loads(item.content))
+        _indexes.set(key, index)
+    return index
+
+
+def diff_indexes(old: ItemIndex, new: ItemIndex) -> Dict[str, Any]:
+    """Item-level structural diff: items matched by key, changed ones as
+    RFC 6902 operations relative to the item."""
+    titles = {s["key"]: s.get("title") for s in old.summaries}
+    added = [{"key": k, "item": v} for k, v in new.items.items() if k not in old.items]
+    removed = [{"key": k, "title": titles.get(k)} for k in old.items if k not in new.items]
+    changed = []
+    for key, item in new.items.items():
+        if key in old.items:
+            ops = diff(old.items[key], item)
+            if ops:
+                changed.append({"key": key, "ops": ops})
+    unchanged = len(new) - len(added) - len(changed)
+    return {"added": added, "removed": removed, "changed": changed, "unchangedCount": unchanged}
+
+
+async def item_diff(kind: str, old: Any, new: Any) -> Dict[str, Any]:
+    """Cached `diff_indexes` of two content documents, keyed by their
+    content hashes (bodies are only loaded on a cache miss)."""
+    key = (kind, old.contentHash, new.contentHash)
+    result = _diffs.get(key)
+    if result is None:
+        result = diff_indexes(await item_index(kind, old), await item_index(kind, new))
+        _diffs.set(key, result)
+    return result
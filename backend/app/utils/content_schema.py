@@ -0,0 +1,213 @@
+"""Typed schemas for content bodies, decoded with msgspec.
+
+The shapes follow the demo data (demodata/*.json): beats, shots (beats with
+their `shots`), storyboard panels, and single character / location / prop
+sheets.
+Schemas are lenient on purpose. Every field is optional and unknown fields
+are ignored, so only the type of a known field can fail validation: a list
+where text is expected, a panel without a `metadata` object, and so on.
+Item arrays may also come wrapped the way the demo files are
+({"beats": [...]}, {"storyboard": [...]}).
+
+- `validate` checks a body (text or already-parsed JSON) on write.
+- `loads` is a drop-in for `json.loads` on the read paths: msgspec's
+  decoder, falling back to the stdlib for what it rejects (NaN literals,
+  out-of-range floats), so results and errors stay the same.
+- `decode` returns the typed structs.
+
+Decoded content is cached per document revision by `content_items.item_index`.
+`scripts/bench_content_decode.py` compares the decoders on the demo data.
+"""
+import json
+from typing import Any, Dict, List, Optional, Union
+
+import msgspec
+
+
+class ContentSchemaError(ValueError):
+    """The body isn't JSON or doesn't match its type's schema."""
+
+
+class _Lenient(msgspec.Struct, omit_defaults=True):
+    pass
+
+
+Number = Union[int, float, str, None]  # numbered keys are ints in the demo data, codes like "3A" elsewhere
+
+
+# ── Beats ────────────────────────────────────────────────────
+
+class BeatItem(_Lenient):
+    Beat_Number: Number = None
+    Title: Optional[str] = None
+    Scene_Ref: Optional[str] = None
+    Screenplay_lines: Optional[List[str]] = None
+    Time_Range: Optional[str] = None
+    Description: Optional[str] = None
+    Emotion: Optional[str] = None
+
+
+class BeatDoc(_Lenient):
+    beats: List[BeatItem] = []
+
+
+# ── Shots ────────────────────────────────────────────────────
+
+class ShotItem(_Lenient):
+    shot: Number = None
+    intent_title: Optional[str] = None
+    intent: Optional[str] = None
+    emotion: Optional[str] = None
+    narrative_function: Optional[str] = None
+    estimated_duration: Union[str, int, float, None] = None
+
+
+class ShotBeat(_Lenient):
+    beat_number: Number = None
+    title: Optional[str] = None
+    scene_ref: Optional[str] = None
+    screenplay_lines: Optional[List[str]] = None
+    time_range: Optional[str] = None
+    description: Optional[str] = None
+    emotion: Optional[str] = None
+    shots: List[ShotItem] = []
+
+
+class ShotDoc(_Lenient):
+    beats: List[ShotBeat] = []
+
+
+# ── Storyboards ──────────────────────────────────────────────
+
+class PanelMetadata(_Lenient):
+    panel_number: Number = None
+    beat_number: Number = None
+    shot_summary: Optional[str] = None
+
+
+class Cinematography(_Lenient):
+    shot_size_angle: Optional[str] = None
+    lens_intent: Optional[str] = None
+    camera_movement: Optional[str] = None
+
+
+class Composition(_Lenient):
+    subject_composition: Optional[str] = None
+    action: Optional[str] = None
+
+
+class Setting(_Lenient):
+    key_location: Optional[str] = None
+    scenography: Optional[str] = None
+    time_context: Optional[str] = None
+
+
+class StoryContext(_Lenient):
+    visual_style_guide: Optional[str] = None
+    project_context: Optional[str] = None
+    era_culture_context: Optional[str] = None
+    emotional_thematic_intent: Optional[str] = None
+
+
+class Audio(_Lenient):
+    dialogue: Optional[str] = None
+    audio_cue_intent: Optional[str] = None
+
+
+class Panel(_Lenient):
+    metadata: Optional[PanelMetadata] = None
+    cinematography: Optional[Cinematography] = None
+    composition: Optional[Composition] = None
+    setting: Optional[Setting] = None
+    character_focal_position: Any = None
+    characters: Optional[List[Any]] = None
+    story_context: Optional[StoryContext] = None
+    audio: Optional[Audio] = None
+
+
+class StoryboardDoc(_Lenient):
+    storyboard: List[Panel] = []
+
+
+# ── Project assets ───────────────────────────────────────────
+
+class CharacterSheet(_Lenient):
+    name: Optional[str] = msgspec.field(default=None, name="Name/Identifier")
+    cultural_context: Optional[str] = msgspec.field(default=None, name="Cultural Context")
+    visual_design: Optional[str] = msgspec.field(default=None, name="Visual Design")
+    age_gender: Optional[str] = msgspec.field(default=None, name="Age & Gender")
+    physical_description: Optional[str] = msgspec.field(default=None, name="Physical Description")
+    attire: Optional[str] = msgspec.field(default=None, name="Attire")
+
+
+class VisualProfile(_Lenient):
+    environment: Optional[str] = None
+    cultural_or_era_style: Optional[str] = None
+    architecture_or_space: Optional[str] = None
+    lighting_time_of_day: Optional[str] = None
+    key_objects_or_features: Optional[List[str]] = None
+
+
+class LocationSheet(_Lenient):
+    location_id: Number = None
+    name: Optional[str] = None
+    type: Optional[str] = None
+    narrative_role: Optional[str] = None
+    visual_profile: Optional[VisualProfile] = None
+
+
+class PropSheet(_Lenient):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+
+
+SCHEMAS: Dict[str, Any] = {
+    "beat": Union[List[BeatItem], BeatDoc],
+    "shot": Union[List[ShotBeat], ShotDoc],
+    "storyboard": Union[List[Panel], StoryboardDoc],
+    "character": CharacterSheet,
+    "location": LocationSheet,
+    "prop": PropSheet,
+}
+
+_decoders = {kind: msgspec.json.Decoder(schema) for kind, schema in SCHEMAS.items()}
+_untyped = msgspec.json.Decoder()
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """Parse JSON like `json.loads` (same results, ValueError on bad input)."""
+    try:
+        return _untyped.decode(text)
+    except msgspec.DecodeError:
+        return json.loads(text)
+
+
+def decode(kind: str, text: Union[str, bytes]) -> Any:
+    """Typed structs for a body of the given type; raises ContentSchemaError."""
+    try:
+        return _decoders[kind].decode(text)
+    except msgspec.ValidationError as e:
+        raise ContentSchemaError(f"Content does not match the {kind} schema: {e}")
+    except msgspec.DecodeError:
+        pass
+    try:  # valid JSON msgspec won't take (NaN, huge floats) – check the parsed form
+        return msgspec.convert(json.loads(text), SCHEMAS[kind])
+    except ValueError as e:
+        if isinstance(e, msgspec.ValidationError):
+            raise ContentSchemaError(f"Content does not match the {kind} schema: {e}")
+        raise ContentSchemaError("Content is not valid JSON")
+
+
+def validate(kind: str, content: Any) -> None:
+    """Raise ContentSchemaError unless `content` (JSON text, or the already
+    parsed document) matches the schema. Types without a schema pass."""
+    if kind not in SCHEMAS:
+        return
+    if isinstance(content, (str, bytes)):
+        decode(kind, content)
+        return
+    try:
+        msgspec.convert(content, SCHEMAS[kind])
+    except msgspec.ValidationError as e:
+        raise ContentSchemaError(f"Content does not match the {kind} schema: {e}")
@@ -0,0 +1,140 @@
+"""Body writes for Beat/Shot/Storyboard documents.
+
+- `store_before_write` runs from the models' insert/save hooks: it refreshes
+  the summary and moves inline content to the blob store (or native storage).
+- `store_many` does the same for `insert_many` callers, which bypass the hooks.
+- `write_body` replaces the body of one existing document; used by
+  `PATCH /content/{id}` and the autosave flush (app/utils/autosave.py).
+  Unlike `save()` the write is a single `update_one` that is conditional on
+  the `updatedAt` that was read. A concurrent writer is never overwritten
+  silently; the caller re-reads and decides whether to retry.
+- `backfill_summaries` fills in summaries of versions written before
+  summaries existed.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.content_blob import BlobContent
+from app.models.content_codec import content_hash, native_update, to_native
+from app.utils import blobs
+from app.utils.aio import gather_bounded
+from app.utils.content_items import content_summary
+from app.utils.counters import apply_delta, content_bytes
+
+
+def refresh_summary(doc: BlobContent) -> None:
+    doc.summary = content_summary(
+        doc.content_kind, doc.content, doc.storedContent if doc.content_native else None,
+    )
+
+
+async def store_before_write(doc: BlobContent) -> None:
+    """Move inline content of `doc` to storage before it is inserted or saved;
+    the replaced blob is released by the model's after-write hook."""
+    if not doc.content_dirty:
+        return
+    refresh_summary(doc)
+    if doc.store_native():
+        doc._release_after_write, doc.blobHash = doc.blobHash, None
+        return
+    text = doc.content
+    if content_hash(text) != doc.blobHash:
+        await blobs.put_blob(text, await blobs.delta_base(doc))
+    doc._release_after_write = doc.take_inline_content()
+
+
+async def store_many(docs: Iterable[BlobContent]) -> None:
+    """Acquire blobs for not-yet-inserted documents (one bulk upsert)."""
+    texts: Dict[str, str] = {}
+    counts: Counter = Counter()
+    for d in docs:
+        if not d.content_dirty:
+            continue
+        refresh_summary(d)
+        if d.store_native():
+            continue
+        text = d.content
+        d.take_inline_content()
+        texts[d.blobHash] = text
+        counts[d.blobHash] += 1
+    await blobs.acquire_blobs(texts, dict(counts))
+
+
+def native_write(item: Any, native) -> Dict[str, Dict[str, Any]]:
+    """Update storing the content natively: only the changed fields
+    (`content.3.Title`) when the document already is native in the same
+    format, else the whole array."""
+    doc, fmt = native
+    if item.content_native and item.contentFormat == fmt:
+        update = native_update(item.storedContent, doc)
+        if update is not None:
+            return update
+    return {"$set": {"content": doc, "contentFormat": fmt, "blobHash": None}}
+
+
+async def write_body(
+    item: Any, kind: str, text: str, extra: Optional[Dict[str, Any]] = None,
+) -> Optional[Tuple[str, int, datetime]]:
+    """Replace the body of the loaded document `item` with `text` (plus any
+    `extra` fields to `$set`), conditional on `item.updatedAt`.
+
+    On success the replaced blob is released, the rollup counters are
+    adjusted, and (contentHash, contentBytes, updatedAt) is returned. None
+    means the document was touched since it was read and nothing was
+    written.
+    """
+    if item.contentSize is None:
+        await blobs.hydrate(item)
+    new_size = content_bytes(text)
+    native = to_native(text) if settings.CONTENT_NATIVE_ENABLED else None
+    summary = content_summary(kind, text, native[0] if native else None)
+    if native:
+        new_hash = content_hash(text)
+        update = native_write(item, native)
+    else:
+        # Diffed against the current body when delta storage is enabled
+        new_hash = await blobs.put_blob(text, item.blobHash)
+        update = {"$set": {"content": None, "contentFormat": None, "blobHash": new_hash}}
+    now = datetime.utcnow()
+    update.setdefault("$set", {}).update(
+        contentSize=new_size, summary=summary.model_dump(), updatedAt=now, **(extra or {}),
+    )
+    res = await type(item).get_motor_collection().update_one({"_id": item.id, "updatedAt": item.updatedAt}, update)
+    if not res.matched_count:
+        if not native:
+            await blobs.release_blobs({new_hash: 1})
+        return None
+
+    if item.blobHash:
+        await blobs.release_blobs({item.blobHash: 1})
+    old_size = item.contentSize if item.contentSize is not None else content_bytes(item.content)
+    await apply_delta(
+        {"contentBytes": new_size - old_size},
+        org_id=item.organizationId, project_id=item.projectId,
+        episode_id=item.episodeId, part_id=item.partId,
+    )
+    return new_hash, new_size, now
+
+
+async def backfill_summaries(Model, ids: List[Any]) -> Dict[Any, Any]:
+    """Compute and store `summary` for versions written before summaries
+    existed. Returns {id: ContentSummary}; writes are conditional on
+    `updatedAt`, so a concurrent edit (which sets its own summary) wins."""
+    docs = await Model.find({"_id": {"$in": ids}}).to_list()
+    await blobs.hydrate(*docs)
+    docs = [d for d in docs if d.content_loaded]
+    for d in docs:
+        refresh_summary(d)
+        if d.contentSize is None:
+            d.contentSize = len(d.content.encode("utf-8"))
+    coll = Model.get_motor_collection()
+    await gather_bounded(*(
+        coll.update_one(
+            {"_id": d.id, "updatedAt": d.updatedAt},
+            {"$set": {"summary": d.summary.model_dump(), "contentSize": d.contentSize}},
+        )
+        for d in docs
+    ))
+    return {d.id: d.summary for d in docs}
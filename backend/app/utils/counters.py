@@ -0,0 +1,169 @@
+"""Materialized content/media rollup counters (ContentStats).
+
+Every create/delete path calls `apply_delta` with the change for a single
+document; the delta is $inc'ed atomically on the owning Part, Episode,
+Project and Organization. `reconcile_stats` recomputes everything in bulk
+from the content collections (used by `python -m scripts.reconcile_stats`).
+"""
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.episode import Episode
+from app.models.part import Part
+from app.models.beat import Beat
+from app.models.shot import Shot
+from app.models.storyboard import Storyboard
+from app.models.media import Image, Clip
+from app.models.stats import ContentStats
+from app.utils.aio import gather_bounded
+
+COUNT_FIELD = {
+    Beat: "beatCount",
+    Shot: "shotCount",
+    Storyboard: "storyboardCount",
+    Image: "imageCount",
+    Clip: "clipCount",
+}
+CONTENT_MODELS = (Beat, Shot, Storyboard)
+STAT_FIELDS = list(ContentStats.model_fields)
+
+
+def content_bytes(content: Optional[str]) -> int:
+    return len(content.encode("utf-8")) if content else 0
+
+
+def doc_delta(doc: Any, sign: int = 1) -> Dict[str, int]:
+    """Stats delta for inserting (sign=1) or deleting (sign=-1) one document."""
+    delta = {COUNT_FIELD[type(doc)]: sign}
+    if isinstance(doc, CONTENT_MODELS):
+        # contentSize is set whenever content was encoded – avoids decompressing
+        size = doc.contentSize if doc.contentSize is not None else content_bytes(doc.content)
+        delta["contentBytes"] = sign * size
+    return delta
+
+
+def stats_delta(stats: ContentStats, sign: int = -1) -> Dict[str, int]:
+    """Delta that removes (sign=-1) a whole subtree's stats from its ancestors."""
+    return {k: sign * v for k, v in stats.model_dump().items()}
+
+
+def add_deltas(*deltas: Dict[str, int]) -> Dict[str, int]:
+    total: Dict[str, int] = defaultdict(int)
+    for d in deltas:
+        for k, v in d.items():
+            total[k] += v
+    return dict(total)
+
+
+async def apply_delta(
+    delta: Dict[str, int],
+    *,
+    org_id: Optional[PydanticObjectId] = None,
+    project_id: Optional[PydanticObjectId] = None,
+    episode_id: Optional[PydanticObjectId] = None,
+    part_id: Optional[PydanticObjectId] = None,
+) -> None:
+    """$inc `delta` on every ancestor that is given (concurrently)."""
+    inc = {f"stats.{k}": v for k, v in delta.items() if v}
+    if not inc:
+        return
+    targets = [(Part, part_id), (Episode, episode_id), (Project, project_id), (Organization, org_id)]
+    await gather_bounded(*(
+        model.get_motor_collection().update_one({"_id": oid}, {"$inc": inc})
+        for model, oid in targets if oid is not None
+    ))
+
+
+async def apply_doc_delta(doc: Any, sign: int = 1) -> None:
+    """Shortcut for a single Beat/Shot/Storyboard/Image/Clip insert or delete.
+    Project-level images (no partId) are not part of the rollup."""
+    if getattr(doc, "partId", None) is None:
+        return
+    await apply_delta(
+        doc_delta(doc, sign),
+        org_id=doc.organizationId, project_id=doc.projectId,
+        episode_id=doc.episodeId, part_id=doc.partId,
+    )
+
+
+# ── Reconcile ────────────────────────────────────────────────
+
+async def _part_stats(match: dict) -> Dict[PydanticObjectId, Dict[str, int]]:
+    """{partId: stats dict} computed from the content collections."""
+    async def _group(model):
+        group: Dict[str, Any] = {"_id": "$partId", "n": {"$sum": 1}}
+        if model in CONTENT_MODELS:
+            # Compressed / native / blob content: its decoded size is kept in contentSize
+            group["bytes"] = {"$sum": {"$cond": [
+                {"$eq": [{"$type": "$content"}, "string"]},
+                {"$strLenBytes": "$content"},
+                {"$ifNull": ["$contentSize", 0]},
+            ]}}
+        return model, await model.aggregate([{"$match": {**match, "partId": {"$ne": None}}}, {"$group": group}]).to_list()
+
+    results = await gather_bounded(*(_group(m) for m in COUNT_FIELD))
+    stats: Dict[PydanticObjectId, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+    for model, rows in results:
+        for row in rows:
+            s = stats[row["_id"]]
+            s[COUNT_FIELD[model]] = row["n"]
+            s["contentBytes"] += row.get("bytes", 0)
+    return stats
+
+
+async def _rollup(child, parent, key: str, match: dict) -> None:
+    """Sum child.stats into parent.stats grouped by child[key]."""
+    group = {"_id": f"${key}", **{f: {"$sum": f"$stats.{f}"} for f in STAT_FIELDS}}
+    rows = await child.get_motor_collection().aggregate([{"$match": match}, {"$group": group}]).to_list(None)
+    ops = [
+        UpdateOne({"_id": row["_id"]}, {"$set": {f"stats.{f}": row[f] for f in STAT_FIELDS}})
+        for row in rows if row["_id"] is not None
+    ]
+    if ops:
+        await parent.get_motor_collection().bulk_write(ops, ordered=False)
+
+
+async def reconcile_stats(project_id: Optional[PydanticObjectId] = None) -> Dict[str, int]:
+    """Recompute stats for every part (or one project's parts) and roll up.
+
+    Parts/episodes/projects with no children are reset to zero first so the
+    $group results only have to $set non-empty nodes.
+    """
+    match = {"projectId": project_id} if project_id else {}
+    zero = {"$set": {"stats": ContentStats().model_dump()}}
+    await gather_bounded(
+        Part.get_motor_collection().update_many(match, zero),
+        Episode.get_motor_collection().update_many(match, zero),
+    )
+
+    part_stats = await _part_stats(match)
+    ops = [
+        UpdateOne({"_id": pid}, {"$set": {f"stats.{f}": s[f] for f in STAT_FIELDS}})
+        for pid, s in part_stats.items()
+    ]
+    if ops:
+        await Part.get_motor_collection().bulk_write(ops, ordered=False)
+
+    await _rollup(Part, Episode, "episodeId", match)
+
+    if project_id:
+        await Project.get_motor_collection().update_one({"_id": project_id}, zero)
+        await _rollup(Episode, Project, "projectId", {"projectId": project_id})
+        proj = await Project.get(project_id)
+        if proj:
+            await Organization.get_motor_collection().update_one({"_id": proj.organizationId}, zero)
+            await _rollup(Project, Organization, "organizationId", {"organizationId": proj.organizationId})
+    else:
+        await gather_bounded(
+            Project.get_motor_collection().update_many({}, zero),
+            Organization.get_motor_collection().update_many({}, zero),
+        )
+        await _rollup(Episode, Project, "projectId", {})
+        await _rollup(Project, Organization, "organizationId", {})
+
+    return {"parts": len(part_stats)}
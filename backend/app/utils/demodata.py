@@ -0,0 +1,235 @@
+"""Cached manifest of the demodata/ tree used to seed new parts.
+
+The folder scans and version JSON files are read once (at startup, in a
+worker thread) into an in-memory `Manifest`, which is also persisted as a
+small index file so restarts don't rescan. Freshness is decided by the
+mtimes of every directory (entries added/removed) and of the JSON files
+(content edits); when they change the manifest is rebuilt. Request handlers
+only ever read the in-memory copy.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEMODATA_DIR = Path(__file__).resolve().parent.parent.parent.parent / "demodata"
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+VIDEO_EXTS = {".mp4", ".mov", ".avi", ".mkv", ".webm"}
+MANIFEST_VERSION = 1
+
+
+class Manifest(BaseModel):
+    version: int = MANIFEST_VERSION
+    root: str = ""
+    # rel path -> mtime_ns for every directory and every *.json file
+    signature: Dict[str, int] = Field(default_factory=dict)
+    shot_folders: Dict[str, Dict[str, List[str]]] = Field(default_factory=dict)
+    character_folders: Dict[str, List[str]] = Field(default_factory=dict)
+    location_folders: Dict[str, List[str]] = Field(default_factory=dict)
+    extras_folders: Dict[str, List[str]] = Field(default_factory=dict)
+    json_files: Dict[str, Any] = Field(default_factory=dict)
+    # rel path -> size in bytes for every file
+    files: Dict[str, int] = Field(default_factory=dict)
+
+    @property
+    def file_count(self) -> int:
+        return len(self.files)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.files.values())
+
+    def load_json(self, filename: str) -> dict:
+        try:
+            return self.json_files[filename]
+        except KeyError:
+            raise FileNotFoundError(f"{filename} not in demodata manifest") from None
+
+
+# ── Scanning (blocking – run in a worker thread) ────────────
+
+def _images_in(d: Path) -> List[str]:
+    return [f.name for f in sorted(d.iterdir()) if f.is_file() and f.suffix.lower() in IMAGE_EXTS]
+
+
+def _scan_shot_folders(root: Path) -> Dict[str, Dict[str, List[str]]]:
+    result = {}
+    for entry in sorted(root.iterdir()):
+        if entry.is_dir() and entry.name.startswith("Shot_"):
+            images, clips = [], []
+            for f in sorted(entry.iterdir()):
+                if f.is_file():
+                    ext = f.suffix.lower()
+                    if ext in IMAGE_EXTS:
+                        images.append(f.name)
+                    elif ext in VIDEO_EXTS:
+                        clips.append(f.name)
+            result[entry.name] = {"images": images, "clips": clips}
+    return result
+
+
+def _scan_character_folders(root: Path) -> Dict[str, List[str]]:
+    chars_dir = root / "Characters"
+    if not chars_dir.is_dir():
+        return {}
+    result = {}
+    for char_dir in sorted(chars_dir.iterdir()):
+        if not char_dir.is_dir():
+            continue
+        char_name = char_dir.name
+        sub_dirs = [d for d in char_dir.iterdir() if d.is_dir()]
+        for sub in sorted(sub_dirs):
+            imgs = _images_in(sub)
+            if imgs:
+                result[f"{char_name}/{sub.name}"] = imgs
+        loose = _images_in(char_dir)
+        if loose:
+            result[char_name] = loose
+    return result
+
+
+def _scan_location_folders(root: Path) -> Dict[str, List[str]]:
+    loc_dir = root / "Rajmahal_Location"
+    if not loc_dir.is_dir():
+        return {}
+    result = {}
+    for sub in sorted(loc_dir.iterdir()):
+        if sub.is_dir():
+            imgs = _images_in(sub)
+            if imgs:
+                result[sub.name] = imgs
+    # Also grab root-level images
+    root_imgs = _images_in(loc_dir)
+    if root_imgs:
+        result["_root"] = root_imgs
+    return result
+
+
+def _scan_extras_folders(root: Path) -> Dict[str, List[str]]:
+    extras_dir = root / "Extras"
+    if not extras_dir.is_dir():
+        return {}
+    result = {}
+    for sub in sorted(extras_dir.iterdir()):
+        if sub.is_dir():
+            imgs = _images_in(sub)
+            if imgs:
+                result[sub.name] = imgs
+    return result
+
+
+def _signature(root: Path) -> Dict[str, int]:
+    """mtimes of every directory plus every top-level JSON file."""
+    sig = {}
+    for dirpath, _dirnames, filenames in os.walk(root):
+        rel = os.path.relpath(dirpath, root)
+        sig[rel] = os.stat(dirpath).st_mtime_ns
+        if dirpath == str(root):
+            for fn in filenames:
+                if fn.endswith(".json"):
+                    sig[fn] = os.stat(os.path.join(dirpath, fn)).st_mtime_ns
+    return sig
+
+
+def build_manifest(root: Path = DEMODATA_DIR) -> Manifest:
+    if not root.is_dir():
+        return Manifest(root=str(root))
+    files = {}
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for fn in filenames:
+            full = os.path.join(dirpath, fn)
+            files[os.path.relpath(full, root)] = os.stat(full).st_size
+    json_files = {}
+    for f in sorted(root.glob("*.json")):
+        with open(f, "r", encoding="utf-8") as fh:
+            json_files[f.name] = json.load(fh)
+    return Manifest(
+        root=str(root),
+        signature=_signature(root),
+        shot_folders=_scan_shot_folders(root),
+        character_folders=_scan_character_folders(root),
+        location_folders=_scan_location_folders(root),
+        extras_folders=_scan_extras_folders(root),
+        json_files=json_files,
+        files=files,
+    )
+
+
+def _index_path() -> Path:
+    return Path(settings.DEMODATA_MANIFEST_PATH)
+
+
+def _read_index() -> Optional[Manifest]:
+    try:
+        return Manifest.model_validate_json(_index_path().read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_index(m: Manifest) -> None:
+    path = _index_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(m.model_dump_json(), encoding="utf-8")
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning("Could not persist demodata manifest to %s: %s", path, e)
+
+
+def _is_fresh(m: Optional[Manifest], root: Path) -> bool:
+    if m is None or m.version != MANIFEST_VERSION or m.root != str(root):
+        return False
+    if not root.is_dir():
+        return not m.signature
+    return m.signature == _signature(root)
+
+
+def _load_or_rebuild(current: Optional[Manifest], root: Path) -> Manifest:
+    """Blocking: reuse `current` or the persisted index if still fresh,
+    otherwise rescan and persist."""
+    if _is_fresh(current, root):
+        return current
+    persisted = _read_index()
+    if _is_fresh(persisted, root):
+        return persisted
+    m = build_manifest(root)
+    _write_index(m)
+    logger.info("Demodata manifest rebuilt: %d files, %d bytes", m.file_count, m.total_bytes)
+    return m
+
+
+# ── Async access ─────────────────────────────────────────────
+
+_manifest: Optional[Manifest] = None
+_checked_at: float = 0.0
+_lock: Optional[asyncio.Lock] = None
+
+
+async def load_manifest(force: bool = False) -> Manifest:
+    """(Re)load the manifest in a worker thread. Called at startup."""
+    global _manifest, _checked_at, _lock
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        current = None if force else _manifest
+        _manifest = await asyncio.to_thread(_load_or_rebuild, current, DEMODATA_DIR)
+        _checked_at = time.monotonic()
+        return _manifest
+
+
+async def get_manifest() -> Manifest:
+    """The in-memory manifest; its mtimes are re-checked (off the event loop)
+    at most every DEMODATA_RECHECK_SECONDS."""
+    if _manifest is None or time.monotonic() - _checked_at > settings.DEMODATA_RECHECK_SECONDS:
+        return await load_manifest()
+    return _manifest
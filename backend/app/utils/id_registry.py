@@ -0,0 +1,116 @@
+"""Typed ID registry: which collection does a content/media ID live in?
+
+Every Beat/Shot/Storyboard/Image/Clip gets a `content_refs` entry with the
+same _id when it is inserted, fronted by an in-memory LRU (IDs never change
+type, so entries never go stale). `lookup` then needs one read of the owning
+collection on an LRU hit, or two on a miss – instead of probing up to three
+collections. Documents created before the registry existed are found by
+probing once and back-filled.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.core.config import settings
+from app.models.beat import Beat
+from app.models.shot import Shot
+from app.models.storyboard import Storyboard
+from app.models.media import Image, Clip
+from app.models.content_ref import ContentRef
+from app.utils.cache import TTLCache
+
+KIND_MODELS: Dict[str, Any] = {
+    "beat": Beat,
+    "shot": Shot,
+    "storyboard": Storyboard,
+    "image": Image,
+    "clip": Clip,
+}
+MODEL_KINDS = {model: kind for kind, model in KIND_MODELS.items()}
+
+DUPLICATE_KEY = 11000
+
+_kinds: TTLCache[PydanticObjectId, str] = TTLCache("id_registry", settings.ID_REGISTRY_CACHE_SIZE)
+
+
+def _ref(doc: Any) -> ContentRef:
+    return ContentRef(
+        id=doc.id, kind=MODEL_KINDS[type(doc)],
+        projectId=doc.projectId, partId=getattr(doc, "partId", None),
+    )
+
+
+async def register(doc: Any) -> None:
+    """Record a freshly inserted content/media document."""
+    ref = _ref(doc)
+    _kinds.set(ref.id, ref.kind)
+    try:
+        await ref.insert()
+    except DuplicateKeyError:
+        pass
+
+
+async def register_many(docs: Iterable[Any]) -> None:
+    """Record freshly inserted documents (their IDs must be set)."""
+    refs = [_ref(d) for d in docs]
+    if not refs:
+        return
+    for ref in refs:
+        _kinds.set(ref.id, ref.kind)
+    try:
+        await ContentRef.insert_many(refs, ordered=False)
+    except BulkWriteError as e:
+        # Already-registered IDs are fine; anything else is a real failure
+        if any(err["code"] != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+            raise
+
+
+async def unregister(oid: PydanticObjectId) -> None:
+    _kinds.pop(oid)
+    await ContentRef.get_motor_collection().delete_one({"_id": oid})
+
+
+async def unregister_parts(part_ids: List[PydanticObjectId]) -> None:
+    """Cascade helper; LRU entries for deleted IDs are harmless and age out."""
+    await ContentRef.get_motor_collection().delete_many({"partId": {"$in": part_ids}})
+
+
+async def unregister_project(project_id: PydanticObjectId) -> None:
+    await ContentRef.get_motor_collection().delete_many({"projectId": project_id})
+
+
+async def resolve_kind(oid: PydanticObjectId) -> Optional[str]:
+    kind = _kinds.get(oid)
+    if kind is None:
+        ref = await ContentRef.get(oid)
+        if ref:
+            kind = ref.kind
+            _kinds.set(oid, kind)
+    return kind
+
+
+async def lookup(
+    oid: PydanticObjectId,
+    kinds: Sequence[str],
+    hint: Optional[str] = None,
+) -> Tuple[Optional[Any], Optional[str]]:
+    """Fetch the document with this ID from whichever of `kinds` owns it.
+
+    `hint` (e.g. from a `?type=` query param) skips resolution entirely.
+    Returns (None, None) if not found.
+    """
+    kind = hint or await resolve_kind(oid)
+    if kind is not None:
+        if kind not in kinds:
+            return None, None
+        doc = await KIND_MODELS[kind].get(oid)
+        return (doc, kind) if doc else (None, None)
+
+    # Legacy document without a registry entry: probe, then back-fill
+    for kind in kinds:
+        doc = await KIND_MODELS[kind].get(oid)
+        if doc:
+            await register(doc)
+            return doc, kind
+    return None, None
@@ -0,0 +1,152 @@
+"""In-process background job runner.
+
+Long-running work (large cascade deletes, part seeding) is submitted here
+instead of being awaited inside the request. At most
+`BACKGROUND_JOB_CONCURRENCY` jobs run at once per process; the rest queue on
+the semaphore. Job state lives in memory (bounded), so `GET /jobs/{id}` is
+answered by the worker process that accepted the job.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised by submit() when a job kind already has `max_pending` jobs queued/running."""
+
+
+class Job(BaseModel):
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    kind: str
+    status: str = "pending"  # pending | running | done | failed (also when cancelled)
+    progress: int = 0
+    total: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    meta: Dict[str, Any] = Field(default_factory=dict)
+
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    startedAt: Optional[datetime] = None
+    finishedAt: Optional[datetime] = None
+
+    def step(self, n: int = 1) -> None:
+        self.progress += n
+
+
+class JobAccepted(BaseModel):
+    """Body of a 202 response for work handed to a background job (poll GET /jobs/{jobId})."""
+    jobId: str
+    status: str
+
+
+# `responses=` for routes that may answer 202 with a job handle instead of their usual status
+JOB_ACCEPTED_RESPONSES: Dict[int, Dict[str, Any]] = {
+    202: {"model": JobAccepted, "description": "Large tree: deletion continues in a background job"},
+}
+
+
+JobFn = Callable[[Job], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class JobRunner:
+    def __init__(self, concurrency: int, keep: int = 500):
+        self._concurrency = concurrency
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}  # by job id, until the task ends
+        self._keep = keep
+
+    def submit(self, kind: str, fn: JobFn, max_pending: Optional[int] = None, **meta: Any) -> Job:
+        """Schedule `fn(job)` on the running loop and return the job handle.
+
+        With `max_pending`, refuses (JobQueueFull) once that many jobs of the
+        same kind are already queued or running, so bursts can't pile up work.
+        """
+        if max_pending is not None and self.pending_of(kind) >= max_pending:
+            raise JobQueueFull(kind)
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self._concurrency)
+        job = Job(kind=kind, meta=meta)
+        self._jobs[job.id] = job
+        self._evict()
+        task = asyncio.create_task(self._run(job, fn), name=f"job:{kind}:{job.id}")
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _, jid=job.id: self._tasks.pop(jid, None))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def find(self, kind: str, **meta: Any) -> Optional[Job]:
+        """Most recent job of `kind` whose meta matches all given values."""
+        for job in reversed(self._jobs.values()):
+            if job.kind == kind and all(job.meta.get(k) == v for k, v in meta.items()):
+                return job
+        return None
+
+    def cancel_pending(self, kind: str, **meta: Any) -> int:
+        """Cancel queued jobs of `kind` whose meta matches, before they start.
+        Running jobs are left alone. Returns the number cancelled."""
+        cancelled = 0
+        for job in self._jobs.values():
+            if job.kind != kind or job.status != "pending" or any(job.meta.get(k) != v for k, v in meta.items()):
+                continue
+            task = self._tasks.get(job.id)
+            if task is not None:
+                task.cancel()
+            job.status = "failed"
+            job.error = "Cancelled"
+            job.finishedAt = datetime.utcnow()
+            cancelled += 1
+        return cancelled
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def pending_of(self, kind: str) -> int:
+        return sum(1 for j in self._jobs.values() if j.kind == kind and j.status in ("pending", "running"))
+
+    async def _run(self, job: Job, fn: JobFn) -> None:
+        async with self._sem:
+            job.status = "running"
+            job.startedAt = datetime.utcnow()
+            try:
+                job.result = await fn(job)
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+                logger.exception("Background job %s (%s) failed", job.id, job.kind)
+            finally:
+                job.finishedAt = datetime.utcnow()
+
+    def _evict(self) -> None:
+        # Drop the oldest finished jobs once we hold more than `keep`
+        if len(self._jobs) <= self._keep:
+            return
+        for jid in list(self._jobs):
+            if len(self._jobs) <= self._keep:
+                break
+            if self._jobs[jid].status in ("done", "failed"):
+                del self._jobs[jid]
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Give in-flight jobs a chance to finish, then cancel the rest."""
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(set(self._tasks.values()), timeout=timeout)
+        for t in pending:
+            t.cancel()
+
+
+jobs = JobRunner(settings.BACKGROUND_JOB_CONCURRENCY)
@@ -0,0 +1,193 @@
+"""Minimal RFC 6902 (JSON Patch) and RFC 7396 (JSON Merge Patch) support,
+plus a structural diff that produces RFC 6902 patches.
+
+Used by `PATCH /content/{id}` so editors can send a few operations instead of
+re-uploading a whole content document. Patches are applied to a deep copy, so
+a failing operation leaves the input untouched (the patch is all-or-nothing).
+"""
+import copy
+from typing import Any, Dict, List, Tuple
+
+
+class JsonPatchError(ValueError):
+    """Invalid patch document or an operation that cannot be applied."""
+
+
+# ── JSON Pointer (RFC 6901) ──────────────────────────────────
+
+def _parse_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer '{pointer}'")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _array_index(arr: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(arr)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise JsonPatchError(f"Invalid array index '{token}'")
+    idx = int(token)
+    if idx > len(arr) or (idx == len(arr) and not allow_end):
+        raise JsonPatchError(f"Array index {idx} out of range")
+    return idx
+
+
+def _child(node: Any, token: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise JsonPatchError(f"Member '{token}' not found")
+        return node[token]
+    if isinstance(node, list):
+        return node[_array_index(node, token)]
+    raise JsonPatchError(f"Cannot descend into a scalar at '{token}'")
+
+
+def _resolve(doc: Any, pointer: str) -> Any:
+    for token in _parse_pointer(pointer):
+        doc = _child(doc, token)
+    return doc
+
+
+def _parent(doc: Any, pointer: str) -> Tuple[Any, str]:
+    tokens = _parse_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("Operation not allowed on the document root")
+    node = doc
+    for token in tokens[:-1]:
+        node = _child(node, token)
+    if not isinstance(node, (dict, list)):
+        raise JsonPatchError(f"Parent of '{pointer}' is not a container")
+    return node, tokens[-1]
+
+
+# ── Operations ───────────────────────────────────────────────
+
+def _add(doc: Any, path: str, value: Any) -> Any:
+    if path == "":
+        return value
+    parent, key = _parent(doc, path)
+    if isinstance(parent, list):
+        parent.insert(_array_index(parent, key, allow_end=True), value)
+    else:
+        parent[key] = value
+    return doc
+
+
+def _remove(doc: Any, path: str) -> Tuple[Any, Any]:
+    parent, key = _parent(doc, path)
+    if isinstance(parent, list):
+        return doc, parent.pop(_array_index(parent, key))
+    if key not in parent:
+        raise JsonPatchError(f"Member '{key}' not found")
+    return doc, parent.pop(key)
+
+
+def _replace(doc: Any, path: str, value: Any) -> Any:
+    if path == "":
+        return value
+    parent, key = _parent(doc, path)
+    if isinstance(parent, list):
+        parent[_array_index(parent, key)] = value
+    else:
+        if key not in parent:
+            raise JsonPatchError(f"Member '{key}' not found")
+        parent[key] = value
+    return doc
+
+
+def _op_field(op: Dict[str, Any], name: str) -> Any:
+    if name not in op:
+        raise JsonPatchError(f"Operation '{op.get('op')}' requires '{name}'")
+    return op[name]
+
+
+def apply_patch(doc: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply an RFC 6902 patch and return the new document."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if not isinstance(op, dict):
+            raise JsonPatchError("Each operation must be an object")
+        name = op.get("op")
+        path = _op_field(op, "path")
+        if not isinstance(path, str):
+            raise JsonPatchError("'path' must be a string")
+        if name == "add":
+            doc = _add(doc, path, copy.deepcopy(_op_field(op, "value")))
+        elif name == "remove":
+            doc, _ = _remove(doc, path)
+        elif name == "replace":
+            doc = _replace(doc, path, copy.deepcopy(_op_field(op, "value")))
+        elif name == "move":
+            src = _op_field(op, "from")
+            if path == src:
+                continue
+            if path.startswith(src + "/"):
+                raise JsonPatchError("Cannot move a value into one of its children")
+            doc, value = _remove(doc, src)
+            doc = _add(doc, path, value)
+        elif name == "copy":
+            value = copy.deepcopy(_resolve(doc, _op_field(op, "from")))
+            doc = _add(doc, path, value)
+        elif name == "test":
+            if _resolve(doc, path) != _op_field(op, "value"):
+                raise JsonPatchError(f"Test failed at '{path}'")
+        else:
+            raise JsonPatchError(f"Unknown operation '{name}'")
+    return doc
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7396 merge patch and return the result."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = copy.deepcopy(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+# ── Diff ─────────────────────────────────────────────────────
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def diff(src: Any, dst: Any, path: str = "") -> List[Dict[str, Any]]:
+    """RFC 6902 patch turning `src` into `dst`.
+
+    Objects are diffed per member and arrays per index (trailing items are
+    added / removed), which keeps edits inside existing items small. No
+    move/copy detection.
+    """
+    if type(src) is not type(dst):
+        return [{"op": "replace", "path": path, "value": copy.deepcopy(dst)}]
+    if isinstance(src, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in src:
+            if key not in dst:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in dst.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in src:
+                ops.append({"op": "add", "path": child, "value": copy.deepcopy(value)})
+            else:
+                ops.extend(diff(src[key], value, child))
+        return ops
+    if isinstance(src, list):
+        ops = []
+        common = min(len(src), len(dst))
+        for i in range(common):
+            ops.extend(diff(src[i], dst[i], f"{path}/{i}"))
+        for i in range(common, len(dst)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": copy.deepcopy(dst[i])})
+        for i in range(len(src) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        return ops
+    if src != dst:
+        return [{"op": "replace", "path": path, "value": dst}]
+    return []
@@ -0,0 +1,95 @@
+"""Organization membership queries and the cached org payload.
+
+Membership is the indexed `User.organizationId` field (a user belongs to at
+most one org), so members are read with one query on the
+(organizationId, _id) index – projected to the public fields – instead of a
+`User.get` per entry of an unbounded `memberIds` array.
+
+The org payload returned by `/auth/me`, login and the org endpoints is cached
+per org and invalidated (this process) whenever membership or a member's
+profile changes; other workers converge within ORG_PAYLOAD_CACHE_TTL_SECONDS.
+"""
+from typing import Any, Dict, List, Optional
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.models.organization import Organization
+from app.models.user import User
+from app.utils.aio import gather_bounded
+from app.utils.cache import TTLCache
+
+_payloads: TTLCache[str, dict] = TTLCache(
+    "org.payloads", settings.ORG_PAYLOAD_CACHE_SIZE, ttl=settings.ORG_PAYLOAD_CACHE_TTL_SECONDS,
+)
+
+
+class MemberView(BaseModel):
+    """Projection of the User fields exposed as an org member."""
+    id: PydanticObjectId = Field(alias="_id")
+    email: str
+    name: str
+    avatarUrl: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": str(self.id), "email": self.email, "name": self.name, "avatarUrl": self.avatarUrl}
+
+
+def invalidate_org(org_id) -> None:
+    if org_id is not None:
+        _payloads.pop(str(org_id))
+
+
+async def list_members(
+    org_id: PydanticObjectId, skip: int = 0, limit: Optional[int] = None,
+) -> List[MemberView]:
+    """Members of an org in join order (one indexed, projected query)."""
+    q = User.find(User.organizationId == org_id).sort("+_id").skip(skip)
+    if limit is not None:
+        q = q.limit(limit)
+    return await q.project(MemberView).to_list()
+
+
+async def count_members(org_id: PydanticObjectId) -> int:
+    return await User.find(User.organizationId == org_id).count()
+
+
+async def org_payload(org_id: PydanticObjectId) -> Optional[dict]:
+    """{id, name, created_at, members} for an org, or None if it doesn't exist.
+
+    Cached – callers must treat the returned dict as read-only.
+    """
+    key = str(org_id)
+    payload = _payloads.get(key)
+    if payload is not None:
+        return payload
+    org, members = await gather_bounded(Organization.get(org_id), list_members(org_id))
+    if not org:
+        return None
+    payload = {
+        "id": key, "name": org.name, "created_at": org.createdAt.isoformat(),
+        "members": [m.to_dict() for m in members],
+    }
+    _payloads.set(key, payload)
+    return payload
+
+
+async def add_members(org_id: PydanticObjectId, user_ids: List[PydanticObjectId]) -> List[PydanticObjectId]:
+    """Attach users that are not in any org yet; returns those now in `org_id`.
+
+    The `organizationId: None` guard makes this safe against a concurrent add
+    to another org – whoever writes first wins.
+    """
+    if not user_ids:
+        return []
+    coll = User.get_motor_collection()
+    await coll.update_many(
+        {"_id": {"$in": user_ids}, "organizationId": None},
+        {"$set": {"organizationId": org_id}},
+    )
+    added = [
+        d["_id"] async for d in coll.find({"_id": {"$in": user_ids}, "organizationId": org_id}, {"_id": 1})
+    ]
+    invalidate_org(org_id)
+    return added
@@ -0,0 +1,56 @@
+"""Project / episode overview trees with per-part content counts.
+
+Shared by /projects/{id}/full and the legacy /combined overview endpoints.
+Counts come from the materialized `stats` on each Part/Episode (see
+app.utils.counters), so building the tree is three indexed finds regardless
+of how much content the project holds.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+
+from app.models.project import Project
+from app.models.episode import Episode
+from app.models.part import Part
+from app.utils.aio import gather_bounded
+
+
+def part_summary(p: Part) -> dict:
+    return {
+        "id": str(p.id), "title": p.title, "partNumber": p.partNumber,
+        "episodeId": str(p.episodeId), "projectId": str(p.projectId),
+        "scriptText": p.scriptText,
+        **p.stats.model_dump(),
+    }
+
+
+def episode_summary(ep: Episode, parts: List[Part]) -> dict:
+    return {
+        "id": str(ep.id), "projectId": str(ep.projectId),
+        "episodeNumber": ep.episodeNumber, "bibleText": ep.bibleText,
+        "stats": ep.stats.model_dump(),
+        "parts": [part_summary(p) for p in parts],
+        "createdAt": ep.createdAt.isoformat(), "updatedAt": ep.updatedAt.isoformat(),
+    }
+
+
+async def project_tree(project_id: PydanticObjectId) -> Tuple[Optional[Project], List[dict]]:
+    """Project + episode summaries (with parts and counts) in one concurrent wave."""
+    proj, episodes, parts = await gather_bounded(
+        Project.get(project_id),
+        Episode.find(Episode.projectId == project_id).sort("+episodeNumber").to_list(),
+        Part.find(Part.projectId == project_id).sort("+partNumber").to_list(),
+    )
+    if not proj:
+        return None, []
+    parts_by_ep: Dict[PydanticObjectId, List[Part]] = defaultdict(list)
+    for p in parts:
+        parts_by_ep[p.episodeId].append(p)
+    return proj, [episode_summary(ep, parts_by_ep.get(ep.id, [])) for ep in episodes]
+
+
+async def episode_parts(episode_id: PydanticObjectId) -> List[dict]:
+    """Part summaries (with counts) for a single episode."""
+    parts = await Part.find(Part.episodeId == episode_id).sort("+partNumber").to_list()
+    return [part_summary(p) for p in parts]
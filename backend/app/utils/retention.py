@@ -0,0 +1,252 @@
+"""Version retention: move old unselected versions to `archived_versions`.
+
+Policy, per part and type (images per shot & category, clips per shot):
+keep the selected version(s) plus the VERSION_RETENTION_KEEP newest by
+versionNo. Everything older that is unselected, not referenced by a
+per-item pick (app/utils/selections.py) or an asset's `imageIds`, and
+untouched for VERSION_RETENTION_MIN_AGE_SECONDS is archived. Images and
+clips without a shot aren't versions of one another and are never archived.
+
+A sweep is idempotent and batched. Each batch upserts the archive entries,
+then deletes the originals one by one, guarded on `updatedAt` and the
+selected flag. A version edited or selected in between stays hot and its
+archive entry is dropped again. Blob references and rollup counters move
+with the documents. Studio and `/full` reads never touch the archive.
+`restore` puts a version back under its original ID.
+"""
+import asyncio
+import logging
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import bson
+from beanie import PydanticObjectId
+from pymongo import ReplaceOne
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.models.archived_version import ArchivedVersion
+from app.models.content_codec import CODEC_ZLIB, decode_text
+from app.models.content_selection import ContentSelection
+from app.models.media import Image, Clip
+from app.models.character import Character
+from app.models.location import Location
+from app.models.prop import Prop
+from app.utils import blobs
+from app.utils.aio import gather_bounded
+from app.utils.counters import COUNT_FIELD, CONTENT_MODELS, add_deltas, apply_delta
+from app.utils.id_registry import KIND_MODELS, MODEL_KINDS
+from app.utils.jobs import Job, JobQueueFull, jobs
+
+logger = logging.getLogger(__name__)
+
+# Fields that group versions of the same thing
+GROUP_FIELDS = {model: ("partId",) for model in CONTENT_MODELS}
+GROUP_FIELDS[Image] = ("partId", "shotId", "category")
+GROUP_FIELDS[Clip] = ("partId", "shotId")
+
+
+def _archive():
+    return ArchivedVersion.get_motor_collection()
+
+
+def _pack(raw: dict) -> Tuple[bytes, int]:
+    """(stored payload, uncompressed BSON size)."""
+    encoded = bson.encode(raw)
+    return CODEC_ZLIB + zlib.compress(encoded, settings.CONTENT_COMPRESS_LEVEL), len(encoded)
+
+
+def _unpack(payload: bytes) -> dict:
+    if payload[:1] != CODEC_ZLIB:
+        raise ValueError(f"Unknown archive codec {payload[:1]!r}")
+    return bson.decode(zlib.decompress(payload[1:]))
+
+
+def _raw_delta(model, raw: dict, sign: int) -> Dict[str, int]:
+    """Rollup delta for one raw document (see counters.doc_delta)."""
+    delta = {COUNT_FIELD[model]: sign}
+    if model in CONTENT_MODELS:
+        size = raw.get("contentSize")
+        if size is None:
+            content = raw.get("content")
+            size = len(decode_text(content).encode("utf-8")) if isinstance(content, (str, bytes)) else 0
+        delta["contentBytes"] = sign * size
+    return delta
+
+
+async def _apply_raw_delta(raw: dict, delta: Dict[str, int]) -> None:
+    await apply_delta(
+        delta, org_id=raw.get("organizationId"), project_id=raw.get("projectId"),
+        episode_id=raw.get("episodeId"), part_id=raw.get("partId"),
+    )
+
+
+# ── Sweep ────────────────────────────────────────────────────
+
+async def _picked(kind: str, part_id: PydanticObjectId) -> set:
+    """Version IDs referenced by per-item picks of the part."""
+    if kind not in ("beat", "shot", "storyboard"):
+        return set()
+    sel = await ContentSelection.get_motor_collection().find_one({"partId": part_id, "type": kind}, {"items": 1})
+    return set(((sel or {}).get("items") or {}).values())
+
+
+async def _asset_images(image_ids: List[PydanticObjectId]) -> set:
+    """Those of `image_ids` that a character, location or prop links to."""
+    rows = await gather_bounded(*(
+        m.get_motor_collection().find({"imageIds": {"$in": image_ids}}, {"imageIds": 1}).to_list(None)
+        for m in (Character, Location, Prop)
+    ))
+    return {i for found in rows for r in found for i in r.get("imageIds") or ()} & set(image_ids)
+
+
+async def _victims(model, group: dict, keep: int, cutoff: datetime) -> List[PydanticObjectId]:
+    if "shotId" in group and group["shotId"] is None:
+        return []  # media not attached to a shot: unrelated files, not versions
+    versions = await model.get_motor_collection().find(
+        group, {"metadata.selected": 1, "updatedAt": 1},
+    ).sort([("metadata.versionNo", -1), ("createdAt", -1)]).to_list(None)
+    picked = await _picked(MODEL_KINDS[model], group["partId"])
+    victims = [
+        v["_id"] for v in versions[keep:]
+        if not (v.get("metadata") or {}).get("selected")
+        and v["_id"] not in picked
+        and (v.get("updatedAt") or cutoff) < cutoff
+    ]
+    if model is Image and victims:
+        linked = await _asset_images(victims)
+        victims = [v for v in victims if v not in linked]
+    return victims
+
+
+async def _archive_batch(model, ids: List[PydanticObjectId]) -> int:
+    """Archive one batch of versions of a single group; returns how many moved."""
+    coll = model.get_motor_collection()
+    kind = MODEL_KINDS[model]
+    raws = await coll.find({"_id": {"$in": ids}, "metadata.selected": {"$ne": True}}).to_list(None)
+    bodies = await blobs.load_texts({r["blobHash"] for r in raws if r.get("blobHash")})
+    entries: List[Tuple[dict, Optional[str]]] = []
+    ops = []
+    now = datetime.utcnow()
+    for raw in raws:
+        archived = dict(raw)
+        h = raw.get("blobHash")
+        if h:
+            if h not in bodies:
+                logger.error("Content blob %s missing for %s %s; not archiving", h, kind, raw["_id"])
+                continue
+            # The archive holds the body itself, not a blob reference
+            archived.update(content=bodies[h], blobHash=None, contentFormat=None)
+        payload, size = _pack(archived)
+        entries.append((raw, h))
+        ops.append(ReplaceOne(
+            {"_id": raw["_id"]},
+            {
+                "kind": kind, "projectId": raw["projectId"], "partId": raw["partId"],
+                "versionNo": (raw.get("metadata") or {}).get("versionNo", 0),
+                "payload": payload, "size": size, "archivedAt": now,
+            },
+            upsert=True,
+        ))
+    if not ops:
+        return 0
+    await _archive().bulk_write(ops, ordered=False)
+
+    async def drop(raw: dict) -> bool:
+        res = await coll.delete_one({
+            "_id": raw["_id"], "updatedAt": raw.get("updatedAt"), "metadata.selected": {"$ne": True},
+        })
+        return bool(res.deleted_count)
+
+    dropped = await gather_bounded(*(drop(raw) for raw, _ in entries))
+    moved = [(raw, h) for (raw, h), ok in zip(entries, dropped) if ok]
+    stayed = [raw["_id"] for (raw, _), ok in zip(entries, dropped) if not ok]
+    if stayed:  # changed meanwhile – keep the live copy only
+        await _archive().delete_many({"_id": {"$in": stayed}})
+    if moved:
+        await blobs.release_blobs(Counter(h for _, h in moved if h))
+        await _apply_raw_delta(moved[0][0], add_deltas(*(_raw_delta(model, raw, -1) for raw, _ in moved)))
+    return len(moved)
+
+
+async def sweep(job: Optional[Job] = None, part_ids: Optional[List[PydanticObjectId]] = None) -> Dict[str, int]:
+    """Apply the retention policy to every part (or just `part_ids`).
+    Returns {collection: versions archived}."""
+    keep = settings.VERSION_RETENTION_KEEP
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.VERSION_RETENTION_MIN_AGE_SECONDS)
+    batch = settings.VERSION_RETENTION_BATCH
+    if job:
+        job.total = len(GROUP_FIELDS)
+    archived: Dict[str, int] = {}
+    for model, fields in GROUP_FIELDS.items():
+        match: Dict[str, Any] = {"partId": {"$in": part_ids} if part_ids else {"$ne": None}}
+        groups = model.get_motor_collection().aggregate([
+            {"$match": match},
+            {"$group": {"_id": {f: {"$ifNull": [f"${f}", None]} for f in fields}, "n": {"$sum": 1}}},
+            {"$match": {"n": {"$gt": keep}}},
+        ])
+        n = 0
+        async for row in groups:
+            ids = await _victims(model, row["_id"], keep, cutoff)
+            for i in range(0, len(ids), batch):
+                n += await _archive_batch(model, ids[i:i + batch])
+        archived[model.Settings.name] = n
+        if job:
+            job.step()
+    if any(archived.values()):
+        logger.info("Retention sweep archived %s", archived)
+    return archived
+
+
+async def run_sweeper() -> None:
+    """Submit a sweep job every VERSION_RETENTION_INTERVAL_SECONDS (started
+    from main's lifespan; at most one sweep queued or running)."""
+    while True:
+        await asyncio.sleep(settings.VERSION_RETENTION_INTERVAL_SECONDS)
+        try:
+            jobs.submit("retention_sweep", sweep, max_pending=1)
+        except JobQueueFull:
+            pass
+
+
+# ── Archive reads / restore ──────────────────────────────────
+
+async def list_archived(part_id: PydanticObjectId) -> List[Dict[str, Any]]:
+    rows = await _archive().find(
+        {"partId": part_id}, {"payload": 0},
+    ).sort([("kind", 1), ("versionNo", -1)]).to_list(None)
+    return [
+        {
+            "id": str(r["_id"]), "type": r["kind"], "versionNo": r.get("versionNo"),
+            "size": r.get("size"), "archivedAt": r.get("archivedAt"),
+        }
+        for r in rows
+    ]
+
+
+async def restore(version_id: PydanticObjectId, part_id: PydanticObjectId) -> Optional[str]:
+    """Move an archived version back into its collection (unselected, with
+    `updatedAt` bumped so the next sweep leaves it alone for the min-age
+    period). Returns its type, or None if it isn't archived under the part."""
+    entry = await _archive().find_one({"_id": version_id, "partId": part_id})
+    if not entry:
+        return None
+    model = KIND_MODELS[entry["kind"]]
+    raw = _unpack(entry["payload"])
+    raw.setdefault("metadata", {})["selected"] = False
+    raw["updatedAt"] = datetime.utcnow()
+    h = None
+    if model in blobs.BLOB_MODELS and isinstance(raw.get("content"), (str, bytes)):
+        h = await blobs.put_blob(decode_text(raw["content"]))
+        raw.update(content=None, blobHash=h)
+    try:
+        await model.get_motor_collection().insert_one(raw)
+    except DuplicateKeyError:  # restored already (or never left after an interrupted sweep)
+        if h:
+            await blobs.release_blobs({h: 1})
+    else:
+        await _apply_raw_delta(raw, _raw_delta(model, raw, 1))
+    await _archive().delete_one({"_id": version_id})
+    return entry["kind"]
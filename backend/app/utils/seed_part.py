@@ -2,11 +2,33 @@
 Utility to populate a newly-created Part with demo data from the
 demodata/ directory (beats, shots, storyboards, images, clips, characters, locations, props).
 
-Called automatically from the create_part endpoint.
+Queued as a background job by the create_part endpoint (see
+`run_seed_job`); progress is recorded on Part.seedStatus. Folder listings and
+version JSON come from the cached demodata manifest (app.utils.demodata),
+so seeding does no disk I/O.
+
+Everything is built in memory first and written with one insert_many per
+collection. All IDs are assigned client-side (insert_many doesn't write
+them back onto the models), so characters / locations / props are linked
+to their reference images, and every document is registered in the ID
+registry, without reading anything back.
+
+Failures are recorded on the Part (seedStatus "failed" + seedError). If a
+write fails, what was already inserted is removed again, so the part is left
+empty rather than half-seeded. Seeds lost to a restart are marked failed by
+`fail_stale_seeds`; their partial writes stay, so delete such a part rather
+than reusing it.
+
+A part (or its episode / project) deleted while its seed runs is noticed
+before the counters are raised: the seed discards what it wrote and ends
+without a result. Project-level assets are written by exactly one seed per
+project, which claims them through Project.assetsSeeded.
 """
+import asyncio
 import json
-from pathlib import Path
+from collections import Counter
 from datetime import datetime, timedelta
+from typing import Any, List, Optional
 from beanie import PydanticObjectId
 
 from app.models.beat import Beat, BeatMetadata
@@ -16,89 +38,74 @@ from app.models.media import Image, Clip, MediaMetadata
 from app.models.character import Character, AssetScope
 from app.models.location import Location
 from app.models.prop import Prop
+from app.models.part import Part
+from app.models.episode import Episode
+from app.models.project import Project
+from app.models.content_codec import CompressedContent
+from app.models.content_blob import BlobContent
+from app.core.config import settings
+from app.utils.counters import apply_delta, content_bytes
+from app.utils.aio import gather_bounded
+from app.utils.demodata import get_manifest
+from app.utils.jobs import Job
+from app.utils import blobs, content_writes, id_registry
 
 STATIC_BASE = "http://localhost:8000/static"
-DEMODATA_DIR = Path(__file__).resolve().parent.parent.parent.parent / "demodata"
-IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
-VIDEO_EXTS = {".mp4", ".mov", ".avi", ".mkv", ".webm"}
-
-
-def _load_json(filename: str) -> dict:
-    with open(DEMODATA_DIR / filename, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def _scan_shot_folders() -> dict[str, dict[str, list[str]]]:
-    result = {}
-    for entry in sorted(DEMODATA_DIR.iterdir()):
-        if entry.is_dir() and entry.name.startswith("Shot_"):
-            images, clips = [], []
-            for f in sorted(entry.iterdir()):
-                if f.is_file():
-                    ext = f.suffix.lower()
-                    if ext in IMAGE_EXTS:
-                        images.append(f.name)
-                    elif ext in VIDEO_EXTS:
-                        clips.append(f.name)
-            result[entry.name] = {"images": images, "clips": clips}
-    return result
-
-
-def _scan_character_folders() -> dict[str, list[str]]:
-    chars_dir = DEMODATA_DIR / "Characters"
-    if not chars_dir.is_dir():
-        return {}
-    result = {}
-    for char_dir in sorted(chars_dir.iterdir()):
-        if not char_dir.is_dir():
-            continue
-        char_name = char_dir.name
-        sub_dirs = [d for d in char_dir.iterdir() if d.is_dir()]
-        if sub_dirs:
-            for sub in sorted(sub_dirs):
-                key = f"{char_name}/{sub.name}"
-                imgs = [f.name for f in sorted(sub.iterdir())
-                        if f.is_file() and f.suffix.lower() in IMAGE_EXTS]
-                if imgs:
-                    result[key] = imgs
-        loose = [f.name for f in sorted(char_dir.iterdir())
-                 if f.is_file() and f.suffix.lower() in IMAGE_EXTS]
-        if loose:
-            result[char_name] = loose
-    return result
-
-
-def _scan_location_folders() -> dict[str, list[str]]:
-    loc_dir = DEMODATA_DIR / "Rajmahal_Location"
-    if not loc_dir.is_dir():
-        return {}
-    result = {}
-    for sub in sorted(loc_dir.iterdir()):
-        if sub.is_dir():
-            imgs = [f.name for f in sorted(sub.iterdir())
-                    if f.is_file() and f.suffix.lower() in IMAGE_EXTS]
-            if imgs:
-                result[sub.name] = imgs
-    # Also grab root-level images
-    root_imgs = [f.name for f in sorted(loc_dir.iterdir())
-                 if f.is_file() and f.suffix.lower() in IMAGE_EXTS]
-    if root_imgs:
-        result["_root"] = root_imgs
-    return result
-
-
-def _scan_extras_folders() -> dict[str, list[str]]:
-    extras_dir = DEMODATA_DIR / "Extras"
-    if not extras_dir.is_dir():
-        return {}
-    result = {}
-    for sub in sorted(extras_dir.iterdir()):
-        if sub.is_dir():
-            imgs = [f.name for f in sorted(sub.iterdir())
-                    if f.is_file() and f.suffix.lower() in IMAGE_EXTS]
-            if imgs:
-                result[sub.name] = imgs
-    return result
+
+
+async def _insert_many(model, docs: list) -> None:
+    if docs:
+        # insert_many skips Beanie's before-insert hooks, so store/compress here
+        if issubclass(model, BlobContent):
+            await content_writes.store_many(docs)
+        elif issubclass(model, CompressedContent):
+            for d in docs:
+                d.encode_content()
+        await model.insert_many(docs)
+
+
+async def _claim_project_assets(project_id: PydanticObjectId) -> bool:
+    """Atomically claim seeding the project's assets; True for the one seed
+    that gets to write them."""
+    res = await Project.get_motor_collection().update_one(
+        {"_id": project_id, "assetsSeeded": {"$ne": True}}, {"$set": {"assetsSeeded": True}},
+    )
+    return res.modified_count == 1
+
+
+async def _owners_exist(project_id: PydanticObjectId, episode_id: PydanticObjectId,
+                        part_id: PydanticObjectId) -> bool:
+    found = await gather_bounded(*(
+        m.get_motor_collection().count_documents({"_id": oid}, limit=1)
+        for m, oid in ((Project, project_id), (Episode, episode_id), (Part, part_id))
+    ))
+    return all(found)
+
+
+async def _discard_partial_seed(
+    part_id: PydanticObjectId, project_id: PydanticObjectId, assets: List[Any],
+) -> None:
+    """Remove whatever a failed seed managed to insert: the part's content
+    and media (keyed by partId – the part is new) and the project assets it
+    created (by their client-side IDs), whose claim is then released for the
+    next seed. Blob references are released only for documents that were
+    actually inserted. Counters are applied after all writes succeed, so they
+    need no undo."""
+    by_part = {"partId": part_id}
+    refs: Counter = Counter()
+    for model in blobs.BLOB_MODELS:
+        refs.update(await blobs.blob_refs(model, by_part))
+    asset_ids = {}
+    for a in assets:
+        asset_ids.setdefault(type(a), []).append(a.id)
+    await gather_bounded(
+        *(m.get_motor_collection().delete_many(by_part) for m in (Beat, Shot, Storyboard, Image, Clip)),
+        *(m.get_motor_collection().delete_many({"_id": {"$in": ids}}) for m, ids in asset_ids.items()),
+        id_registry.unregister_parts([part_id]),
+    )
+    await blobs.release_blobs(dict(refs))
+    if assets:
+        await Project.get_motor_collection().update_one({"_id": project_id}, {"$set": {"assetsSeeded": False}})
 
 
 async def seed_part_data(
@@ -106,216 +113,221 @@ async def seed_part_data(
     project_id: PydanticObjectId,
     episode_id: PydanticObjectId,
     part_id: PydanticObjectId,
-) -> dict:
+) -> Optional[dict]:
     """Insert demo beats, shots, storyboards, images & clips for a part.
-    Returns a summary dict with counts."""
+    Returns a summary dict with counts, or None if the part was deleted
+    meanwhile."""
 
     now = datetime.utcnow()
+    manifest = await get_manifest()
+    owner = dict(organizationId=org_id, projectId=project_id, episodeId=episode_id, partId=part_id)
 
     # ── BEATS ─────────────────────────────────────────────
-    beat_data = _load_json("beat_v1.json")
+    beat_data = manifest.load_json("beat_v1.json")
     beat_content = beat_data.get("beats", [])
-    await Beat(
-        organizationId=org_id, projectId=project_id,
-        episodeId=episode_id, partId=part_id,
+    beats = [Beat(
+        id=PydanticObjectId(), **owner,
         content=json.dumps(beat_content),
         metadata=BeatMetadata(versionNo=1, edited=False, selected=True),
         createdAt=now - timedelta(days=2), updatedAt=now - timedelta(days=2),
-    ).insert()
+    )]
 
     # ── SHOTS (3 versions) ────────────────────────────────
     shot_files = ["shot_v1.json", "shot_v2.json", "shot_v3.json"]
+    shots = []
     for i, fname in enumerate(shot_files, start=1):
-        shot_data = _load_json(fname)
+        shot_data = manifest.load_json(fname)
         shot_content = shot_data.get("beats", [])
         is_latest = (i == len(shot_files))
-        await Shot(
-            organizationId=org_id, projectId=project_id,
-            episodeId=episode_id, partId=part_id,
+        shots.append(Shot(
+            id=PydanticObjectId(), **owner,
             content=json.dumps(shot_content),
             metadata=ShotMetadata(versionNo=i, edited=(i > 1), selected=is_latest),
             createdAt=now - timedelta(days=len(shot_files) - i + 1),
             updatedAt=now - timedelta(days=len(shot_files) - i + 1),
-        ).insert()
+        ))
 
     # ── STORYBOARDS (2 versions) ──────────────────────────
     sb_files = ["storyboard_v1.json", "storyboard_v2.json"]
+    storyboards = []
     for i, fname in enumerate(sb_files, start=1):
-        sb_data = _load_json(fname)
+        sb_data = manifest.load_json(fname)
         sb_content = sb_data.get("storyboard", [])
         is_latest = (i == len(sb_files))
-        await Storyboard(
-            organizationId=org_id, projectId=project_id,
-            episodeId=episode_id, partId=part_id,
+        storyboards.append(Storyboard(
+            id=PydanticObjectId(), **owner,
             content=json.dumps(sb_content),
             metadata=StoryboardMetadata(versionNo=i, edited=(i > 1), selected=is_latest),
             createdAt=now - timedelta(days=len(sb_files) - i + 1),
             updatedAt=now - timedelta(days=len(sb_files) - i + 1),
-        ).insert()
+        ))
+
+    images: list[Image] = []
+    clips: list[Clip] = []
+
+    def _image(name: str, category: str) -> Image:
+        img = Image(
+            id=PydanticObjectId(), **owner,
+            name=name, imageUrl=f"{STATIC_BASE}/{name}", category=category,
+            metadata=MediaMetadata(versionNo=1, selected=True),
+            createdAt=now, updatedAt=now,
+        )
+        images.append(img)
+        return img
 
     # ── SHOT IMAGES & CLIPS ──────────────────────────────
-    shot_folders = _scan_shot_folders()
+    shot_folders = manifest.shot_folders
     total_images = 0
     total_clips = 0
     for folder_name, files in shot_folders.items():
         for img_name in files["images"]:
-            url = f"{STATIC_BASE}/{folder_name}/{img_name}"
-            await Image(
-                organizationId=org_id, projectId=project_id,
-                episodeId=episode_id, partId=part_id,
-                name=f"{folder_name}/{img_name}", imageUrl=url, category="shot",
-                metadata=MediaMetadata(versionNo=1, selected=True),
-                createdAt=now, updatedAt=now,
-            ).insert()
+            _image(f"{folder_name}/{img_name}", "shot")
             total_images += 1
         for clip_name in files["clips"]:
-            url = f"{STATIC_BASE}/{folder_name}/{clip_name}"
-            await Clip(
-                organizationId=org_id, projectId=project_id,
-                episodeId=episode_id, partId=part_id,
-                name=f"{folder_name}/{clip_name}", clipUrl=url,
+            clips.append(Clip(
+                id=PydanticObjectId(), **owner,
+                name=f"{folder_name}/{clip_name}", clipUrl=f"{STATIC_BASE}/{folder_name}/{clip_name}",
                 metadata=MediaMetadata(versionNo=1, selected=True),
                 createdAt=now, updatedAt=now,
-            ).insert()
+            ))
             total_clips += 1
 
     # ── CHARACTER IMAGES ─────────────────────────────────
-    char_folders = _scan_character_folders()
-    total_char = 0
+    char_folders = manifest.character_folders
+    char_images: list[Image] = []
     for char_path, img_names in char_folders.items():
         for img_name in img_names:
-            url = f"{STATIC_BASE}/Characters/{char_path}/{img_name}"
-            await Image(
-                organizationId=org_id, projectId=project_id,
-                episodeId=episode_id, partId=part_id,
-                name=f"Characters/{char_path}/{img_name}", imageUrl=url, category="character",
-                metadata=MediaMetadata(versionNo=1, selected=True),
-                createdAt=now, updatedAt=now,
-            ).insert()
-            total_char += 1
+            char_images.append(_image(f"Characters/{char_path}/{img_name}", "character"))
+    total_char = len(char_images)
 
     # ── LOCATION IMAGES ──────────────────────────────────
-    loc_folders = _scan_location_folders()
-    total_loc_imgs = 0
+    loc_folders = manifest.location_folders
+    loc_images: list[Image] = []
     for loc_path, img_names in loc_folders.items():
         for img_name in img_names:
             if loc_path == "_root":
-                url = f"{STATIC_BASE}/Rajmahal_Location/{img_name}"
                 name = f"Rajmahal_Location/{img_name}"
             else:
-                url = f"{STATIC_BASE}/Rajmahal_Location/{loc_path}/{img_name}"
                 name = f"Rajmahal_Location/{loc_path}/{img_name}"
-            await Image(
-                organizationId=org_id, projectId=project_id,
-                episodeId=episode_id, partId=part_id,
-                name=name, imageUrl=url, category="location",
-                metadata=MediaMetadata(versionNo=1, selected=True),
-                createdAt=now, updatedAt=now,
-            ).insert()
-            total_loc_imgs += 1
+            loc_images.append(_image(name, "location"))
+    total_loc_imgs = len(loc_images)
 
     # ── EXTRAS / PROPS IMAGES ────────────────────────────
-    extras_folders = _scan_extras_folders()
-    total_extras_imgs = 0
+    extras_folders = manifest.extras_folders
+    extras_images: dict[str, list[Image]] = {}
     for extra_name, img_names in extras_folders.items():
-        for img_name in img_names:
-            url = f"{STATIC_BASE}/Extras/{extra_name}/{img_name}"
-            await Image(
-                organizationId=org_id, projectId=project_id,
-                episodeId=episode_id, partId=part_id,
-                name=f"Extras/{extra_name}/{img_name}", imageUrl=url, category="props",
-                metadata=MediaMetadata(versionNo=1, selected=True),
-                createdAt=now, updatedAt=now,
-            ).insert()
-            total_extras_imgs += 1
+        extras_images[extra_name] = [
+            _image(f"Extras/{extra_name}/{img_name}", "props") for img_name in img_names
+        ]
+    total_extras_imgs = sum(len(v) for v in extras_images.values())
 
     # ── PROJECT-LEVEL CHARACTERS ─────────────────────────
-    # Only seed if no characters exist yet for this project
-    existing_chars = await Character.find(Character.projectId == project_id).count()
-    total_characters = 0
-    if existing_chars == 0:
-        try:
-            char_data = _load_json("character.json")
-            chars_dict = char_data.get("Characters", {})
-            # Collect character images from the image table for linking
-            for char_name, char_info in chars_dict.items():
-                # Find matching images for this character
-                display_name = char_name.title()
-                char_image_docs = await Image.find({
-                    "projectId": project_id,
-                    "category": "character",
-                    "name": {"$regex": f"Characters/{display_name}", "$options": "i"},
-                }).to_list()
-                image_ids = [img.id for img in char_image_docs]
-
-                await Character(
-                    organizationId=org_id, projectId=project_id,
-                    name=display_name,
-                    content=json.dumps(char_info),
-                    imageIds=image_ids,
-                    scope=AssetScope(project=True, episodeIds=[], partIds=[]),
-                    createdAt=now, updatedAt=now,
-                ).insert()
-                total_characters += 1
-        except Exception as e:
-            print(f"  Warning: Could not seed characters: {e}")
+    characters: list[Character] = []
+    char_data = manifest.load_json("character.json")
+    chars_dict = char_data.get("Characters", {})
+    for char_name, char_info in chars_dict.items():
+        # Link images whose path contains Characters/<Name> (case-insensitive)
+        display_name = char_name.title()
+        prefix = f"characters/{display_name}".lower()
+        image_ids = [img.id for img in char_images if prefix in img.name.lower()]
+        characters.append(Character(
+            id=PydanticObjectId(), organizationId=org_id, projectId=project_id,
+            name=display_name,
+            content=json.dumps(char_info),
+            imageIds=image_ids,
+            scope=AssetScope(project=True, episodeIds=[], partIds=[]),
+            createdAt=now, updatedAt=now,
+        ))
 
     # ── PROJECT-LEVEL LOCATIONS ──────────────────────────
-    existing_locs = await Location.find(Location.projectId == project_id).count()
-    total_locations = 0
-    if existing_locs == 0:
-        try:
-            loc_data = _load_json("location.json")
-            loc_list = loc_data.get("key_locations", [])
-            # Get all location images for linking
-            loc_image_docs = await Image.find({
-                "projectId": project_id,
-                "category": "location",
-            }).to_list()
-            loc_image_ids = [img.id for img in loc_image_docs]
-
-            for loc_info in loc_list:
-                await Location(
-                    organizationId=org_id, projectId=project_id,
-                    name=loc_info.get("name", "Unknown Location"),
-                    content=json.dumps(loc_info),
-                    imageIds=loc_image_ids if loc_info.get("location_id") == "1" else [],
-                    scope=AssetScope(project=True, episodeIds=[], partIds=[]),
-                    createdAt=now, updatedAt=now,
-                ).insert()
-                total_locations += 1
-        except Exception as e:
-            print(f"  Warning: Could not seed locations: {e}")
+    locations: list[Location] = []
+    loc_data = manifest.load_json("location.json")
+    loc_list = loc_data.get("key_locations", [])
+    loc_image_ids = [img.id for img in loc_images]
+    for loc_info in loc_list:
+        locations.append(Location(
+            id=PydanticObjectId(), organizationId=org_id, projectId=project_id,
+            name=loc_info.get("name", "Unknown Location"),
+            content=json.dumps(loc_info),
+            imageIds=loc_image_ids if loc_info.get("location_id") == "1" else [],
+            scope=AssetScope(project=True, episodeIds=[], partIds=[]),
+            createdAt=now, updatedAt=now,
+        ))
 
     # ── PROJECT-LEVEL PROPS / EXTRAS ─────────────────────
-    existing_props = await Prop.find(Prop.projectId == project_id).count()
-    total_props = 0
-    if existing_props == 0:
-        try:
-            for extra_name in extras_folders:
-                extra_image_docs = await Image.find({
-                    "projectId": project_id,
-                    "category": "props",
-                    "name": {"$regex": f"Extras/{extra_name}", "$options": "i"},
-                }).to_list()
-                image_ids = [img.id for img in extra_image_docs]
-
-                await Prop(
-                    organizationId=org_id, projectId=project_id,
-                    name=extra_name,
-                    category="vehicle" if extra_name.lower() == "car" else "general",
-                    content=json.dumps({
-                        "name": extra_name,
-                        "description": f"Reference images for {extra_name}",
-                        "category": "vehicle" if extra_name.lower() == "car" else "general",
-                    }),
-                    imageIds=image_ids,
-                    scope=AssetScope(project=True, episodeIds=[], partIds=[]),
-                    createdAt=now, updatedAt=now,
-                ).insert()
-                total_props += 1
-        except Exception as e:
-            print(f"  Warning: Could not seed props: {e}")
+    props: list[Prop] = []
+    for extra_name, extra_imgs in extras_images.items():
+        category = "vehicle" if extra_name.lower() == "car" else "general"
+        props.append(Prop(
+            id=PydanticObjectId(), organizationId=org_id, projectId=project_id,
+            name=extra_name,
+            category=category,
+            content=json.dumps({
+                "name": extra_name,
+                "description": f"Reference images for {extra_name}",
+                "category": category,
+            }),
+            imageIds=[img.id for img in extra_imgs],
+            scope=AssetScope(project=True, episodeIds=[], partIds=[]),
+            createdAt=now, updatedAt=now,
+        ))
+
+    # Only the seed that claims the project writes its assets. Projects from
+    # before the claim may already hold some kinds, which are left alone.
+    if await _claim_project_assets(project_id):
+        existing = await gather_bounded(
+            Character.find(Character.projectId == project_id).count(),
+            Location.find(Location.projectId == project_id).count(),
+            Prop.find(Prop.projectId == project_id).count(),
+        )
+        characters, locations, props = (
+            docs if n == 0 else [] for docs, n in zip((characters, locations, props), existing)
+        )
+    else:
+        characters, locations, props = [], [], []
+
+    # ── WRITE: one insert_many per collection, concurrently ──
+    # Every write runs to completion (no cancellation on the first error), so
+    # the cleanup below can't race an insert that is still in flight
+    results = await asyncio.gather(
+        _insert_many(Beat, beats),
+        _insert_many(Shot, shots),
+        _insert_many(Storyboard, storyboards),
+        _insert_many(Image, images),
+        _insert_many(Clip, clips),
+        _insert_many(Character, characters),
+        _insert_many(Location, locations),
+        _insert_many(Prop, props),
+        return_exceptions=True,
+    )
+    error = next((r for r in results if isinstance(r, BaseException)), None)
+    try:
+        if error is not None:
+            raise error
+        # Only once the documents exist
+        await id_registry.register_many([*beats, *shots, *storyboards, *images, *clips])
+    except Exception:
+        await _discard_partial_seed(part_id, project_id, [*characters, *locations, *props])
+        raise
+
+    # The cascade of a part / episode / project deleted meanwhile has already
+    # passed, so nothing else would remove these (or undo the counters)
+    if not await _owners_exist(project_id, episode_id, part_id):
+        await _discard_partial_seed(part_id, project_id, [*characters, *locations, *props])
+        return None
+
+    # ── ROLLUP COUNTERS ──────────────────────────────────
+    await apply_delta(
+        {
+            "beatCount": len(beats),
+            "shotCount": len(shots),
+            "storyboardCount": len(storyboards),
+            "imageCount": len(images),
+            "clipCount": len(clips),
+            "contentBytes": sum(content_bytes(d.content) for d in (*beats, *shots, *storyboards)),
+        },
+        org_id=org_id, project_id=project_id, episode_id=episode_id, part_id=part_id,
+    )
 
     return {
         "beats": len(beat_content),
@@ -326,7 +338,57 @@ async def seed_part_data(
         "character_images": total_char,
         "location_images": total_loc_imgs,
         "extras_images": total_extras_imgs,
-        "characters": total_characters,
-        "locations": total_locations,
-        "props": total_props,
+        "characters": len(characters),
+        "locations": len(locations),
+        "props": len(props),
+    }
+
+
+async def fail_stale_seeds(part_id: Optional[PydanticObjectId] = None) -> int:
+    """Mark seeds that can no longer finish as failed (all parts, or one).
+
+    Seed jobs live in the process that accepted them, so a part still
+    pending/running SEED_STALE_SECONDS after it was created lost its job to a
+    restart or crash. Run at startup and from the seed-status endpoint.
+    Returns the number of parts marked.
+    """
+    query: dict = {
+        "seedStatus": {"$in": ["pending", "running"]},
+        "createdAt": {"$lt": datetime.utcnow() - timedelta(seconds=settings.SEED_STALE_SECONDS)},
     }
+    if part_id:
+        query["_id"] = part_id
+    res = await Part.get_motor_collection().update_many(
+        query, {"$set": {"seedStatus": "failed", "seedError": "Seeding was interrupted by a server restart"}},
+    )
+    return res.modified_count
+
+
+async def run_seed_job(
+    job: Job,
+    org_id: PydanticObjectId,
+    project_id: PydanticObjectId,
+    episode_id: PydanticObjectId,
+    part_id: PydanticObjectId,
+) -> Optional[dict]:
+    """Background-job wrapper around seed_part_data that records the outcome
+    on the Part (seedStatus / seedError / seededAt)."""
+    parts = Part.get_motor_collection()
+    res = await parts.update_one({"_id": part_id}, {"$set": {"seedStatus": "running"}})
+    if not res.matched_count:
+        return None  # part was deleted before the job started
+    try:
+        summary = await seed_part_data(
+            org_id=org_id, project_id=project_id, episode_id=episode_id, part_id=part_id,
+        )
+    except Exception as e:
+        await parts.update_one(
+            {"_id": part_id},
+            {"$set": {"seedStatus": "failed", "seedError": f"{type(e).__name__}: {e}"}},
+        )
+        raise
+    await parts.update_one(
+        {"_id": part_id},
+        {"$set": {"seedStatus": "done", "seedError": None, "seededAt": datetime.utcnow()}},
+    )
+    return summary
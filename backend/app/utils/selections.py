@@ -0,0 +1,147 @@
+"""Per-item version selection and the resolved "effective content" of a part.
+
+`metadata.selected` picks one whole version per part & type. On top of that,
+a `ContentSelection` maps single item keys (shot "3A", panel "12", ...) to
+other versions of the same part, so mixing versions is one small
+`$set items.<key>` instead of uploading a new full version.
+
+`effective_content` assembles the selected version with those items spliced
+in. Results are cached under the selection's `rev` plus the (id, updatedAt)
+of every version involved, so any edit, re-selection or pick change simply
+produces a new cache key.
+"""
+import copy
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.models.content_codec import json_format, render_json
+from app.models.content_selection import ContentSelection, escape_key, unescape_key
+from app.utils import blobs
+from app.utils.cache import TTLCache
+from app.utils.content_items import item_index, splice_items
+from app.utils.content_schema import loads
+
+_effective: TTLCache[Tuple[Any, ...], Dict[str, Any]] = TTLCache(
+    "content.effective", settings.CONTENT_EFFECTIVE_CACHE_SIZE,
+)
+
+
+def _coll():
+    return ContentSelection.get_motor_collection()
+
+
+def _view(raw: Optional[dict], part_id: PydanticObjectId, kind: str) -> Dict[str, Any]:
+    raw = raw or {}
+    return {
+        "partId": str(part_id), "type": kind, "rev": raw.get("rev", 0),
+        "items": {unescape_key(k): str(v) for k, v in (raw.get("items") or {}).items()},
+        "updatedAt": raw.get("updatedAt"),
+    }
+
+
+async def get_selection(part_id: PydanticObjectId, kind: str) -> Dict[str, Any]:
+    """{partId, type, rev, items: {key: version id}, updatedAt}."""
+    return _view(await _coll().find_one({"partId": part_id, "type": kind}), part_id, kind)
+
+
+async def set_pick(version: Any, kind: str, key: str) -> Dict[str, Any]:
+    """Use `version`'s copy of item `key` for its part (one atomic upsert)."""
+    now = datetime.utcnow()
+    query = {"partId": version.partId, "type": kind}
+    update = {
+        "$set": {f"items.{escape_key(key)}": version.id, "updatedAt": now},
+        "$inc": {"rev": 1},
+        "$setOnInsert": {"projectId": version.projectId, "createdAt": now},
+    }
+    try:
+        raw = await _coll().find_one_and_update(query, update, upsert=True, return_document=ReturnDocument.AFTER)
+    except DuplicateKeyError:  # concurrent first pick for this part – the document exists now
+        raw = await _coll().find_one_and_update(query, update, return_document=ReturnDocument.AFTER)
+    return _view(raw, version.partId, kind)
+
+
+async def clear_pick(part_id: PydanticObjectId, kind: str, key: str) -> Optional[Dict[str, Any]]:
+    """Drop the pick for `key`; None if there was none."""
+    field = f"items.{escape_key(key)}"
+    raw = await _coll().find_one_and_update(
+        {"partId": part_id, "type": kind, field: {"$exists": True}},
+        {"$unset": {field: ""}, "$inc": {"rev": 1}, "$set": {"updatedAt": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER,
+    )
+    return _view(raw, part_id, kind) if raw else None
+
+
+async def drop_version(part_id: PydanticObjectId, kind: str, version_id: PydanticObjectId) -> None:
+    """Remove every pick pointing at a deleted version."""
+    raw = await _coll().find_one({"partId": part_id, "type": kind}, {"items": 1})
+    fields = [k for k, v in ((raw or {}).get("items") or {}).items() if v == version_id]
+    if fields:
+        await _coll().update_one(
+            {"_id": raw["_id"]},
+            {"$unset": {f"items.{k}": "" for k in fields}, "$inc": {"rev": 1}, "$set": {"updatedAt": datetime.utcnow()}},
+        )
+
+
+async def effective_content(Model, kind: str, part_id: PydanticObjectId) -> Optional[Dict[str, Any]]:
+    """The part's selected version with per-item picks spliced in, or None
+    if no version is selected.
+
+    Returns {partId, type, rev, baseId, content, sources, unresolved}:
+    `sources` maps each replaced key to its version, `unresolved` lists picks
+    whose version or item no longer exists in a placeable form. Raises
+    ValueError if a body isn't a JSON item array.
+    """
+    sel = await _coll().find_one({"partId": part_id, "type": kind}, {"items": 1, "rev": 1})
+    picks = {unescape_key(k): v for k, v in ((sel or {}).get("items") or {}).items()}
+    rev = sel["rev"] if sel else 0
+
+    # Cheap probe first: only ids and updatedAt of the versions involved
+    coll = Model.get_motor_collection()
+    heads = await coll.find(
+        {"$or": [
+            {"partId": part_id, "metadata.selected": True},
+            {"_id": {"$in": list(set(picks.values()))}, "partId": part_id},
+        ]},
+        {"updatedAt": 1, "metadata.selected": 1},
+    ).to_list(None)
+    base_id = next((h["_id"] for h in heads if h.get("metadata", {}).get("selected")), None)
+    if base_id is None:
+        return None
+    cache_key = (str(part_id), kind, rev, tuple(sorted((str(h["_id"]), h.get("updatedAt")) for h in heads)))
+    cached = _effective.get(cache_key)
+    if cached is not None:
+        return cached
+
+    docs = {d.id: d for d in await Model.find({"_id": {"$in": [h["_id"] for h in heads]}}).to_list()}
+    base = docs.get(base_id)
+    if base is None:  # deleted since the probe
+        return None
+    # One blob read for the base and every picked version (per delta-chain level)
+    await blobs.hydrate(*docs.values())
+    if base.content_native:
+        doc, fmt = copy.deepcopy(base.storedContent), base.contentFormat
+    else:
+        doc = loads(base.content)
+        fmt = json_format(doc, base.content) or "py"
+
+    replacements: Dict[str, Any] = {}
+    for key, vid in picks.items():
+        version = docs.get(vid)
+        item = (await item_index(kind, version)).get(key) if version else None
+        if item is not None:
+            replacements[key] = item
+    placed = splice_items(kind, doc, replacements)
+
+    result = {
+        "partId": str(part_id), "type": kind, "rev": rev, "baseId": str(base_id),
+        "content": render_json(doc, fmt),
+        "sources": {k: str(picks[k]) for k in placed},
+        "unresolved": sorted(set(picks) - set(placed)),
+    }
+    _effective.set(cache_key, result)
+    return result
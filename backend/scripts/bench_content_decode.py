@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark content decoding on the demo data: stdlib json vs the msgspec
+decoders of app/utils/content_schema.py.
+
+Bodies are prepared the way seeding stores them (item arrays unwrapped,
+one body per character / location). For each file it prints the mean time
+per body for json.loads, the untyped msgspec decoder used on read paths
+(`loads`) and the typed, validating decoder (`decode`), then the total for
+one seeded part. No database needed.
+
+Usage:
+    cd backend && python -m scripts.bench_content_decode [iterations]
+"""
+import json
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from app.utils.content_schema import decode, loads
+from app.utils.demodata import DEMODATA_DIR
+
+FILES = [
+    ("beat_v1.json", "beat"),
+    ("shot_v1.json", "shot"),
+    ("shot_v2.json", "shot"),
+    ("shot_v3.json", "shot"),
+    ("storyboard_v1.json", "storyboard"),
+    ("storyboard_v2.json", "storyboard"),
+    ("character.json", "character"),
+    ("location.json", "location"),
+]
+
+
+def _bodies(filename: str, kind: str) -> List[str]:
+    data = json.loads((DEMODATA_DIR / filename).read_text(encoding="utf-8"))
+    if kind == "character":
+        return [json.dumps(c) for c in data["Characters"].values()]
+    if kind == "location":
+        return [json.dumps(loc) for loc in data["key_locations"]]
+    return [json.dumps(next(iter(data.values())))]
+
+
+def _time(fn: Callable[[str], object], bodies: List[str], iterations: int) -> float:
+    """Seconds for decoding every body once (best of three runs)."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for body in bodies:
+                fn(body)
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rows: List[Tuple[str, int, float, float, float]] = []
+    for filename, kind in FILES:
+        if not (DEMODATA_DIR / filename).is_file():
+            print(f"   {filename}: not found, skipped")
+            continue
+        bodies = _bodies(filename, kind)
+        size = sum(len(b.encode("utf-8")) for b in bodies)
+        rows.append((
+            filename, size,
+            _time(json.loads, bodies, iterations),
+            _time(loads, bodies, iterations),
+            _time(lambda b, k=kind: decode(k, b), bodies, iterations),
+        ))
+
+    print(f"{'file':<22}{'bytes':>8}{'json µs':>10}{'loads µs':>10}{'typed µs':>10}{'speedup':>9}")
+    for filename, size, std, fast, typed in rows:
+        print(f"{filename:<22}{size:>8}{std * 1e6:>10.1f}{fast * 1e6:>10.1f}{typed * 1e6:>10.1f}{std / typed:>8.1f}x")
+    totals = [sum(r[i] for r in rows) for i in (2, 3, 4)]
+    print(f"✓  One part ({len(rows)} files): json {totals[0] * 1e6:.0f} µs, "
+          f"loads {totals[1] * 1e6:.0f} µs, typed {totals[2] * 1e6:.0f} µs "
+          f"({totals[0] / totals[2]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
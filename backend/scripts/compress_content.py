@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Compress existing `content` strings at rest (see app/models/content_codec.py).
+
+Documents written since compression was introduced are already stored
+compressed; this rewrites older ones in batches. Safe to interrupt and rerun.
+
+Usage:
+    cd backend && python -m scripts.compress_content [batch_size]
+"""
+import asyncio
+import sys
+
+from app.db.mongodb import init_db
+from app.db.migrations import compress_content
+from app.models import Beat, Shot, Storyboard, Character, Location, Prop
+
+
+async def main() -> None:
+    await init_db()
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    total = 0
+    for model in (Beat, Shot, Storyboard, Character, Location, Prop):
+        coll = model.get_motor_collection()
+
+        async def progress(n: int, name: str = coll.name) -> None:
+            print(f"   {name}: {n} compressed", end="\r")
+
+        n = await compress_content(coll, batch_size, on_batch=progress)
+        print(f"✓  {coll.name}: {n} document(s) compressed")
+        total += n
+    print(f"✓  Done – {total} document(s) compressed.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
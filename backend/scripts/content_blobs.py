@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Maintenance for the content-addressed blob store (app/utils/blobs.py).
+
+    migrate    move inline beat/shot/storyboard content into content_blobs
+    reconcile  recount blob references from the content collections
+    gc         delete blobs unreferenced for CONTENT_BLOB_GC_GRACE_SECONDS
+
+Usage:
+    cd backend && python -m scripts.content_blobs migrate [batch_size]
+    cd backend && python -m scripts.content_blobs reconcile
+    cd backend && python -m scripts.content_blobs gc [grace_seconds]
+"""
+import asyncio
+import sys
+
+from app.db.mongodb import init_db
+from app.db.migrations import move_content_to_blobs
+from app.utils.blobs import BLOB_MODELS, gc_blobs, reconcile_blob_refs
+
+
+async def migrate(batch_size: int) -> None:
+    for model in BLOB_MODELS:
+        coll = model.get_motor_collection()
+
+        async def progress(n: int, name: str = coll.name) -> None:
+            print(f"   {name}: {n} moved", end="\r")
+
+        n = await move_content_to_blobs(coll, batch_size, on_batch=progress)
+        print(f"✓  {coll.name}: {n} document(s) moved to blobs")
+
+
+async def main() -> None:
+    if len(sys.argv) < 2 or sys.argv[1] not in ("migrate", "reconcile", "gc"):
+        print(__doc__)
+        sys.exit(1)
+    cmd, arg = sys.argv[1], (int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    await init_db()
+    if cmd == "migrate":
+        await migrate(arg or 200)
+    elif cmd == "reconcile":
+        result = await reconcile_blob_refs()
+        print(f"✓  {result['blobs']} referenced blob(s), {result['fixed']} count(s) corrected.")
+    else:
+        print(f"✓  {await gc_blobs(arg)} unreferenced blob(s) deleted.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Index report: checks declared indexes against the live collections and runs
+explain() on every hot query, flagging COLLSCAN / in-memory SORT plans.
+
+Usage:
+    cd backend && python -m scripts.index_report
+Exit code is 1 if any index is missing or any hot query scans a collection.
+"""
+import asyncio
+import sys
+
+from app.db.mongodb import init_db
+from app.db.indexes import verify_indexes, explain_hot_queries
+
+
+async def main() -> int:
+    await init_db()
+
+    failed = False
+    problems = await verify_indexes()
+    print("── Declared indexes ─────────────────────────")
+    if not problems:
+        print("✓  all present")
+    for coll, issues in problems.items():
+        failed = True
+        for issue in issues:
+            print(f"✗  {coll}: {issue}")
+
+    print("── Hot query plans ──────────────────────────")
+    for row in await explain_hot_queries():
+        flag = "✗" if row["collscan"] else ("!" if row["inMemorySort"] else "✓")
+        failed = failed or row["collscan"]
+        sort = f" sort={row['sort']}" if row["sort"] else ""
+        print(f"{flag}  {row['collection']} {row['filter']}{sort} → {' > '.join(reversed(row['stages']))}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Convert existing content to native BSON storage (see app/models/content_codec.py).
+
+With CONTENT_NATIVE_ENABLED the API writes new content natively and runs the
+same migration as a background job at startup; this runs it by hand.
+Documents that can't be stored natively are left as they are. Safe to
+interrupt and rerun.
+
+Usage:
+    cd backend && python -m scripts.native_content [batch_size]
+"""
+import asyncio
+import sys
+
+from app.db.mongodb import init_db
+from app.db.migrations import CONTENT_MODELS, migrate_content_to_native
+
+
+async def main() -> None:
+    await init_db()
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    total = 0
+    for model in CONTENT_MODELS:
+        coll = model.get_motor_collection()
+
+        async def progress(n: int, name: str = coll.name) -> None:
+            print(f"   {name}: {n} converted", end="\r")
+
+        n = await migrate_content_to_native(coll, batch_size, on_batch=progress)
+        print(f"✓  {coll.name}: {n} document(s) converted")
+        total += n
+    print(f"✓  Done – {total} document(s) stored natively.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
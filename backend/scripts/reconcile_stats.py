@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Recompute the materialized ContentStats counters (part → episode → project →
+organization) from the content collections. Safe to run at any time; use it
+after deploys that touched the counter paths or if counts drift.
+(init_db runs it once by itself for data that predates the counters.)
+
+Usage:
+    cd backend && python -m scripts.reconcile_stats              # everything
+    cd backend && python -m scripts.reconcile_stats <project_id> # one project
+"""
+import asyncio
+import sys
+
+from beanie import PydanticObjectId
+
+from app.db.mongodb import init_db
+from app.utils.counters import reconcile_stats
+
+
+async def main() -> None:
+    await init_db()
+    project_id = PydanticObjectId(sys.argv[1]) if len(sys.argv) > 1 else None
+    result = await reconcile_stats(project_id)
+    print(f"✓  Reconciled stats for {result['parts']} part(s).")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
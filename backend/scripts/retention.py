@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Apply the version retention policy (see app/utils/retention.py): keep the
+selected version plus the newest VERSION_RETENTION_KEEP per part & type and
+move older ones to archived_versions. Idempotent; safe to interrupt and rerun.
+
+Usage:
+    cd backend && python -m scripts.retention [part_id ...]
+"""
+import asyncio
+import sys
+
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.db.mongodb import init_db
+from app.utils.retention import sweep
+
+
+async def main() -> None:
+    await init_db()
+    part_ids = [PydanticObjectId(p) for p in sys.argv[1:]] or None
+    print(f"   Keeping selected + {settings.VERSION_RETENTION_KEEP} newest per part & type")
+    archived = await sweep(part_ids=part_ids)
+    for name, n in archived.items():
+        print(f"✓  {name}: {n} version(s) archived")
+    print(f"✓  Done – {sum(archived.values())} version(s) archived.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
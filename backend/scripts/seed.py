@@ -134,7 +134,7 @@ async def seed():
     # ── ORG ──────────────────────────────────────────────────
     org = Organization(
         name="Loqo Studios", description="Demo organisation",
-        memberIds=[user.id, user2.id], createdAt=now, updatedAt=now,
+        createdAt=now, updatedAt=now,
     )
     await org.insert()
     user.organizationId = org.id
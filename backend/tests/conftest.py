@@ -0,0 +1,79 @@
+"""Shared fixtures. Settings without defaults get dummy values so the app
+modules import without a .env; `db` runs Beanie on an in-memory mongomock
+database (and empties the in-process caches around each test), `tree` adds
+one organization / project / episode / part.
+
+With TEST_MONGODB_URL set, `db` uses a throwaway database on that server
+instead, with the models' indexes built. Tests marked `mongodb` need
+server features mongomock lacks (some aggregation operators, partial
+indexes) and are skipped without it.
+
+    cd backend && pip install -r requirements-dev.txt && python -m pytest
+"""
+import os
+import uuid
+from types import SimpleNamespace
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test")
+
+import pytest  # noqa: E402
+from beanie import PydanticObjectId, init_beanie  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models import ALL_MODELS, Episode, Organization, Part, Project  # noqa: E402
+from app.utils import cache  # noqa: E402
+
+
+TEST_MONGODB_URL = os.environ.get("TEST_MONGODB_URL")
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_MONGODB_URL:
+        return
+    skip = pytest.mark.skip(reason="needs a MongoDB server (set TEST_MONGODB_URL)")
+    for item in items:
+        if "mongodb" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+async def db(monkeypatch):
+    monkeypatch.setattr(settings, "CONTENT_NATIVE_ENABLED", False)
+    monkeypatch.setattr(settings, "CONTENT_DELTA_ENABLED", False)
+    if TEST_MONGODB_URL:
+        client = AsyncIOMotorClient(TEST_MONGODB_URL)
+        database = client[f"test_{uuid.uuid4().hex}"]
+        await init_beanie(database=database, document_models=ALL_MODELS)
+    else:
+        client = None
+        database = AsyncMongoMockClient()["test"]
+        # mongomock ignores partialFilterExpression, so the unique "one selected
+        # version per part" indexes would reject every second version
+        await init_beanie(database=database, document_models=ALL_MODELS, skip_indexes=True)
+    for c in cache._registry.values():
+        c.clear()
+    yield database
+    for c in cache._registry.values():
+        c.clear()
+    if client is not None:
+        await client.drop_database(database.name)
+
+
+@pytest.fixture
+async def tree(db):
+    """One organization / project / episode / part. `ids` holds the owner
+    fields content documents need."""
+    org = Organization(name="Org")
+    await org.insert()
+    project = Project(organizationId=org.id, name="Project", createdBy=PydanticObjectId())
+    await project.insert()
+    episode = Episode(projectId=project.id, episodeNumber=1)
+    await episode.insert()
+    part = Part(projectId=project.id, episodeId=episode.id, partNumber=1, title="Part")
+    await part.insert()
+    ids = {"organizationId": org.id, "projectId": project.id, "episodeId": episode.id, "partId": part.id}
+    return SimpleNamespace(org=org, project=project, episode=episode, part=part, ids=ids)
@@ -0,0 +1,33 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.assets import AssetCreate, AssetUpdate, create_prop, update_prop
+from app.models import Prop
+
+
+def prop_body(tree, content: str) -> AssetCreate:
+    return AssetCreate(projectId=str(tree.project.id), name="Car", content=content, category="vehicle")
+
+
+async def test_prop_content_is_validated_on_create(tree):
+    user = SimpleNamespace(organizationId=tree.org.id)
+    for content in ("not json", json.dumps({"name": ["a list"]})):
+        with pytest.raises(HTTPException) as e:
+            await create_prop(prop_body(tree, content), user=user)
+        assert e.value.status_code == 422
+    assert await Prop.find_all().count() == 0
+
+    out = await create_prop(prop_body(tree, json.dumps({"name": "Car", "colour": "red"})), user=user)
+    assert out.name == "Car"
+
+
+async def test_prop_content_is_validated_on_update(tree):
+    prop = Prop(organizationId=tree.org.id, projectId=tree.project.id, name="Car", content="{}")
+    await prop.insert()
+    with pytest.raises(HTTPException) as e:
+        await update_prop(str(prop.id), AssetUpdate(content=json.dumps({"description": 3})), user=None)
+    assert e.value.status_code == 422
+    assert (await Prop.get(prop.id)).content == "{}"
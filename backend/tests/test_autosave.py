@@ -0,0 +1,157 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.api.v1.endpoints import content
+from app.models import Beat
+from app.utils import autosave as autosave_module
+from app.utils import blobs
+from app.utils.autosave import AutosaveBuffer, AutosaveConflict, AutosaveFull, StaleRevision
+
+
+class FakeModel:
+    """Stands in for a content model: `get` returns the stored document."""
+    docs = {}
+
+    @classmethod
+    async def get(cls, content_id):
+        return cls.docs.get(content_id)
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Records write_body calls; set `writes.fail` to make the next ones lose."""
+    calls = []
+
+    async def write_body(item, kind, text, extra=None):
+        calls.append((item.id, kind, text, extra))
+        if writes.fail:
+            writes.fail -= 1
+            return None
+        return "hash", len(text), datetime.utcnow()
+
+    writes = SimpleNamespace(calls=calls, fail=0)
+    monkeypatch.setattr(autosave_module, "write_body", write_body)
+    FakeModel.docs = {}
+    return writes
+
+
+def new_doc(rev: int = 0) -> FakeModel:
+    doc = FakeModel()
+    doc.id, doc.autosaveRev = PydanticObjectId(), rev
+    FakeModel.docs[doc.id] = doc
+    return doc
+
+
+async def test_edits_coalesce_into_one_write(writes):
+    buf = AutosaveBuffer(interval=3600, max_pending=10)
+    doc = new_doc(rev=4)
+    for i in range(20):
+        ack = buf.stage(doc.id, f"body {i}", item=doc, kind="beat")
+    assert ack == {"id": str(doc.id), "rev": 24, "savedRev": 4, "pending": True}
+
+    assert await buf.flush(doc.id) is not None
+    assert writes.calls == [(doc.id, "beat", "body 19", {"autosaveRev": 24})]
+    assert buf.get(doc.id) is None
+    assert await buf.flush(doc.id) is None
+
+
+async def test_timer_flushes_after_the_interval(writes):
+    buf = AutosaveBuffer(interval=0.01, max_pending=10)
+    doc = new_doc()
+    buf.stage(doc.id, "a", item=doc, kind="shot")
+    buf.stage(doc.id, "b")
+    await asyncio.sleep(0.05)
+    assert [c[2] for c in writes.calls] == ["b"]
+    assert buf.pending == 0
+
+
+async def test_stale_base_revision_is_rejected(writes):
+    buf = AutosaveBuffer(interval=3600, max_pending=10)
+    doc = new_doc(rev=2)
+    buf.stage(doc.id, "a", base_rev=2, item=doc, kind="beat")
+    with pytest.raises(StaleRevision):
+        buf.stage(doc.id, "b", base_rev=2)
+    assert buf.stage(doc.id, "b", base_rev=3)["rev"] == 4
+    buf.discard(doc.id)
+
+
+async def test_pending_limit(writes):
+    buf = AutosaveBuffer(interval=3600, max_pending=1)
+    first, second = new_doc(), new_doc()
+    buf.stage(first.id, "a", item=first, kind="beat")
+    buf.stage(first.id, "b")  # more edits of a pending document are fine
+    with pytest.raises(AutosaveFull):
+        buf.stage(second.id, "a", item=second, kind="beat")
+    buf.discard(first.id)
+    assert buf.pending == 0
+
+
+async def test_conflicting_writes_keep_the_edit_pending(writes):
+    buf = AutosaveBuffer(interval=3600, max_pending=10)
+    doc = new_doc()
+    buf.stage(doc.id, "a", item=doc, kind="beat")
+    writes.fail = autosave_module.WRITE_RETRIES
+    with pytest.raises(AutosaveConflict):
+        await buf.flush(doc.id)
+    assert buf.pending == 1
+    await buf.flush(doc.id)
+    assert buf.pending == 0 and len(writes.calls) == autosave_module.WRITE_RETRIES + 1
+
+
+async def test_deleted_document_drops_the_edit(writes):
+    buf = AutosaveBuffer(interval=3600, max_pending=10)
+    doc = new_doc()
+    buf.stage(doc.id, "a", item=doc, kind="beat")
+    del FakeModel.docs[doc.id]
+    assert await buf.flush(doc.id) is None
+    assert buf.get(doc.id) is None and writes.calls == []
+
+
+async def test_flush_all(writes):
+    buf = AutosaveBuffer(interval=3600, max_pending=10)
+    docs = [new_doc() for _ in range(3)]
+    for doc in docs:
+        buf.stage(doc.id, f"body {doc.id}", item=doc, kind="storyboard")
+    await buf.flush_all()
+    assert sorted(c[2] for c in writes.calls) == sorted(f"body {d.id}" for d in docs)
+    assert buf.pending == 0
+
+
+# ── PUT /content/{id} ────────────────────────────────────────
+
+BODIES = [f'[{{"Beat_Number": 1, "Title": "v{i}"}}]' for i in (1, 2, 3)]
+
+
+@pytest.fixture
+async def buffered(tree, monkeypatch):
+    """A stored beat with a newer body buffered in the endpoints' autosave."""
+    buf = AutosaveBuffer(interval=3600, max_pending=10)
+    monkeypatch.setattr(content, "autosave", buf)
+    beat = Beat(content=BODIES[0], **tree.ids)
+    await beat.insert()
+    buf.stage(beat.id, BODIES[1], item=beat, kind="beat")
+    return SimpleNamespace(buf=buf, beat=beat)
+
+
+async def stored(beat_id) -> Beat:
+    beat = await Beat.get(beat_id)
+    await blobs.hydrate(beat)
+    return beat
+
+
+async def test_put_drops_the_buffered_edit(buffered):
+    await content.update_content(str(buffered.beat.id), content.ContentUpdate(content=BODIES[2]), user=None)
+    assert buffered.buf.get(buffered.beat.id) is None
+    await buffered.buf.flush_all()
+    assert (await stored(buffered.beat.id)).content == BODIES[2]
+
+
+async def test_metadata_put_writes_the_buffered_edit_first(buffered):
+    update = content.ContentUpdate(metadata={"versionNo": 1, "edited": True})
+    await content.update_content(str(buffered.beat.id), update, user=None)
+    beat = await stored(buffered.beat.id)
+    assert beat.content == BODIES[1] and beat.metadata.edited
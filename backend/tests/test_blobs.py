@@ -0,0 +1,229 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.models import Beat
+from app.models.beat import BeatMetadata
+from app.models.content_codec import content_hash
+from app.utils import blobs
+
+
+def body(**changes) -> str:
+    beats = [{"Beat_Number": i, "Title": f"Beat {i}", "Description": "x" * 200} for i in range(1, 11)]
+    for number, title in changes.items():
+        beats[int(number[1:]) - 1]["Title"] = title
+    return json.dumps(beats)
+
+
+async def refs() -> dict:
+    return {b["_id"]: b["refCount"] for b in await blobs._blobs().find({}, {"refCount": 1}).to_list(None)}
+
+
+async def stored(h: str) -> dict:
+    return await blobs._blobs().find_one({"_id": h})
+
+
+# ── Reference counting ───────────────────────────────────────
+
+async def test_put_blob_stores_each_body_once(db):
+    text = body()
+    assert await blobs.put_blob(text) == content_hash(text)
+    await blobs.put_blob(text)
+    assert await refs() == {content_hash(text): 2}
+    await blobs.release_blobs({content_hash(text): 2})
+    assert await refs() == {content_hash(text): 0}
+
+
+async def test_acquire_blobs_counts(db):
+    a, b = body(), body(b1="other")
+    await blobs.acquire_blobs({content_hash(a): a, content_hash(b): b}, {content_hash(a): 3, content_hash(b): 1})
+    assert await refs() == {content_hash(a): 3, content_hash(b): 1}
+    blobs._bodies.clear()
+    assert await blobs.load_texts([content_hash(a), "unknown"]) == {content_hash(a): a}
+
+
+# ── GC / reconcile ───────────────────────────────────────────
+
+async def test_gc_removes_unreferenced_blobs_after_the_grace_period(db):
+    h = await blobs.put_blob(body())
+    await blobs.release_blobs({h: 1})
+    assert await blobs.gc_blobs(grace_seconds=3600) == 0
+    assert await blobs.gc_blobs(grace_seconds=-1) == 1
+    assert await refs() == {}
+
+
+async def test_gc_skips_referenced_blobs(db):
+    h = await blobs.put_blob(body())
+    assert await blobs.gc_blobs(grace_seconds=-1) == 0
+    assert await refs() == {h: 1}
+
+
+async def test_reconcile_recounts_document_references(db):
+    used, unused = body(), body(b1="orphan")
+    await blobs.acquire_blobs({content_hash(used): used, content_hash(unused): unused},
+                              {content_hash(used): 4, content_hash(unused): 2})
+    await Beat.get_motor_collection().insert_one({"partId": PydanticObjectId(), "blobHash": content_hash(used)})
+    await blobs._blobs().update_many({}, {"$set": {"updatedAt": datetime.utcnow() - timedelta(minutes=1)}})
+
+    assert await blobs.reconcile_blob_refs() == {"blobs": 1, "fixed": 2}
+    assert await refs() == {content_hash(used): 1, content_hash(unused): 0}
+
+
+# ── Model hooks ──────────────────────────────────────────────
+
+def new_beat(text: str, version: int = 1, part=None) -> Beat:
+    ids = {f: PydanticObjectId() for f in ("organizationId", "projectId", "episodeId")}
+    return Beat(
+        content=text, partId=part or PydanticObjectId(),
+        metadata=BeatMetadata(versionNo=version, selected=version == 1), **ids,
+    )
+
+
+async def test_insert_save_delete_keep_references(db):
+    beat = new_beat(body())
+    await beat.insert()
+    first = beat.blobHash
+    assert first == content_hash(body()) and beat.summary.itemCount == 10
+    assert (await Beat.get_motor_collection().find_one({"_id": beat.id})).get("content") is None
+
+    beat.content = body(b1="changed")
+    await beat.save()
+    assert await refs() == {first: 0, beat.blobHash: 1}
+
+    loaded = await Beat.get(beat.id)
+    await blobs.hydrate(loaded)
+    assert loaded.content == body(b1="changed")
+
+    await loaded.delete()
+    assert await refs() == {first: 0, beat.blobHash: 0}
+
+
+# ── Delta chains ─────────────────────────────────────────────
+
+@pytest.fixture
+def delta(monkeypatch, db):
+    monkeypatch.setattr(settings, "CONTENT_DELTA_ENABLED", True)
+    monkeypatch.setattr(settings, "CONTENT_DELTA_KEYFRAME_INTERVAL", 3)
+
+
+async def test_delta_chain_roundtrip(delta):
+    texts = [body(), body(b2="two"), body(b2="two", b5="five")]
+    hashes = [await blobs.put_blob(texts[0])]
+    for text in texts[1:]:
+        hashes.append(await blobs.put_blob(text, hashes[-1]))
+
+    last = await stored(hashes[2])
+    assert last["base"] == hashes[1] and last["depth"] == 2 and last.get("content") is None
+    # Each delta blob holds a reference on its base
+    assert await refs() == {hashes[0]: 2, hashes[1]: 2, hashes[2]: 1}
+
+    blobs._bodies.clear()
+    assert await blobs.load_texts(hashes) == dict(zip(hashes, texts))
+    blobs._bodies.clear()
+    assert await blobs.load_texts([hashes[2]]) == {hashes[2]: texts[2]}
+
+
+async def test_keyframe_every_interval(delta):
+    h = await blobs.put_blob(body())
+    depths = []
+    for i in range(1, 5):
+        h = await blobs.put_blob(body(b1=f"edit {i}"), h)
+        depths.append((await stored(h)).get("depth", 0))
+    assert depths == [1, 2, 0, 1]
+
+
+async def test_keyframe_when_the_delta_does_not_pay_off(delta):
+    base = await blobs.put_blob(body())
+    h = await blobs.put_blob(json.dumps([{"Beat_Number": 1, "Title": "Rewritten"}] * 10), base)
+    assert (await stored(h)).get("base") is None
+    assert (await refs())[base] == 1
+
+
+async def test_delta_disabled_stores_keyframes(db):
+    base = await blobs.put_blob(body())
+    h = await blobs.put_blob(body(b1="edit"), base)
+    assert (await stored(h)).get("base") is None
+
+
+async def test_existing_body_takes_no_base_reference(delta):
+    base = await blobs.put_blob(body())
+    other = await blobs.put_blob(body(b3="three"))
+    assert await blobs.put_blob(body(b3="three"), base) == other
+    assert await refs() == {base: 1, other: 2}
+
+
+async def test_created_meanwhile_releases_the_base_reference(delta, monkeypatch):
+    base = await blobs.put_blob(body())
+    text = body(b4="four")
+    delta_fields = blobs._delta_fields
+
+    async def racing(text_, base_hash):
+        fields = await delta_fields(text_, base_hash)
+        await blobs.acquire_blobs({content_hash(text_): text_}, {content_hash(text_): 1})  # the other writer
+        return fields
+
+    monkeypatch.setattr(blobs, "_delta_fields", racing)
+    h = await blobs.put_blob(text, base)
+    assert await refs() == {base: 1, h: 2}
+    assert (await stored(h)).get("base") is None
+
+
+async def test_lost_creation_race_retries_as_increment(delta, monkeypatch):
+    base = await blobs.put_blob(body())
+    text = body(b4="four")
+    coll = blobs._blobs()
+
+    class Racing:
+        """Collection whose next upsert loses against a concurrent insert."""
+
+        def __getattr__(self, name):
+            return getattr(coll, name)
+
+        async def update_one(self, query, update, upsert=False):
+            if upsert:
+                await coll.insert_one({"_id": query["_id"], "refCount": 1, "content": text})
+                raise DuplicateKeyError("E11000 duplicate key error")
+            return await coll.update_one(query, update)
+
+    racing = Racing()
+    monkeypatch.setattr(blobs, "_blobs", lambda: racing)
+    h = await blobs.put_blob(text, base)
+    monkeypatch.undo()
+    assert await refs() == {base: 1, h: 2}
+
+
+async def test_gc_releases_the_base_of_deleted_deltas(delta):
+    base = await blobs.put_blob(body())
+    h = await blobs.put_blob(body(b6="six"), base)
+    await blobs.release_blobs({base: 1, h: 1})
+
+    assert await blobs.gc_blobs(grace_seconds=3600) == 0
+    assert await blobs.gc_blobs(grace_seconds=-1) == 1
+    assert await refs() == {base: 0}
+    assert await blobs.gc_blobs(grace_seconds=-1) == 1
+    assert await refs() == {}
+
+
+async def test_reconcile_counts_documents_and_delta_bases(delta):
+    part = PydanticObjectId()
+    base = await blobs.put_blob(body())
+    h = await blobs.put_blob(body(b7="seven"), base)
+    await Beat.get_motor_collection().insert_one({"partId": part, "blobHash": h})
+    await blobs._blobs().update_many({}, {"$inc": {"refCount": 5}})
+    await blobs._blobs().update_many({}, {"$set": {"updatedAt": datetime.utcnow() - timedelta(minutes=1)}})
+
+    assert await blobs.reconcile_blob_refs() == {"blobs": 2, "fixed": 2}
+    assert await refs() == {base: 1, h: 1}
+
+
+async def test_new_version_is_stored_as_delta_of_the_previous_one(delta):
+    part = PydanticObjectId()
+    v1 = new_beat(body(), 1, part)
+    await v1.insert()
+    v2 = new_beat(body(b8="eight"), 2, part)
+    await v2.insert()
+    assert (await stored(v2.blobHash))["base"] == v1.blobHash
@@ -0,0 +1,111 @@
+import asyncio
+
+from beanie import PydanticObjectId
+
+from app.api.v1.endpoints.parts import delete_part
+from app.api.v1.endpoints.projects import delete_project
+from app.core.config import settings
+from app.models import (
+    ArchivedVersion, Beat, Character, Clip, ContentRef, ContentSelection, Episode, Image, Organization, Part,
+    Project, Shot,
+)
+from app.models.beat import BeatMetadata
+from app.models.stats import ContentStats
+from app.utils import blobs, id_registry
+from app.utils.cascade import delete_parts, delete_project_tree, should_run_in_background
+from app.utils.counters import apply_delta
+from app.utils.jobs import Job, jobs
+
+
+async def fill(part: Part, org_id, body: str = "[1]") -> list:
+    """Content, media, a selection and an archived version for `part`."""
+    ids = {"organizationId": org_id, "projectId": part.projectId, "episodeId": part.episodeId, "partId": part.id}
+    docs = [
+        Beat(content=body, **ids),
+        Beat(content=body + " ", metadata=BeatMetadata(versionNo=2, selected=False), **ids),
+        Shot(content=body, **ids),
+        Image(imageUrl="i", **ids),
+        Clip(clipUrl="c", **ids),
+    ]
+    for d in docs:
+        await d.insert()
+    await id_registry.register_many(docs)
+    await ContentSelection(partId=part.id, projectId=part.projectId, type="beat").insert()
+    await ArchivedVersion(kind="beat", projectId=part.projectId, partId=part.id, payload=b"x").insert()
+    return docs
+
+
+async def count(model, **query) -> int:
+    return await model.get_motor_collection().count_documents(query)
+
+
+async def test_delete_parts_removes_only_those_parts(tree):
+    other = Part(projectId=tree.project.id, episodeId=tree.episode.id, partNumber=2, title="Other")
+    await other.insert()
+    await fill(tree.part, tree.org.id, "[1]")
+    kept = await fill(other, tree.org.id, "[2]")
+
+    job = Job(kind="delete_part")
+    summary = await delete_parts([tree.part.id], job)
+
+    assert summary == {"beats": 2, "shots": 1, "storyboards": 0, "images": 1, "clips": 1, "parts": 1}
+    assert job.total == job.progress == 6
+    for model in (Beat, Shot, Image, Clip, ContentSelection, ArchivedVersion, ContentRef):
+        assert await count(model, partId=tree.part.id) == 0
+        assert await count(model, partId=other.id) > 0
+    assert await Part.get(tree.part.id) is None
+
+    refs = {b["_id"]: b["refCount"] for b in await blobs._blobs().find({}).to_list(None)}
+    assert refs[kept[0].blobHash] == 2  # its beat and shot share the body
+    assert all(n == 0 for h, n in refs.items() if h not in {getattr(d, "blobHash", None) for d in kept})
+
+
+async def test_delete_project_tree_takes_assets_and_leaves_other_projects(tree):
+    await fill(tree.part, tree.org.id)
+    await Character(organizationId=tree.org.id, projectId=tree.project.id, name="Ann").insert()
+    await Image(organizationId=tree.org.id, projectId=tree.project.id, imageUrl="a", category="character").insert()
+    stranger = Project(organizationId=tree.org.id, name="Other", createdBy=PydanticObjectId())
+    await stranger.insert()
+    await Character(organizationId=tree.org.id, projectId=stranger.id, name="Bob").insert()
+
+    summary = await delete_project_tree(tree.project.id)
+
+    assert summary["images"] == 2 and summary["characters"] == 1 and summary["parts"] == 1
+    assert summary["episodes"] == 1
+    for model in (Beat, Image, Character, Part, Episode, ContentSelection, ArchivedVersion, ContentRef):
+        assert await count(model, projectId=tree.project.id) == 0
+    assert await count(Character, projectId=stranger.id) == 1
+
+
+def test_background_threshold(monkeypatch):
+    monkeypatch.setattr(settings, "CASCADE_BACKGROUND_THRESHOLD", 10)
+    assert not should_run_in_background(ContentStats(beatCount=5, shotCount=5))
+    assert should_run_in_background(ContentStats(beatCount=5, shotCount=5, clipCount=1))
+
+
+async def test_delete_part_endpoint_lowers_the_ancestor_counters(tree):
+    await apply_delta({"beatCount": 2, "contentBytes": 6}, org_id=tree.org.id, project_id=tree.project.id,
+                      episode_id=tree.episode.id, part_id=tree.part.id)
+    await delete_part(str(tree.project.id), str(tree.episode.id), str(tree.part.id), user=None)
+    for model, oid in ((Episode, tree.episode.id), (Project, tree.project.id), (Organization, tree.org.id)):
+        assert (await model.get(oid)).stats == ContentStats()
+
+
+async def test_large_project_delete_runs_as_a_job(tree, monkeypatch):
+    monkeypatch.setattr(settings, "CASCADE_BACKGROUND_THRESHOLD", 0)
+    await fill(tree.part, tree.org.id)
+    await apply_delta({"beatCount": 2}, org_id=tree.org.id, project_id=tree.project.id)
+
+    response = await delete_project(str(tree.project.id), user=None)
+
+    assert response.status_code == 202
+    assert await Project.get(tree.project.id) is None
+    assert (await Organization.get(tree.org.id)).stats.beatCount == 0
+    await asyncio.sleep(0)
+    job = jobs.find("delete_project", projectId=str(tree.project.id))
+    for _ in range(200):
+        if job.status not in ("pending", "running"):
+            break
+        await asyncio.sleep(0.01)
+    assert job.status == "done"
+    assert await count(Beat, projectId=tree.project.id) == 0
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.models import Character
+from app.models.content_codec import CODEC_ZLIB, decode_text, encode_text, native_update
+
+LARGE = json.dumps([{"Title": f"Beat {i}", "Description": "the same words " * 20} for i in range(20)])
+
+
+# ── Compression ──────────────────────────────────────────────
+
+def test_large_text_is_compressed():
+    stored = encode_text(LARGE)
+    assert isinstance(stored, bytes) and stored[:1] == CODEC_ZLIB and len(stored) < len(LARGE)
+    assert decode_text(stored) == LARGE
+
+
+def test_small_or_incompressible_text_stays_a_string(monkeypatch):
+    assert encode_text("[1, 2]") == "[1, 2]"
+    monkeypatch.setattr(settings, "CONTENT_COMPRESS_THRESHOLD", 1)
+    assert encode_text("[1, 2]") == "[1, 2]"  # zlib's overhead outweighs the saving
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        decode_text(b"\x7fdata")
+
+
+async def test_documents_store_compressed_and_read_text(db, tree):
+    char = Character(organizationId=tree.org.id, projectId=tree.project.id, name="Ann", content=LARGE)
+    await char.insert()
+    raw = await Character.get_motor_collection().find_one({"_id": char.id})
+    assert isinstance(raw["content"], bytes) and raw["contentSize"] == len(LARGE)
+    assert (await Character.get(char.id)).content == LARGE
+
+
+# ── Native storage ───────────────────────────────────────────
+
+
+def test_native_update_sets_changed_fields_only():
+    old = [{"Title": "A", "Description": "x"}, {"Title": "B"}]
+    new = [{"Title": "A", "Description": "y"}, {"Title": "B", "Emotion": "calm"}]
+    assert native_update(old, new) == {
+        "$set": {"content.0.Description": "y", "content.1.Emotion": "calm"},
+    }
+
+
+def test_native_update_unsets_removed_keys():
+    assert native_update([{"a": 1, "b": 2}], [{"a": 1}]) == {"$unset": {"content.0.b": ""}}
+
+
+def test_native_update_replaces_a_value_that_changes_type():
+    assert native_update([{"a": [1]}], [{"a": "text"}]) == {"$set": {"content.0.a": "text"}}
+
+
+def test_native_update_gives_up_when_an_array_changes_length():
+    assert native_update([{"a": 1}], [{"a": 1}, {"a": 2}]) is None
+    assert native_update([{"shots": [1, 2]}], [{"shots": [1]}]) is None
+
+
+def test_native_update_no_change():
+    doc = {"beats": [{"a": 1}]}
+    assert native_update(doc, doc) == {}
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.models import Beat
+from app.models.content_codec import content_hash
+from app.utils import blobs
+from app.utils.content_items import build_index, content_summary, diff_indexes, item_diff, item_list, splice_items
+
+BEATS = [
+    {"Beat_Number": 1, "Title": "Opening"},
+    {"Beat_Number": 2, "Title": "Chase"},
+    {"Title": "Unnumbered"},
+]
+SHOTS = {"beats": [
+    {"beat_number": 1, "shots": [{"shot": "1A", "intent_title": "Wide"}, {"shot": "1B"}]},
+    {"beat_number": 2, "shots": [{"shot": "2A", "intent_title": "Close"}]},
+]}
+PANELS = [
+    {"metadata": {"panel_number": 1, "beat_number": 1, "shot_summary": "Door"}},
+    {"metadata": {"panel_number": 2, "beat_number": 1}},
+]
+
+
+def test_item_list():
+    assert item_list([1, 2]) == [1, 2]
+    assert item_list({"beats": [1], "meta": {"v": 1}}) == [1]
+    with pytest.raises(ValueError):
+        item_list({"a": [1], "b": [2]})
+    with pytest.raises(ValueError):
+        item_list("text")
+
+
+def test_build_index_beats():
+    index = build_index("beat", BEATS)
+    assert list(index.items) == ["1", "2", "3"]  # position when the number is missing
+    assert index.summaries[0] == {"key": "1", "title": "Opening"}
+    assert index.get("2")["Title"] == "Chase"
+
+
+def test_build_index_shots_are_keyed_by_shot_code():
+    index = build_index("shot", SHOTS)
+    assert list(index.items) == ["1A", "1B", "2A"]
+    assert index.summaries[2] == {"key": "2A", "title": "Close", "beatNumber": 2}
+
+
+def test_build_index_storyboard():
+    index = build_index("storyboard", PANELS)
+    assert index.summaries == [
+        {"key": "1", "title": "Door", "beatNumber": 1},
+        {"key": "2", "title": None, "beatNumber": 1},
+    ]
+
+
+def test_build_index_keeps_duplicate_keys_addressable():
+    index = build_index("beat", [{"Beat_Number": 1, "Title": "a"}, {"Beat_Number": 1, "Title": "b"}])
+    assert list(index.items) == ["1", "1~2"]
+
+
+def test_splice_items_replaces_in_place():
+    doc = json.loads(json.dumps(SHOTS))
+    placed = splice_items("shot", doc, {"1B": {"shot": "1B", "intent_title": "New"}, "9Z": {}})
+    assert placed == ["1B"]
+    assert doc["beats"][0]["shots"][1] == {"shot": "1B", "intent_title": "New"}
+    assert doc["beats"][1] == SHOTS["beats"][1]
+
+
+def test_diff_indexes():
+    new = [{"Beat_Number": 1, "Title": "Opening!"}, {"Beat_Number": 3, "Title": "End"}, {"Beat_Number": 4}]
+    result = diff_indexes(build_index("beat", BEATS[:2]), build_index("beat", new))
+    assert result["added"] == [{"key": "3", "item": new[1]}, {"key": "4", "item": new[2]}]
+    assert result["removed"] == [{"key": "2", "title": "Chase"}]
+    assert result["changed"] == [{"key": "1", "ops": [{"op": "replace", "path": "/Title", "value": "Opening!"}]}]
+    assert result["unchangedCount"] == 0
+
+
+def test_content_summary():
+    text = json.dumps(BEATS)
+    summary = content_summary("beat", text)
+    assert summary.itemCount == 3
+    assert summary.items[1] == {"key": "2", "title": "Chase"}
+    assert summary.hash == content_hash(text)
+    assert content_summary("beat", "not json").itemCount == 0
+    assert content_summary("beat", '{"a": 1}').hash == content_hash('{"a": 1}')
+
+
+async def stored_beat(items: list) -> Beat:
+    """A beat as the endpoints read it: body in the blob store, not hydrated."""
+    ids = {f: PydanticObjectId() for f in ("organizationId", "projectId", "episodeId", "partId")}
+    beat = Beat(content=json.dumps(items), **ids)
+    await beat.insert()
+    return await Beat.get(beat.id)
+
+
+async def test_item_diff_is_cached_by_content_hash(db, monkeypatch):
+    old, new = await stored_beat(BEATS[:2]), await stored_beat([{"Beat_Number": 1, "Title": "Opening"}])
+    result = await item_diff("beat", old, new)
+    assert result["removed"] == [{"key": "2", "title": "Chase"}] and result["unchangedCount"] == 1
+
+    # Other versions with the same bodies reuse the entry without loading them
+    async def no_reads(hashes):
+        raise AssertionError("body loaded")
+
+    monkeypatch.setattr(blobs, "load_texts", no_reads)
+    copy_old, copy_new = await Beat.get(old.id), await Beat.get(new.id)
+    copy_old.id = copy_new.id = PydanticObjectId()
+    assert await item_diff("beat", copy_old, copy_new) is result
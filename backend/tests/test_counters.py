@@ -0,0 +1,86 @@
+import pytest
+from beanie import PydanticObjectId
+
+from app.db.migrations import backfill_stats
+from app.models import Beat, Clip, Episode, Image, Organization, Part, Project, Shot
+from app.models.stats import ContentStats
+from app.utils.counters import add_deltas, apply_delta, apply_doc_delta, doc_delta, reconcile_stats, stats_delta
+
+
+async def stats(tree) -> dict:
+    """Current stats of the part, episode, project and organization."""
+    return {
+        "part": (await Part.get(tree.part.id)).stats.model_dump(),
+        "episode": (await Episode.get(tree.episode.id)).stats.model_dump(),
+        "project": (await Project.get(tree.project.id)).stats.model_dump(),
+        "org": (await Organization.get(tree.org.id)).stats.model_dump(),
+    }
+
+
+def expected(**counts) -> dict:
+    return {**ContentStats().model_dump(), **counts}
+
+
+def test_deltas(db):
+    ids = {f: PydanticObjectId() for f in ("organizationId", "projectId", "episodeId", "partId")}
+    beat = Beat(content="[1, 2]", **ids)
+    assert doc_delta(beat) == {"beatCount": 1, "contentBytes": 6}
+    assert doc_delta(beat, -1) == {"beatCount": -1, "contentBytes": -6}
+    assert add_deltas({"beatCount": 1}, {"beatCount": 2, "shotCount": 1}) == {"beatCount": 3, "shotCount": 1}
+    assert stats_delta(ContentStats(beatCount=2, contentBytes=10))["beatCount"] == -2
+
+
+async def test_apply_delta_reaches_every_ancestor(tree):
+    await apply_delta(
+        {"shotCount": 2, "contentBytes": 100, "beatCount": 0},
+        org_id=tree.org.id, project_id=tree.project.id, episode_id=tree.episode.id, part_id=tree.part.id,
+    )
+    assert await stats(tree) == dict.fromkeys(("part", "episode", "project", "org"),
+                                              expected(shotCount=2, contentBytes=100))
+
+
+async def test_apply_delta_skips_missing_levels(tree):
+    await apply_delta({"imageCount": 1}, org_id=tree.org.id, project_id=tree.project.id)
+    current = await stats(tree)
+    assert current["part"] == current["episode"] == expected()
+    assert current["project"] == current["org"] == expected(imageCount=1)
+
+
+async def test_project_level_images_are_not_counted(tree):
+    image = Image(organizationId=tree.org.id, projectId=tree.project.id, imageUrl="x", category="character")
+    await apply_doc_delta(image)
+    assert (await stats(tree))["org"] == expected()
+
+
+@pytest.mark.mongodb  # $type in $group
+async def test_reconcile_recomputes_from_the_collections(tree):
+    await Beat(content="[1]", **tree.ids).insert()
+    await Shot(content="[1, 2, 3]", **tree.ids).insert()
+    await Clip(clipUrl="c", **tree.ids).insert()
+    await Clip(clipUrl="d", **tree.ids).insert()
+    await apply_delta({"beatCount": 7}, org_id=tree.org.id, part_id=tree.part.id)  # drifted
+
+    assert await reconcile_stats() == {"parts": 1}
+    want = expected(beatCount=1, shotCount=1, clipCount=2, contentBytes=len("[1]") + len("[1, 2, 3]"))
+    assert await stats(tree) == dict.fromkeys(("part", "episode", "project", "org"), want)
+
+
+@pytest.mark.mongodb  # $type in $group
+async def test_reconcile_resets_emptied_nodes(tree):
+    await apply_delta({"beatCount": 3}, org_id=tree.org.id, project_id=tree.project.id,
+                      episode_id=tree.episode.id, part_id=tree.part.id)
+    await reconcile_stats(tree.project.id)
+    assert await stats(tree) == dict.fromkeys(("part", "episode", "project", "org"), expected())
+
+
+@pytest.mark.mongodb  # $type in $group
+async def test_backfill_fills_documents_without_stats(tree):
+    await Beat(content="[1]", **tree.ids).insert()
+    await Part.get_motor_collection().update_one({"_id": tree.part.id}, {"$unset": {"stats": ""}})
+    await backfill_stats()
+    assert (await stats(tree))["org"] == expected(beatCount=1, contentBytes=3)
+
+    # Runs once: with stats everywhere, later drift is left to the reconcile script
+    await apply_delta({"beatCount": 5}, org_id=tree.org.id)
+    await backfill_stats()
+    assert (await stats(tree))["org"]["beatCount"] == 6
@@ -0,0 +1,82 @@
+import copy
+
+import pytest
+
+from app.utils.json_patch import JsonPatchError, apply_patch, diff, merge_patch
+
+
+@pytest.mark.parametrize("src,dst", [
+    ({"a": 1, "b": 2}, {"a": 1, "c": 3}),
+    ([1, 2, 3], [1, 5]),
+    ([1], [1, 2, 3]),
+    ({"a": [1, {"b": "x"}]}, {"a": [1, {"b": "y", "c": None}]}),
+    ({"a": 1}, [1]),
+    ({"a/b": 1, "c~d": 2}, {"a/b": 3}),
+    ([{"Beat_Number": 1, "Title": "A"}], [{"Beat_Number": 1, "Title": "B"}, {"Beat_Number": 2}]),
+])
+def test_diff_roundtrip(src, dst):
+    before = copy.deepcopy(src)
+    assert apply_patch(src, diff(src, dst)) == dst
+    assert src == before
+
+
+def test_diff_is_minimal_per_member():
+    src = [{"Title": "A", "Description": "long"}, {"Title": "B"}]
+    dst = [{"Title": "A", "Description": "long"}, {"Title": "C"}]
+    assert diff(src, dst) == [{"op": "replace", "path": "/1/Title", "value": "C"}]
+    assert diff(src, src) == []
+
+
+def test_diff_removes_trailing_items_from_the_end():
+    ops = diff([1, 2, 3, 4], [1])
+    assert [op["path"] for op in ops] == ["/3", "/2", "/1"]
+
+
+def test_diff_escapes_keys():
+    assert diff({}, {"a/b~c": 1}) == [{"op": "add", "path": "/a~1b~0c", "value": 1}]
+
+
+def test_apply_patch_operations():
+    doc = {"items": [{"t": "a"}, {"t": "b"}], "meta": {"n": 1}}
+    out = apply_patch(doc, [
+        {"op": "add", "path": "/items/-", "value": {"t": "c"}},
+        {"op": "remove", "path": "/items/0"},
+        {"op": "replace", "path": "/meta/n", "value": 2},
+        {"op": "copy", "from": "/items/0", "path": "/first"},
+        {"op": "move", "from": "/meta", "path": "/info"},
+        {"op": "test", "path": "/info/n", "value": 2},
+    ])
+    assert out == {"items": [{"t": "b"}, {"t": "c"}], "first": {"t": "b"}, "info": {"n": 2}}
+
+
+def test_apply_patch_is_all_or_nothing():
+    doc = {"a": 1}
+    with pytest.raises(JsonPatchError):
+        apply_patch(doc, [
+            {"op": "replace", "path": "/a", "value": 2},
+            {"op": "test", "path": "/a", "value": 3},
+        ])
+    assert doc == {"a": 1}
+
+
+@pytest.mark.parametrize("ops", [
+    [{"op": "remove", "path": "/missing"}],
+    [{"op": "replace", "path": "/list/5", "value": 1}],
+    [{"op": "add", "path": "/list/01", "value": 1}],
+    [{"op": "add", "path": "no-slash", "value": 1}],
+    [{"op": "add", "path": "/a"}],
+    [{"op": "move", "from": "/list", "path": "/list/0"}],
+    [{"op": "remove", "path": ""}],
+    [{"op": "frobnicate", "path": "/a"}],
+    ["not an object"],
+])
+def test_apply_patch_rejects(ops):
+    with pytest.raises(JsonPatchError):
+        apply_patch({"list": [1, 2], "a": 1}, ops)
+
+
+def test_merge_patch():
+    target = {"a": 1, "b": {"c": 2, "d": 3}}
+    assert merge_patch(target, {"a": None, "b": {"c": 5}, "e": [1]}) == {"b": {"c": 5, "d": 3}, "e": [1]}
+    assert merge_patch(target, [1]) == [1]
+    assert target == {"a": 1, "b": {"c": 2, "d": 3}}
@@ -0,0 +1,29 @@
+from bson import ObjectId
+
+from app.db.migrations import migrate_org_member_ids
+
+
+async def test_member_ids_move_onto_the_users(db):
+    org, free, member = ObjectId(), ObjectId(), ObjectId()
+    await db["organizations"].insert_many([{"_id": org, "memberIds": [free, member]}, {"_id": ObjectId(), "memberIds": []}])
+    await db["users"].insert_many([{"_id": free}, {"_id": member, "organizationId": org}])
+
+    assert await migrate_org_member_ids(db) == 1
+    assert await db["users"].count_documents({"organizationId": org}) == 2
+    assert await db["organizations"].count_documents({"memberIds": {"$exists": True}}) == 0
+
+
+async def test_conflicting_members_keep_the_member_ids(db, caplog):
+    org, other_org, free, taken = ObjectId(), ObjectId(), ObjectId(), ObjectId()
+    await db["organizations"].insert_one({"_id": org, "memberIds": [free, taken]})
+    await db["users"].insert_many([{"_id": free, "organizationId": None}, {"_id": taken, "organizationId": other_org}])
+
+    assert await migrate_org_member_ids(db) == 1
+    assert (await db["users"].find_one({"_id": taken}))["organizationId"] == other_org
+    assert (await db["organizations"].find_one({"_id": org}))["memberIds"] == [free, taken]
+    assert str(taken) in caplog.text
+
+    # Once resolved, the next run drops the array
+    await db["users"].update_one({"_id": taken}, {"$set": {"organizationId": org}})
+    assert await migrate_org_member_ids(db) == 0
+    assert "memberIds" not in await db["organizations"].find_one({"_id": org})
@@ -0,0 +1,35 @@
+import json
+
+from app.api.v1.endpoints.parts import get_part_studio
+from app.models import Beat
+from app.models.beat import BeatMetadata
+from app.utils import blobs
+
+BEATS = [{"Beat_Number": 1, "Title": "Opening"}, {"Beat_Number": 2, "Title": "Chase"}]
+
+
+async def test_lazy_studio_returns_summaries_and_the_selected_body(tree):
+    selected = Beat(content=json.dumps(BEATS), **tree.ids)
+    other = Beat(content=json.dumps(BEATS[:1]), metadata=BeatMetadata(versionNo=2, selected=False), **tree.ids)
+    await selected.insert()
+    await other.insert()
+
+    studio = await get_part_studio(str(tree.part.id), lazy=True, user=None)
+
+    beats = {b["id"]: b for b in studio["beats"]}
+    assert beats[str(selected.id)]["content"] == json.dumps(BEATS)
+    assert beats[str(other.id)]["content"] is None
+    assert beats[str(other.id)]["items"] == [{"key": "1", "title": "Opening"}]
+
+
+async def test_lazy_studio_survives_a_missing_blob(tree):
+    beat = Beat(content=json.dumps(BEATS), **tree.ids)
+    await beat.insert()
+    await blobs._blobs().delete_many({})
+    blobs._bodies.clear()
+
+    studio = await get_part_studio(str(tree.part.id), lazy=True, user=None)
+
+    entry, = studio["beats"]
+    assert entry["content"] is None
+    assert entry["itemCount"] == 2 and entry["contentHash"] == beat.contentHash
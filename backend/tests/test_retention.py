@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from beanie import PydanticObjectId
+
+from app.models import ArchivedVersion, Beat, Character, Image
+from app.models.beat import BeatMetadata
+from app.models.media import MediaMetadata
+from app.utils import retention, selections
+from app.utils.retention import _victims
+
+OLD = datetime.utcnow() - timedelta(days=30)
+CUTOFF = datetime.utcnow() - timedelta(days=1)
+
+
+async def beats(tree, n: int) -> list:
+    docs = [
+        Beat(content=f"[{i}]", metadata=BeatMetadata(versionNo=i, selected=i == 1), updatedAt=OLD, **tree.ids)
+        for i in range(1, n + 1)
+    ]
+    for d in docs:
+        await d.insert()
+    return docs
+
+
+async def images(tree, n: int, shot_id=None) -> list:
+    docs = [
+        Image(imageUrl=f"{i}.png", shotId=shot_id, metadata=MediaMetadata(versionNo=i, selected=False),
+              updatedAt=OLD, **tree.ids)
+        for i in range(1, n + 1)
+    ]
+    for d in docs:
+        await d.insert()
+    return docs
+
+
+async def test_keeps_the_newest_selected_picked_and_recent(tree):
+    v1, v2, v3, v4, v5, v6 = await beats(tree, 6)
+    await selections.set_pick(v3, "beat", "1")
+    await Beat.get_motor_collection().update_one({"_id": v2.id}, {"$set": {"updatedAt": datetime.utcnow()}})
+
+    assert await _victims(Beat, {"partId": tree.part.id}, 2, CUTOFF) == [v4.id]
+
+
+async def test_images_outside_a_shot_are_not_versions(tree):
+    await images(tree, 4)
+    group = {"partId": tree.part.id, "shotId": None, "category": "shot"}
+    assert await _victims(Image, group, 1, CUTOFF) == []
+
+
+async def test_images_linked_from_assets_stay(tree):
+    shot = PydanticObjectId()
+    i1, i2, i3 = await images(tree, 3, shot)
+    await Character(organizationId=tree.org.id, projectId=tree.project.id, name="Ann", imageIds=[i1.id]).insert()
+
+    group = {"partId": tree.part.id, "shotId": shot, "category": "shot"}
+    assert await _victims(Image, group, 1, CUTOFF) == [i2.id]
+
+
+async def test_sweep_archives_per_group(tree, monkeypatch):
+    monkeypatch.setattr(retention.settings, "VERSION_RETENTION_KEEP", 1)
+    await beats(tree, 3)
+    await images(tree, 3)
+    await images(tree, 3, PydanticObjectId())
+
+    archived = await retention.sweep(part_ids=[tree.part.id])
+
+    assert archived["beats"] == 1 and archived["images"] == 2
+    assert await ArchivedVersion.find(ArchivedVersion.partId == tree.part.id).count() == 3
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from app.models import Beat, Character, Clip, Image, Location, Part, Project, Prop, Shot
+from app.utils import id_registry, seed_part
+from app.utils.cascade import delete_parts
+from app.utils.demodata import Manifest
+from app.utils.jobs import jobs
+from app.utils.seed_part import run_seed_job, seed_part_data
+
+MANIFEST = Manifest(
+    shot_folders={"Shot_1": {"images": ["a.png", "b.png"], "clips": ["a.mp4"]}},
+    character_folders={"Ann": ["ann.png"]},
+    location_folders={"_root": ["hall.png"]},
+    extras_folders={"Car": ["car.png"]},
+    json_files={
+        "beat_v1.json": {"beats": [{"Beat_Number": 1, "Title": "Opening"}]},
+        **{f"shot_v{i}.json": {"beats": [{"beat_number": 1, "shots": [{"shot": "1A"}]}]} for i in (1, 2, 3)},
+        **{f"storyboard_v{i}.json": {"storyboard": [{"metadata": {"panel_number": 1}}]} for i in (1, 2)},
+        "character.json": {"Characters": {"ANN": {"age": 30}}},
+        "location.json": {"key_locations": [{"location_id": "1", "name": "Hall"}]},
+    },
+)
+
+
+@pytest.fixture
+def manifest(monkeypatch):
+    async def get_manifest():
+        return MANIFEST
+    monkeypatch.setattr(seed_part, "get_manifest", get_manifest)
+
+
+async def seed(tree, part=None) -> dict:
+    part = part or tree.part
+    return await seed_part_data(tree.org.id, tree.project.id, tree.episode.id, part.id)
+
+
+async def count(model, **query) -> int:
+    return await model.get_motor_collection().count_documents(query)
+
+
+async def test_seed_writes_content_assets_and_counters(tree, manifest):
+    summary = await seed(tree)
+
+    assert summary["shot_versions"] == 3 and summary["clips"] == 1
+    assert (summary["characters"], summary["locations"], summary["props"]) == (1, 1, 1)
+    assert await count(Image, partId=tree.part.id) == 5
+    ann = await Character.find_one(Character.projectId == tree.project.id)
+    assert ann.name == "Ann" and len(ann.imageIds) == 1
+    assert await id_registry.resolve_kind(ann.imageIds[0]) == "image"
+    stats = (await Project.get(tree.project.id)).stats
+    assert (stats.beatCount, stats.shotCount, stats.storyboardCount, stats.imageCount, stats.clipCount) == (1, 3, 2, 5, 1)
+
+
+async def test_project_assets_are_seeded_once(tree, manifest):
+    other = Part(projectId=tree.project.id, episodeId=tree.episode.id, partNumber=2, title="Other")
+    await other.insert()
+
+    first, second = await asyncio.gather(seed(tree), seed(tree, other))
+
+    assert sorted((first["characters"], second["characters"])) == [0, 1]
+    for model in (Character, Location, Prop):
+        assert await count(model, projectId=tree.project.id) == 1
+    assert (await Project.get(tree.project.id)).assetsSeeded
+
+
+async def test_projects_with_assets_keep_them(tree, manifest):
+    await Character(organizationId=tree.org.id, projectId=tree.project.id, name="Existing").insert()
+    summary = await seed(tree)
+    assert (summary["characters"], summary["locations"]) == (0, 1)
+    assert await count(Character, projectId=tree.project.id) == 1
+
+
+async def test_part_deleted_during_the_seed_is_cleaned_up(tree, manifest, monkeypatch):
+    register_many = id_registry.register_many
+
+    async def deleted_meanwhile(docs):
+        await register_many(docs)
+        await Part.get_motor_collection().delete_one({"_id": tree.part.id})
+
+    monkeypatch.setattr(id_registry, "register_many", deleted_meanwhile)
+    assert await seed(tree) is None
+
+    for model in (Beat, Shot, Image, Clip):
+        assert await count(model, partId=tree.part.id) == 0
+    assert await count(Character, projectId=tree.project.id) == 0
+    project = await Project.get(tree.project.id)
+    assert project.stats.beatCount == 0 and not project.assetsSeeded
+
+
+async def test_failed_write_is_discarded_and_releases_the_assets(tree, manifest, monkeypatch):
+    insert_many = seed_part._insert_many
+
+    async def failing(model, docs):
+        await insert_many(model, docs)
+        if model is Clip:
+            raise RuntimeError("disk full")
+
+    monkeypatch.setattr(seed_part, "_insert_many", failing)
+    with pytest.raises(RuntimeError):
+        await run_seed_job(None, tree.org.id, tree.project.id, tree.episode.id, tree.part.id)
+
+    part = await Part.get(tree.part.id)
+    assert part.seedStatus == "failed" and part.seedError == "RuntimeError: disk full"
+    assert await count(Beat, partId=tree.part.id) == 0
+    assert await count(Prop, projectId=tree.project.id) == 0
+    assert not (await Project.get(tree.project.id)).assetsSeeded
+
+
+async def test_deleting_the_part_cancels_its_queued_seed(tree, manifest):
+    job = jobs.submit(
+        "seed_part", lambda job: run_seed_job(job, tree.org.id, tree.project.id, tree.episode.id, tree.part.id),
+        partId=str(tree.part.id), projectId=str(tree.project.id),
+    )
+    await delete_parts([tree.part.id])
+    await asyncio.sleep(0.01)
+
+    assert job.status == "failed" and job.error == "Cancelled"
+    assert await count(Beat, partId=tree.part.id) == 0
+    assert (await Project.get(tree.project.id)).stats.beatCount == 0
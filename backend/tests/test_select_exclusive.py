@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+
+from app.api.v1.endpoints.content import SELECT_RETRIES, _select_exclusive
+from app.models import Beat
+from app.models.beat import BeatMetadata
+
+
+async def versions(tree, n: int, part=None) -> list:
+    ids = {**tree.ids, "partId": part or tree.part.id}
+    docs = [Beat(content="[]", metadata=BeatMetadata(versionNo=i + 1, selected=i == 0), **ids) for i in range(n)]
+    for d in docs:
+        await d.insert()
+    return docs
+
+
+async def selected(part_id) -> list:
+    return [b.id for b in await Beat.find({"partId": part_id, "metadata.selected": True}).to_list()]
+
+
+class Racing:
+    """Collection whose first `losses` selects hit the unique index."""
+
+    def __init__(self, coll, losses: int):
+        self.coll, self.losses = coll, losses
+
+    def __getattr__(self, name):
+        return getattr(self.coll, name)
+
+    async def update_one(self, query, update):
+        if self.losses:
+            self.losses -= 1
+            raise DuplicateKeyError("E11000 duplicate key error")
+        return await self.coll.update_one(query, update)
+
+
+def racing_beat(monkeypatch, losses: int):
+    coll = Racing(Beat.get_motor_collection(), losses)
+    monkeypatch.setattr(Beat, "get_motor_collection", classmethod(lambda cls: coll))
+
+
+async def test_select_clears_the_siblings_only(tree):
+    *_, third = await versions(tree, 3)
+    other_part, = await versions(tree, 1, part=PydanticObjectId())
+
+    await _select_exclusive(Beat, third)
+
+    assert await selected(tree.part.id) == [third.id]
+    assert await selected(other_part.partId) == [other_part.id]
+    assert third.metadata.selected
+
+
+async def test_lost_race_is_retried(tree, monkeypatch):
+    _, second = await versions(tree, 2)
+    racing_beat(monkeypatch, SELECT_RETRIES - 1)
+    await _select_exclusive(Beat, second)
+    monkeypatch.undo()
+    assert await selected(tree.part.id) == [second.id]
+
+
+async def test_gives_up_with_409(tree, monkeypatch):
+    _, second = await versions(tree, 2)
+    racing_beat(monkeypatch, SELECT_RETRIES)
+    with pytest.raises(HTTPException) as e:
+        await _select_exclusive(Beat, second)
+    assert e.value.status_code == 409 and not second.metadata.selected
+
+
+@pytest.mark.mongodb  # mongomock ignores partialFilterExpression
+async def test_concurrent_selects_leave_one_selected(tree):
+    docs = await versions(tree, 6)
+    await asyncio.gather(*(_select_exclusive(Beat, d) for d in docs[1:]))
+    assert len(await selected(tree.part.id)) == 1
+
+
+@pytest.mark.mongodb
+async def test_unique_index_rejects_a_second_selected_version(tree):
+    _, second = await versions(tree, 2)
+    with pytest.raises(DuplicateKeyError):
+        await Beat.get_motor_collection().update_one({"_id": second.id}, {"$set": {"metadata.selected": True}})
@@ -0,0 +1,69 @@
+import json
+from datetime import timedelta
+
+from app.models import Shot
+from app.models.shot import ShotMetadata
+from app.utils import selections
+from app.utils.selections import effective_content
+
+
+def shots(**titles) -> str:
+    return json.dumps({"beats": [{"beat_number": 1, "shots": [
+        {"shot": code, "intent_title": titles.get(code, "v1")} for code in ("1A", "1B")
+    ]}]})
+
+
+async def version(tree, text: str, number: int) -> Shot:
+    shot = Shot(content=text, metadata=ShotMetadata(versionNo=number, selected=number == 1), **tree.ids)
+    await shot.insert()
+    return shot
+
+
+def titles(result) -> dict:
+    return {s["shot"]: s["intent_title"] for s in json.loads(result["content"])["beats"][0]["shots"]}
+
+
+async def test_nothing_selected(tree):
+    assert await effective_content(Shot, "shot", tree.part.id) is None
+
+
+async def test_picks_are_spliced_into_the_selected_version(tree):
+    base = await version(tree, shots(), 1)
+    v2 = await version(tree, shots(**{"1B": "v2"}), 2)
+    assert titles(await effective_content(Shot, "shot", tree.part.id)) == {"1A": "v1", "1B": "v1"}
+
+    await selections.set_pick(v2, "shot", "1B")
+    await selections.set_pick(v2, "shot", "9Z")  # v2 has no such shot
+    result = await effective_content(Shot, "shot", tree.part.id)
+
+    assert titles(result) == {"1A": "v1", "1B": "v2"}
+    assert result["baseId"] == str(base.id) and result["rev"] == 2
+    assert result["sources"] == {"1B": str(v2.id)}
+    assert result["unresolved"] == ["9Z"]
+
+
+async def test_cached_until_a_version_changes(tree):
+    await version(tree, shots(), 1)
+    v2 = await version(tree, shots(**{"1B": "v2"}), 2)
+    await selections.set_pick(v2, "shot", "1B")
+    first = await effective_content(Shot, "shot", tree.part.id)
+    assert await effective_content(Shot, "shot", tree.part.id) is first
+
+    v2.content = shots(**{"1B": "edited"})
+    v2.updatedAt += timedelta(seconds=1)  # as the endpoints do
+    await v2.save()
+    assert titles(await effective_content(Shot, "shot", tree.part.id))["1B"] == "edited"
+
+
+async def test_deleted_or_cleared_picks_fall_back_to_the_base(tree):
+    await version(tree, shots(), 1)
+    v2 = await version(tree, shots(**{"1A": "v2", "1B": "v2"}), 2)
+    await selections.set_pick(v2, "shot", "1A")
+    await selections.set_pick(v2, "shot", "1B")
+
+    assert (await selections.clear_pick(tree.part.id, "shot", "1A"))["items"] == {"1B": str(v2.id)}
+    assert await selections.clear_pick(tree.part.id, "shot", "1A") is None
+    await selections.drop_version(tree.part.id, "shot", v2.id)
+
+    result = await effective_content(Shot, "shot", tree.part.id)
+    assert titles(result) == {"1A": "v1", "1B": "v1"} and result["sources"] == {}